@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     OverallAnalytics, CampusAnalytics, TeacherAnalytics, 
-    StudentAnalytics, ClassAnalytics, PerformanceTrend
+    StudentAnalytics, ClassAnalytics, PerformanceTrend, DashboardSnapshot,
+    RequestTelemetry, QuestionStatistics, ItemAnalysisRun
 )
 
 @admin.register(OverallAnalytics)
@@ -36,6 +37,28 @@ class ClassAnalyticsAdmin(admin.ModelAdmin):
 
 @admin.register(PerformanceTrend)
 class PerformanceTrendAdmin(admin.ModelAdmin):
-    list_display = ['trend_type', 'date', 'total_users', 'active_users', 'levels_completed']
-    list_filter = ['trend_type', 'date']
+    list_display = ['trend_type', 'scope', 'scope_key', 'date', 'total_users', 'active_users', 'levels_completed']
+    list_filter = ['trend_type', 'scope', 'date']
     readonly_fields = ['created_at']
+
+@admin.register(DashboardSnapshot)
+class DashboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['section', 'etag', 'built_at']
+    readonly_fields = ['section', 'payload', 'etag', 'built_at']
+
+@admin.register(RequestTelemetry)
+class RequestTelemetryAdmin(admin.ModelAdmin):
+    list_display = ['date', 'route', 'status_class', 'request_count', 'max_ms', 'updated_at']
+    list_filter = ['date', 'status_class']
+    search_fields = ['route']
+    readonly_fields = ['buckets', 'updated_at']
+
+@admin.register(QuestionStatistics)
+class QuestionStatisticsAdmin(admin.ModelAdmin):
+    list_display = ['question', 'responses', 'p_value', 'point_biserial', 'computed_at']
+    search_fields = ['question__question_text']
+    readonly_fields = ['answer_distribution', 'distractors', 'computed_at']
+
+@admin.register(ItemAnalysisRun)
+class ItemAnalysisRunAdmin(admin.ModelAdmin):
+    list_display = ['started_at', 'finished_at', 'watermark', 'rows_processed', 'questions_updated']
@@ -0,0 +1,288 @@
+"""
+Item analysis of question answers
+run_item_analysis() re-analyzes the questions answered since the last run.
+It streams their QuestionProgress rows in batches of questions and works
+out, for each question:
+- the share of correct responses (its p-value);
+- the point-biserial correlation between answering it correctly and the
+  student's score on their other questions;
+- the distribution of answers, with the mean score of the students who
+  chose each one.
+Results, including a summary of each wrong answer, are written to
+QuestionStatistics only: Question.distractor_analysis is authored content
+that content packs carry between environments. The aggregation is vectorized with NumPy when it is installed and done in
+plain Python otherwise, with the same results. Scores are taken at run
+time, so a question nobody answered since the last run keeps the
+discrimination it was given then.
+"""
+
+import json
+import math
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from levels.models import Question
+from progress.models import QuestionProgress
+from .models import ItemAnalysisRun, QuestionStatistics
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+QUESTIONS_PER_BATCH = 500
+CHUNK_SIZE = 5000
+
+STATISTICS_FIELDS = [
+    'responses', 'correct_responses', 'p_value', 'point_biserial', 'answer_distribution', 'distractors',
+    'computed_at',
+]
+
+
+def answer_key(answer):
+    """Answers are compared as trimmed text, other JSON values as their JSON"""
+    if isinstance(answer, str):
+        return answer.strip()
+    return json.dumps(answer, sort_keys=True)
+
+
+def student_scores():
+    """user_id -> (correct, answered) over all of the student's answered questions"""
+    rows = (
+        QuestionProgress.objects.filter(is_answered=True).values('user_id')
+        .annotate(correct=Count('id', filter=Q(is_correct=True)), answered=Count('id'))
+        .order_by().values_list('user_id', 'correct', 'answered')
+    )
+    return {
+        user_id: (correct, answered)
+        for user_id, correct, answered in rows.iterator(chunk_size=CHUNK_SIZE)
+    }
+
+
+def _point_biserial(n, n1, total, total1, squares):
+    """Point-biserial r from the sums over one question's scored responses"""
+    n0 = n - n1
+    if not n1 or not n0:
+        return None
+    variance = squares / n - (total / n) ** 2
+    if variance <= 1e-12:
+        return None
+    mean1 = total1 / n1
+    mean0 = (total - total1) / n0
+    return (mean1 - mean0) / math.sqrt(variance) * math.sqrt(n1 * n0) / n
+
+
+def _aggregate_numpy(question_ids, user_ids, correct, answers, scores):
+    questions, question = numpy.unique(numpy.asarray(question_ids), return_inverse=True)
+    users, user = numpy.unique(numpy.asarray(user_ids), return_inverse=True)
+    user_totals = numpy.array([scores.get(user_id, (0, 0)) for user_id in users.tolist()], dtype=float)
+    user_correct, user_answered = user_totals[user, 0], user_totals[user, 1]
+    correct = numpy.asarray(correct, dtype=float)
+    # Score on the student's other questions; students with no other answer are not scored
+    scored = user_answered > 1
+    rest = numpy.divide(
+        user_correct - correct, user_answered - 1,
+        out=numpy.zeros_like(correct), where=scored,
+    )
+    weight = scored.astype(float)
+    # One code per (question, answer) pair
+    base = max(answers) + 1
+    pairs, pair = numpy.unique(question * base + numpy.asarray(answers), return_inverse=True)
+    pair_questions, pair_answers = divmod(pairs, base)
+
+    def per_question(weights=None):
+        return numpy.bincount(question, weights=weights, minlength=len(questions))
+
+    def per_pair(weights=None):
+        return numpy.bincount(pair, weights=weights, minlength=len(pairs))
+
+    n = per_question(weight)
+    n1 = per_question(weight * correct)
+    total = per_question(weight * rest)
+    total1 = per_question(weight * correct * rest)
+    squares = per_question(weight * rest * rest)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        n0 = n - n1
+        variance = squares / n - (total / n) ** 2
+        r = (total1 / n1 - (total - total1) / n0) / numpy.sqrt(variance) * numpy.sqrt(n1 * n0) / n
+        pair_scored = per_pair(weight)
+        mean_score = per_pair(weight * rest) / pair_scored
+    defined = (n1 > 0) & (n0 > 0) & (variance > 1e-12)
+
+    return {
+        'questions': questions.tolist(),
+        'responses': per_question().tolist(),
+        'correct': per_question(correct).astype(int).tolist(),
+        'point_biserial': [float(value) if ok else None for value, ok in zip(r, defined)],
+        'pairs': list(zip(pair_questions.tolist(), pair_answers.tolist())),
+        'pair_responses': per_pair().tolist(),
+        'pair_correct': per_pair(correct).astype(int).tolist(),
+        'pair_mean_score': [
+            float(value) if count else None for value, count in zip(mean_score, pair_scored)
+        ],
+    }
+
+
+def _aggregate_python(question_ids, user_ids, correct, answers, scores):
+    question_index = {}
+    pair_index = {}
+    sums = []
+    pair_sums = []
+    for question_id, user_id, is_correct, answer in zip(question_ids, user_ids, correct, answers):
+        position = question_index.get(question_id)
+        if position is None:
+            position = question_index[question_id] = len(sums)
+            sums.append([0, 0, 0, 0, 0.0, 0.0, 0.0])
+        code = pair_index.get((position, answer))
+        if code is None:
+            code = pair_index[position, answer] = len(pair_sums)
+            pair_sums.append([0, 0, 0, 0.0])
+        row, pair_row = sums[position], pair_sums[code]
+        row[0] += 1
+        row[1] += is_correct
+        pair_row[0] += 1
+        pair_row[1] += is_correct
+        user_correct, user_answered = scores.get(user_id, (0, 0))
+        if user_answered > 1:
+            rest = (user_correct - is_correct) / (user_answered - 1)
+            row[2] += 1
+            row[3] += is_correct
+            row[4] += rest
+            row[5] += is_correct * rest
+            row[6] += rest * rest
+            pair_row[2] += 1
+            pair_row[3] += rest
+
+    order = sorted(question_index, key=question_index.get)
+    pairs = sorted(pair_index, key=pair_index.get)
+    return {
+        'questions': order,
+        'responses': [row[0] for row in sums],
+        'correct': [row[1] for row in sums],
+        'point_biserial': [_point_biserial(*row[2:]) if row[2] else None for row in sums],
+        'pairs': pairs,
+        'pair_responses': [row[0] for row in pair_sums],
+        'pair_correct': [row[1] for row in pair_sums],
+        'pair_mean_score': [row[3] / row[2] if row[2] else None for row in pair_sums],
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 4)
+
+
+def analyze(rows, scores):
+    """
+    Statistics for each question in ``rows`` of (question_id, user_id,
+    is_correct, user_answer); returns question_id -> statistics and the
+    number of rows read
+    """
+    question_ids, user_ids, correct, answers = [], [], [], []
+    # Answers are coded as they stream in; equal keys share a code
+    raw_codes, key_codes = {}, {}
+    for question_id, user_id, is_correct, user_answer in rows:
+        question_ids.append(question_id)
+        user_ids.append(user_id)
+        correct.append(int(is_correct))
+        raw = user_answer if isinstance(user_answer, str) else answer_key(user_answer)
+        code = raw_codes.get(raw)
+        if code is None:
+            code = raw_codes[raw] = key_codes.setdefault(answer_key(raw), len(key_codes))
+        answers.append(code)
+    if not question_ids:
+        return {}, 0
+
+    aggregate = _aggregate_numpy if numpy is not None else _aggregate_python
+    totals = aggregate(question_ids, user_ids, correct, answers, scores)
+
+    keys = sorted(key_codes, key=key_codes.get)
+    distributions = [[] for _ in totals['questions']]
+    for index, (position, code) in enumerate(totals['pairs']):
+        count = totals['pair_responses'][index]
+        distributions[position].append({
+            'answer': keys[code],
+            'count': count,
+            'share': round(count / totals['responses'][position], 4),
+            'correct': totals['pair_correct'][index] * 2 > count,
+            'mean_score': _round(totals['pair_mean_score'][index]),
+        })
+
+    results = {}
+    for position, question_id in enumerate(totals['questions']):
+        responses = totals['responses'][position]
+        results[question_id] = {
+            'responses': responses,
+            'correct_responses': totals['correct'][position],
+            'p_value': round(totals['correct'][position] / responses, 4),
+            'point_biserial': _round(totals['point_biserial'][position]),
+            'answer_distribution': sorted(distributions[position], key=lambda row: (-row['count'], row['answer'])),
+        }
+    return results, len(question_ids)
+
+
+def distractor_summary(question, distribution):
+    """Wrong answers keyed by answer, including listed options nobody chose"""
+    distractors = {
+        row['answer']: {'count': row['count'], 'share': row['share'], 'mean_score': row['mean_score']}
+        for row in distribution if not row['correct']
+    }
+    correct_answers = question.correct_answer if isinstance(question.correct_answer, list) else [question.correct_answer]
+    correct_keys = {answer_key(answer).lower() for answer in correct_answers}
+    chosen = {row['answer'].lower() for row in distribution}
+    if isinstance(question.options, list):
+        for option in question.options:
+            key = answer_key(option)
+            if key.lower() not in correct_keys and key.lower() not in chosen:
+                distractors[key] = {'count': 0, 'share': 0.0, 'mean_score': None}
+    return distractors
+
+
+def save_results(results):
+    questions = Question.objects.filter(id__in=results).only('id', 'options', 'correct_answer')
+    statistics = [
+        QuestionStatistics(
+            question_id=question.id,
+            distractors=distractor_summary(question, results[question.id]['answer_distribution']),
+            **results[question.id],
+        )
+        for question in questions
+    ]
+    QuestionStatistics.objects.bulk_create(
+        statistics, update_conflicts=True, unique_fields=['question'], update_fields=STATISTICS_FIELDS,
+    )
+
+
+def run_item_analysis(full=False, questions_per_batch=QUESTIONS_PER_BATCH, chunk_size=CHUNK_SIZE):
+    """Analyze the questions answered since the last run (every answered question if full)"""
+    last_run = None
+    if not full:
+        last_run = (
+            ItemAnalysisRun.objects.filter(finished_at__isnull=False)
+            .exclude(watermark=None).order_by('-watermark').first()
+        )
+    run = ItemAnalysisRun.objects.create()
+
+    answered = QuestionProgress.objects.filter(is_answered=True)
+    watermark = answered.aggregate(latest=Max('answered_at'))['latest']
+    changed = answered.filter(answered_at__lte=watermark) if watermark else answered.none()
+    if last_run:
+        changed = changed.filter(answered_at__gt=last_run.watermark)
+    question_ids = sorted(set(changed.order_by().values_list('question_id', flat=True).distinct()))
+
+    scores = student_scores() if question_ids else {}
+    for start in range(0, len(question_ids), questions_per_batch):
+        batch = question_ids[start:start + questions_per_batch]
+        rows = (
+            answered.filter(question_id__in=batch).order_by()
+            .values_list('question_id', 'user_id', 'is_correct', 'user_answer')
+        )
+        results, row_count = analyze(rows.iterator(chunk_size=chunk_size), scores)
+        save_results(results)
+        run.rows_processed += row_count
+        run.questions_updated += len(results)
+
+    run.watermark = watermark or (last_run.watermark if last_run else None)
+    run.finished_at = timezone.now()
+    run.save()
+    return run
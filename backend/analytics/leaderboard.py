@@ -0,0 +1,387 @@
+"""
+XP leaderboards
+Rankings are kept as sorted sets (global, per-campus, per-grade and
+per-week), updated incrementally whenever a LevelProgress changes.
+Redis sorted sets are used when LEADERBOARD_REDIS_URL is configured,
+otherwise each process keeps its own skip lists in memory and rebuilds
+them from the database every LEADERBOARD_MAX_AGE seconds.
+"""
+
+import random
+import time
+from datetime import date, timedelta
+from threading import RLock
+
+from django.conf import settings
+from django.db.models import OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from progress.models import LevelProgress
+from students.models import Student
+from users.models import User
+
+
+def week_start(day=None):
+    """Monday of the week containing day (default: today)"""
+    day = day or timezone.now().date()
+    return day - timedelta(days=day.weekday())
+
+
+def global_key():
+    return 'global'
+
+
+def campus_key(campus_id):
+    return f'campus:{campus_id}'
+
+
+def grade_key(grade):
+    return f'grade:{grade}'
+
+
+def week_key(day=None):
+    return f'week:{week_start(day).isoformat()}'
+
+
+class _SkipList:
+    """
+    Sorted sequence (an indexable skip list) with O(log n) expected insert,
+    remove, rank and offset lookups. Each link records how many positions
+    it skips, so ranks are summed on the way down instead of counted.
+    """
+
+    MAX_LEVELS = 32
+
+    class _Node:
+        __slots__ = ('value', 'next', 'width')
+
+        def __init__(self, value, levels):
+            self.value = value
+            self.next = [None] * levels
+            self.width = [1] * levels
+
+    def __init__(self, values=()):
+        self._nil = self._Node(None, 0)
+        self._head = self._Node(None, self.MAX_LEVELS)
+        self._head.next = [self._nil] * self.MAX_LEVELS
+        self._size = 0
+        for value in values:
+            self.insert(value)
+
+    def __len__(self):
+        return self._size
+
+    def _levels(self):
+        levels = 1
+        while levels < self.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def insert(self, value):
+        chain = [None] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not self._nil and node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._levels()
+        new = self._Node(value, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            new.next[level] = previous.next[level]
+            previous.next[level] = new
+            new.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, value):
+        chain = [None] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not self._nil and node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+
+        found = chain[0].next[0]
+        if found is self._nil or found.value != value:
+            raise KeyError(value)
+        for level in range(len(found.next)):
+            previous = chain[level]
+            previous.width[level] += found.width[level] - 1
+            previous.next[level] = found.next[level]
+        for level in range(len(found.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, value):
+        """Number of items less than value"""
+        rank = 0
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not self._nil and node.next[level].value < value:
+                rank += node.width[level]
+                node = node.next[level]
+        return rank
+
+    def slice(self, offset, limit):
+        """Items at positions offset .. offset + limit - 1"""
+        if offset >= self._size or limit <= 0:
+            return []
+        remaining = offset + 1
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not self._nil and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        items = []
+        while node is not self._nil and len(items) < limit:
+            items.append(node.value)
+            node = node.next[0]
+        return items
+
+
+class _SortedBoard:
+    """Scores plus their (-score, member) entries in a skip list"""
+
+    def __init__(self, scores):
+        self.scores = dict(scores)
+        self.entries = _SkipList(sorted((-score, member) for member, score in self.scores.items()))
+        self.built_at = time.monotonic()
+
+    def set_score(self, member, score):
+        old = self.scores.get(member)
+        if old == score:
+            return
+        if old is not None:
+            self.entries.remove((-old, member))
+        self.scores[member] = score
+        self.entries.insert((-score, member))
+
+    def rank(self, member):
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return self.entries.rank((-score, member))
+
+
+class InMemoryBackend:
+    """Per-process sorted boards, refreshed from the database when stale"""
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._boards = {}
+        self._lock = RLock()
+
+    def is_built(self, key):
+        board = self._boards.get(key)
+        return board is not None and time.monotonic() - board.built_at < self.max_age
+
+    def has_boards(self):
+        """Whether any board is loaded, so an update could land somewhere"""
+        return bool(self._boards)
+
+    def replace(self, key, scores):
+        board = _SortedBoard(scores)
+        with self._lock:
+            self._boards[key] = board
+
+    def set_score(self, key, member, score):
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None:
+                board.set_score(member, score)
+
+    def rank(self, key, member):
+        """0-based rank, highest score first (None if not ranked)"""
+        with self._lock:
+            board = self._boards.get(key)
+            return board.rank(member) if board else None
+
+    def score(self, key, member):
+        with self._lock:
+            board = self._boards.get(key)
+            return board.scores.get(member) if board else None
+
+    def top(self, key, limit, offset=0):
+        """[(member, score)] for ranks offset .. offset + limit - 1"""
+        with self._lock:
+            board = self._boards.get(key)
+            if board is None:
+                return []
+            return [(member, -neg_score) for neg_score, member in board.entries.slice(offset, limit)]
+
+    def count(self, key):
+        with self._lock:
+            board = self._boards.get(key)
+            return len(board.entries) if board else 0
+
+
+class RedisBackend:
+    """
+    Redis sorted sets shared by every process. The ':built' marker expires
+    after max_age, so boards are reloaded as often as in memory, and the
+    sets themselves outlive it by max_age, so a past week's board is
+    dropped once nobody reads it.
+    """
+
+    def __init__(self, url, max_age=300):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.max_age = max_age
+
+    def _key(self, key):
+        return f'leaderboard:{key}'
+
+    def is_built(self, key):
+        return bool(self.client.exists(self._key(key) + ':built'))
+
+    def has_boards(self):
+        return True
+
+    def replace(self, key, scores):
+        pipe = self.client.pipeline()
+        pipe.delete(self._key(key))
+        if scores:
+            pipe.zadd(self._key(key), {str(member): score for member, score in scores.items()})
+            pipe.expire(self._key(key), self.max_age * 2)
+        pipe.set(self._key(key) + ':built', 1, ex=self.max_age)
+        pipe.execute()
+
+    def set_score(self, key, member, score):
+        if self.is_built(key):
+            self.client.zadd(self._key(key), {str(member): score})
+
+    def rank(self, key, member):
+        return self.client.zrevrank(self._key(key), str(member))
+
+    def score(self, key, member):
+        score = self.client.zscore(self._key(key), str(member))
+        return int(score) if score is not None else None
+
+    def top(self, key, limit, offset=0):
+        rows = self.client.zrevrange(self._key(key), offset, offset + limit - 1, withscores=True)
+        return [(int(member), int(score)) for member, score in rows]
+
+    def count(self, key):
+        return self.client.zcard(self._key(key))
+
+
+_backend = None
+
+
+def get_backend():
+    """Redis backend when configured and installed, otherwise in-process"""
+    global _backend
+    if _backend is None:
+        url = getattr(settings, 'LEADERBOARD_REDIS_URL', None)
+        max_age = getattr(settings, 'LEADERBOARD_MAX_AGE', 300)
+        backend = None
+        if url:
+            try:
+                backend = RedisBackend(url, max_age)
+            except ImportError:
+                backend = None
+        _backend = backend or InMemoryBackend(max_age)
+    return _backend
+
+
+def _xp_queryset(key):
+    """LevelProgress rows that count towards a board"""
+    scope, _, value = key.partition(':')
+    progress = LevelProgress.objects.all()
+
+    if scope == 'week':
+        start = date.fromisoformat(value)
+        progress = progress.filter(completed_at__date__gte=start, completed_at__date__lt=start + timedelta(days=7))
+    elif scope in ('campus', 'grade'):
+        students = Student.objects.filter(**{'campus_id' if scope == 'campus' else 'grade': value})
+        progress = progress.filter(user__student_id__in=Subquery(students.values('student_id')))
+    return progress
+
+
+def rebuild(key):
+    """Reload a board from LevelProgress with one grouped query"""
+    scores = {
+        row['user_id']: row['xp'] or 0
+        for row in _xp_queryset(key).values('user_id').annotate(xp=Sum('xp_earned')).order_by()
+    }
+    get_backend().replace(key, scores)
+
+
+def _ensure(key):
+    backend = get_backend()
+    if not backend.is_built(key):
+        rebuild(key)
+    return backend
+
+
+def get_rank(key, user_id):
+    """{'rank': 1-based rank, 'xp': score} for a user, or None if unranked"""
+    backend = _ensure(key)
+    rank = backend.rank(key, user_id)
+    if rank is None:
+        return None
+    return {'rank': rank + 1, 'xp': backend.score(key, user_id)}
+
+
+def get_top(key, limit=10, offset=0):
+    """A page of [{'rank', 'user_id', 'xp'}], highest XP first"""
+    backend = _ensure(key)
+    return [
+        {'rank': offset + index + 1, 'user_id': member, 'xp': score}
+        for index, (member, score) in enumerate(backend.top(key, limit, offset))
+    ]
+
+
+def get_count(key):
+    """Number of ranked users on a board"""
+    return _ensure(key).count(key)
+
+
+def _board_keys(campus_id, grade):
+    """Every board a student on that campus and grade appears on this week"""
+    keys = [global_key(), week_key()]
+    if campus_id:
+        keys.append(campus_key(campus_id))
+    if grade:
+        keys.append(grade_key(grade))
+    return keys
+
+
+def record_progress(user_id):
+    """Push a user's current totals to every board they appear on"""
+    backend = get_backend()
+    if not backend.has_boards():
+        # Boards that were never loaded pick the change up when built
+        return
+
+    # Board membership and both totals in one query
+    current_week = week_start()
+    student = Student.objects.filter(student_id=OuterRef('student_id'))
+    row = User.objects.filter(pk=user_id).annotate(
+        campus_id=Subquery(student.values('campus_id')[:1]),
+        grade=Subquery(student.values('grade')[:1]),
+        total=Sum('level_progress__xp_earned'),
+        week=Sum('level_progress__xp_earned', filter=Q(
+            level_progress__completed_at__date__gte=current_week,
+            level_progress__completed_at__date__lt=current_week + timedelta(days=7),
+        )),
+    ).values('campus_id', 'grade', 'total', 'week').first()
+    if row is None:
+        return
+
+    for key in _board_keys(row['campus_id'], row['grade']):
+        if key.startswith('week:'):
+            if row['week'] is None:
+                # Nothing completed this week, so not on the weekly board
+                continue
+            backend.set_score(key, user_id, row['week'])
+        else:
+            backend.set_score(key, user_id, row['total'] or 0)
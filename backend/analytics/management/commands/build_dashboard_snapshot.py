@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from analytics.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the precomputed donor dashboard snapshot'
+
+    def handle(self, *args, **options):
+        sections = build_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot rebuilt for {len(sections['student_performance'])} students"
+        ))
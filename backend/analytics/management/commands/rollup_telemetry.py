@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.telemetry import flush_telemetry, prune_telemetry, rollup_overall
+
+
+class Command(BaseCommand):
+    help = 'Roll request telemetry into OverallAnalytics response time and uptime, and prune old telemetry'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=str,
+            help='Roll up every day from this day (YYYY-MM-DD), defaults to yesterday'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        day = today - timedelta(days=1)
+        if options.get('since'):
+            try:
+                day = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('Invalid --since, expected YYYY-MM-DD')
+
+        flush_telemetry()
+        rows = 0
+        while day <= today:
+            rows += rollup_overall(day)
+            day += timedelta(days=1)
+        self.stdout.write(f'{rows} OverallAnalytics rows updated')
+
+        deleted = prune_telemetry(today)
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} telemetry rows past retention'))
@@ -0,0 +1,43 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.trends import (
+    DAILY_RETENTION_DAYS, bucket_end, bucket_start, prune_trends, rollup_bucket
+)
+
+
+class Command(BaseCommand):
+    help = 'Roll LevelProgress completions up into daily, weekly and monthly PerformanceTrend buckets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=str,
+            help='Rebuild every bucket from this day (YYYY-MM-DD), defaults to yesterday'
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        since = today - timedelta(days=1)
+        if options.get('since'):
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('Invalid --since, expected YYYY-MM-DD')
+
+        # Daily and weekly buckets are only kept within retention
+        retained_since = max(since, today - timedelta(days=DAILY_RETENTION_DAYS))
+
+        for trend_type in ('daily', 'weekly', 'monthly'):
+            first_day = since if trend_type == 'monthly' else retained_since
+            start = bucket_start(trend_type, first_day)
+            buckets = 0
+            while start <= today:
+                rollup_bucket(trend_type, start)
+                start = bucket_end(trend_type, start)
+                buckets += 1
+            self.stdout.write(f'{trend_type}: {buckets} buckets rolled up')
+
+        deleted = prune_trends(today)
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} trend rows past retention'))
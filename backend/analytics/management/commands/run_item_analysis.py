@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.item_analysis import CHUNK_SIZE, QUESTIONS_PER_BATCH, numpy, run_item_analysis
+
+
+class Command(BaseCommand):
+    help = 'Compute p-values, point-biserial discrimination and distractor statistics from question answers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Re-analyze every answered question')
+        parser.add_argument('--batch-size', type=int, default=QUESTIONS_PER_BATCH, help='Questions analyzed per batch')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Answer rows fetched per query chunk')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('--batch-size and --chunk-size must be at least 1')
+        if numpy is None:
+            self.stdout.write(self.style.WARNING('NumPy is not installed; aggregating in plain Python'))
+
+        run = run_item_analysis(
+            full=options['full'], questions_per_batch=options['batch_size'], chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Analyzed {run.questions_updated} questions from {run.rows_processed} answers '
+            f'(answers up to {run.watermark or "now"})'
+        ))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_remove_teacheranalytics_assigned_grade_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='performancetrend',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='performancetrend',
+            name='scope',
+            field=models.CharField(choices=[('global', 'Global'), ('campus', 'Campus'), ('grade', 'Grade')], default='global', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='performancetrend',
+            name='scope_key',
+            field=models.CharField(blank=True, default='', help_text='Campus id or grade name; empty for global trends', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='performancetrend',
+            name='date',
+            field=models.DateField(help_text='First day of the bucket'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='performancetrend',
+            unique_together={('trend_type', 'scope', 'scope_key', 'date')},
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_performancetrend_scope'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=50, unique=True)),
+                ('payload', models.TextField(help_text='Compact JSON served as-is')),
+                ('etag', models.CharField(help_text='SHA-1 of the payload', max_length=64)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Snapshot',
+                'verbose_name_plural': 'Dashboard Snapshots',
+            },
+        ),
+    ]
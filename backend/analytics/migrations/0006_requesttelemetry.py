@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_replicaheartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestTelemetry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('route', models.CharField(help_text='URL pattern the request resolved to', max_length=255)),
+                ('status_class', models.CharField(help_text='2xx, 3xx, 4xx or 5xx', max_length=3)),
+                ('request_count', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0.0)),
+                ('max_ms', models.FloatField(default=0.0)),
+                ('buckets', models.JSONField(default=dict, help_text='Latency bucket index -> request count')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Request Telemetry',
+                'verbose_name_plural': 'Request Telemetry',
+                'ordering': ['-date', 'route'],
+                'unique_together': {('date', 'route', 'status_class')},
+            },
+        ),
+    ]
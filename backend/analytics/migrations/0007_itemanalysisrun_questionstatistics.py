@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_requesttelemetry'),
+        ('levels', '0006_json_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemAnalysisRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('watermark', models.DateTimeField(blank=True, help_text='Answers changed up to this time are reflected in the statistics', null=True)),
+                ('rows_processed', models.PositiveIntegerField(default=0)),
+                ('questions_updated', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Item Analysis Run',
+                'verbose_name_plural': 'Item Analysis Runs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('correct_responses', models.PositiveIntegerField(default=0)),
+                ('p_value', models.FloatField(default=0.0, help_text='Share of responses that were correct')),
+                ('point_biserial', models.FloatField(blank=True, help_text="Correlation of answering correctly with the student's score on other questions", null=True)),
+                ('answer_distribution', models.JSONField(default=list, help_text='Responses per answer, most common first')),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='levels.question')),
+            ],
+            options={
+                'verbose_name': 'Question Statistics',
+                'verbose_name_plural': 'Question Statistics',
+                'ordering': ['p_value'],
+            },
+        ),
+    ]
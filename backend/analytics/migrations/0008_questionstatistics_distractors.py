@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-19 04:22
+
+from django.db import migrations, models
+
+
+# Entries item analysis used to merge into Question.distractor_analysis
+COMPUTED_KEYS = ('analyzed_at', 'distractors')
+
+
+def move_distractors(apps, schema_editor):
+    """Strip computed entries from questions and keep them on their statistics"""
+    Question = apps.get_model('levels', 'Question')
+    QuestionStatistics = apps.get_model('analytics', 'QuestionStatistics')
+    questions = []
+    for question in Question.objects.filter(distractor_analysis__has_key='analyzed_at').iterator():
+        analysis = question.distractor_analysis
+        QuestionStatistics.objects.filter(question_id=question.id).update(
+            distractors=analysis.get('distractors') or {}
+        )
+        for key in COMPUTED_KEYS:
+            analysis.pop(key, None)
+        questions.append(question)
+    Question.objects.bulk_update(questions, ['distractor_analysis'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_itemanalysisrun_questionstatistics'),
+        ('levels', '0006_json_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionstatistics',
+            name='distractors',
+            field=models.JSONField(default=dict, help_text='Wrong answers chosen, and listed options nobody chose, keyed by answer'),
+        ),
+        migrations.RunPython(move_distractors, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,14 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from campus.models import Campus
 from classes.models import Grade
 from teachers.models import Teacher
 from students.models import Student
 from progress.models import LevelProgress
+from progress.signals import progress_batch_saved
 from levels.models import Level
 from groups.models import Group
 
@@ -232,9 +236,20 @@ class PerformanceTrend(models.Model):
         ('monthly', 'Monthly'),
     ]
     
+    SCOPE_CHOICES = [
+        ('global', 'Global'),
+        ('campus', 'Campus'),
+        ('grade', 'Grade'),
+    ]
+    
     id = models.AutoField(primary_key=True)
     trend_type = models.CharField(max_length=10, choices=TREND_TYPE_CHOICES)
-    date = models.DateField()
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, default='global')
+    scope_key = models.CharField(
+        max_length=50, blank=True, default='',
+        help_text="Campus id or grade name; empty for global trends"
+    )
+    date = models.DateField(help_text="First day of the bucket")
     
     # Overall Trends
     total_users = models.PositiveIntegerField(default=0)
@@ -257,8 +272,136 @@ class PerformanceTrend(models.Model):
     class Meta:
         verbose_name = "Performance Trend"
         verbose_name_plural = "Performance Trends"
-        unique_together = ['trend_type', 'date']
+        unique_together = ['trend_type', 'scope', 'scope_key', 'date']
         ordering = ['-date']
     
     def __str__(self):
-        return f"{self.trend_type.title()} Trend - {self.date}"
+        scope = f" {self.scope} {self.scope_key}" if self.scope_key else ""
+        return f"{self.trend_type.title()}{scope} Trend - {self.date}"
+
+
+class DashboardSnapshot(models.Model):
+    """Precomputed JSON for one section of the public donor dashboard"""
+    
+    section = models.CharField(max_length=50, unique=True)
+    payload = models.TextField(help_text="Compact JSON served as-is")
+    etag = models.CharField(max_length=64, help_text="SHA-1 of the payload")
+    built_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Dashboard Snapshot"
+        verbose_name_plural = "Dashboard Snapshots"
+    
+    def __str__(self):
+        return f"{self.section} snapshot - {self.built_at}"
+
+
+class RequestTelemetry(models.Model):
+    """Daily request latency histogram for one route and status class"""
+    
+    date = models.DateField()
+    route = models.CharField(max_length=255, help_text="URL pattern the request resolved to")
+    status_class = models.CharField(max_length=3, help_text="2xx, 3xx, 4xx or 5xx")
+    request_count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0.0)
+    max_ms = models.FloatField(default=0.0)
+    buckets = models.JSONField(default=dict, help_text="Latency bucket index -> request count")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Request Telemetry"
+        verbose_name_plural = "Request Telemetry"
+        unique_together = ['date', 'route', 'status_class']
+        ordering = ['-date', 'route']
+    
+    def __str__(self):
+        return f"{self.route} {self.status_class} - {self.date}"
+
+
+class ReplicaHeartbeat(models.Model):
+    """Single row written on the primary; its age on the replica is the replication lag"""
+    
+    beat_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = "Replica Heartbeat"
+        verbose_name_plural = "Replica Heartbeats"
+    
+    def __str__(self):
+        return f"Heartbeat - {self.beat_at}"
+
+
+@receiver(post_save, sender=LevelProgress)
+def update_leaderboards(sender, instance, **kwargs):
+    """Keep XP leaderboards current as progress is saved"""
+    from .leaderboard import record_progress
+    record_progress(instance.user_id)
+
+
+@receiver(post_save, sender=LevelProgress)
+def update_daily_trends(sender, instance, **kwargs):
+    """Queue a refresh of the daily trend buckets for the day a level was completed"""
+    if instance.is_completed and instance.completed_at:
+        from .tasks import queue_daily_rollup
+        queue_daily_rollup(timezone.localdate(instance.completed_at))
+
+
+@receiver(progress_batch_saved)
+def update_after_progress_sync(sender, user_id, days, **kwargs):
+    """Refresh leaderboards and queue the daily trends after a batched progress sync"""
+    from .leaderboard import record_progress
+    from .tasks import queue_daily_rollup
+    record_progress(user_id)
+    for day in sorted(days):
+        queue_daily_rollup(day)
+
+
+class QuestionStatistics(models.Model):
+    """Item analysis of one question's answers, refreshed by run_item_analysis"""
+    
+    question = models.OneToOneField(
+        'levels.Question', on_delete=models.CASCADE, related_name='statistics'
+    )
+    responses = models.PositiveIntegerField(default=0)
+    correct_responses = models.PositiveIntegerField(default=0)
+    p_value = models.FloatField(default=0.0, help_text="Share of responses that were correct")
+    point_biserial = models.FloatField(
+        null=True, blank=True,
+        help_text="Correlation of answering correctly with the student's score on other questions"
+    )
+    answer_distribution = models.JSONField(
+        default=list, help_text="Responses per answer, most common first"
+    )
+    distractors = models.JSONField(
+        default=dict, help_text="Wrong answers chosen, and listed options nobody chose, keyed by answer"
+    )
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Question Statistics"
+        verbose_name_plural = "Question Statistics"
+        ordering = ['p_value']
+    
+    def __str__(self):
+        return f"Question {self.question_id} statistics - p={self.p_value:.2f}"
+
+
+class ItemAnalysisRun(models.Model):
+    """One item analysis pass; the latest watermark bounds what the next run reads"""
+    
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    watermark = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Answers changed up to this time are reflected in the statistics"
+    )
+    rows_processed = models.PositiveIntegerField(default=0)
+    questions_updated = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = "Item Analysis Run"
+        verbose_name_plural = "Item Analysis Runs"
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"Item analysis - {self.started_at}"
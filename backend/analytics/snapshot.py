@@ -0,0 +1,287 @@
+"""
+Donor dashboard snapshot
+The public donor endpoints are served from DashboardSnapshot rows: one
+compact JSON blob per section, rebuilt with a fixed number of grouped
+queries by a periodic task (or the build_dashboard_snapshot command), with
+an ETag for conditional GETs. A stale snapshot is served while a rebuild
+is queued; only a missing or very old one is rebuilt inside the request,
+by one request at a time while the others serve the old row or wait.
+"""
+
+import hashlib
+import json
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Avg, Count, Exists, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Rank
+from django.db.models.expressions import Window
+from django.utils import timezone
+
+from campus.models import Campus
+from classes.models import Grade
+from groups.models import Group
+from levels.models import Level
+from progress.models import LevelProgress
+from students.models import Student
+from teachers.models import Teacher
+from users.models import User
+from .models import DashboardSnapshot
+
+SNAPSHOT_MAX_AGE = 15 * 60
+SNAPSHOT_REFRESH_SECONDS = 10 * 60
+# Older than this the request rebuilds it rather than waiting for a worker
+SNAPSHOT_STALE_LIMIT = 60 * 60
+# Held by the request rebuilding inline; expires if that request dies
+SNAPSHOT_BUILD_LOCK = 'analytics:dashboard_snapshot:building'
+SNAPSHOT_BUILD_TIMEOUT = 5 * 60
+# How long a request with no snapshot to serve waits for that rebuild
+SNAPSHOT_WAIT_SECONDS = 30
+SNAPSHOT_POLL_SECONDS = 0.5
+
+SECTIONS = ('overall_stats', 'campus_data', 'teacher_performance', 'student_performance')
+
+# Parsed payload per section as (etag, data), so serving a page does not re-parse JSON
+_parsed = {}
+
+
+def _student_rows(total_levels, today):
+    """Every student with a login, their XP totals and XP rank"""
+    progress = (
+        LevelProgress.objects.filter(user__student_id=OuterRef('student_id'))
+        .values('user__student_id')
+    )
+    user = User.objects.filter(student_id=OuterRef('student_id'))
+
+    rows = (
+        Student.objects.filter(Exists(user))
+        .annotate(
+            total_xp=Coalesce(
+                Subquery(progress.annotate(total=Sum('xp_earned')).values('total')),
+                Value(0), output_field=IntegerField(),
+            ),
+            levels_completed=Coalesce(
+                Subquery(progress.annotate(total=Count('id', filter=Q(is_completed=True))).values('total')),
+                Value(0), output_field=IntegerField(),
+            ),
+            last_login=Subquery(user.values('last_login')[:1]),
+            rank=Window(expression=Rank(), order_by=F('total_xp').desc()),
+        )
+        .order_by('rank', 'id')
+        .values(
+            'id', 'name', 'student_id', 'grade', 'shift', 'campus_id', 'campus__campus_name',
+            'class_teacher_id', 'class_teacher__name', 'total_xp', 'levels_completed',
+            'last_login', 'rank',
+        )
+    )
+
+    students = []
+    for row in rows:
+        last_login = row['last_login']
+        students.append({
+            'student_id': row['id'],
+            'student_name': row['name'],
+            'student_code': row['student_id'],
+            'class_name': f"{row['grade']} {row['shift'] or ''}".strip(),
+            'campus_id': row['campus_id'],
+            'campus_name': row['campus__campus_name'],
+            'teacher_id': row['class_teacher_id'],
+            'teacher_name': row['class_teacher__name'] or 'No Teacher',
+            'total_xp': row['total_xp'],
+            'levels_completed': row['levels_completed'],
+            'current_streak': 0,
+            'longest_streak': 0,
+            'last_active': last_login.isoformat() if last_login else None,
+            'active_today': bool(last_login and timezone.localdate(last_login) == today),
+            'completion_rate': round(row['levels_completed'] / total_levels * 100, 2) if total_levels else 0,
+            'rank': row['rank'],
+        })
+    return students
+
+
+def _overall_stats(now, total_levels, students):
+    today = now.date()
+    users = User.objects.aggregate(
+        total_users=Count('id'),
+        total_teachers=Count('id', filter=Q(role='teacher')),
+        total_students=Count('id', filter=Q(role='student')),
+        active_users_today=Count('id', filter=Q(last_login__date=today)),
+        students_active_this_week=Count('id', filter=Q(role='student', last_login__gte=now - timedelta(days=7))),
+        students_active_this_month=Count('id', filter=Q(role='student', last_login__gte=now - timedelta(days=30))),
+    )
+    progress = LevelProgress.objects.aggregate(
+        levels_completed_today=Count('id', filter=Q(completed_at__date=today)),
+        total_levels_completed=Count('id', filter=Q(is_completed=True)),
+        total_xp_earned=Sum('xp_earned'),
+        average_completion_rate=Avg('completion_percentage'),
+        learners=Count('user_id', distinct=True),
+    )
+    total_xp = progress['total_xp_earned'] or 0
+
+    return {
+        'date': now.isoformat(),
+        'total_users': users['total_users'],
+        'total_teachers': users['total_teachers'],
+        'total_students': users['total_students'],
+        'active_users_today': users['active_users_today'],
+        'total_levels': total_levels,
+        'total_groups': Group.objects.count(),
+        'levels_completed_today': progress['levels_completed_today'],
+        'total_levels_completed': progress['total_levels_completed'],
+        'average_completion_rate': round(progress['average_completion_rate'] or 0, 2),
+        'average_xp_per_student': round(total_xp / progress['learners'], 2) if progress['learners'] else 0,
+        'total_xp_earned': total_xp,
+        'students_with_streak': users['total_students'],
+        'students_active_this_week': users['students_active_this_week'],
+        'students_active_this_month': users['students_active_this_month'],
+        'top_student_xp': students[0]['total_xp'] if students else 0,
+        'top_student_streak': 0,
+        'top_class_completion': 0.0,
+    }
+
+
+def _campus_data(students):
+    teachers = dict(Teacher.objects.values('campus_id').annotate(n=Count('id')).values_list('campus_id', 'n'))
+    grades = dict(Grade.objects.values('campus_id').annotate(n=Count('id')).values_list('campus_id', 'n'))
+    completion = dict(
+        LevelProgress.objects.annotate(
+            campus_id=Subquery(
+                Student.objects.filter(student_id=OuterRef('user__student_id')).values('campus_id')[:1]
+            )
+        ).values('campus_id').annotate(avg=Avg('completion_percentage')).values_list('campus_id', 'avg')
+    )
+
+    by_campus = defaultdict(lambda: {'students': 0, 'active': 0, 'xp': 0})
+    for student in students:
+        totals = by_campus[student['campus_id']]
+        totals['students'] += 1
+        totals['active'] += student['active_today']
+        totals['xp'] += student['total_xp']
+
+    campus_data = []
+    for campus_id, campus_name in Campus.objects.order_by('id').values_list('id', 'campus_name'):
+        totals = by_campus[campus_id]
+        campus_data.append({
+            'campus_id': campus_id,
+            'campus_name': campus_name,
+            'total_teachers': teachers.get(campus_id, 0),
+            'total_students': totals['students'],
+            'total_classes': grades.get(campus_id, 0),
+            'active_students_today': totals['active'],
+            'total_xp_earned': totals['xp'],
+            'average_class_completion': round(completion.get(campus_id) or 0, 2),
+        })
+    return campus_data
+
+
+def _teacher_performance(students):
+    classes = {}
+    for teacher_id, name, shift in Grade.objects.filter(
+        english_teacher__isnull=False
+    ).order_by('id').values_list('english_teacher_id', 'name', 'shift'):
+        classes.setdefault(teacher_id, f"{name} {shift}")
+
+    # students are already in rank order, so the first one seen is the top student
+    by_teacher = defaultdict(list)
+    for student in students:
+        if student['teacher_id']:
+            by_teacher[student['teacher_id']].append(student)
+
+    teacher_data = []
+    for teacher_id, name, code in Teacher.objects.order_by('id').values_list('id', 'name', 'teacher_id'):
+        taught = by_teacher.get(teacher_id, [])
+        total_students = len(taught)
+        completed = sum(1 for student in taught if student['levels_completed'])
+        teacher_data.append({
+            'teacher_id': teacher_id,
+            'teacher_name': name,
+            'teacher_code': code,
+            'assigned_class': classes.get(teacher_id, 'No Class Assigned'),
+            'total_students': total_students,
+            'students_completed_levels': completed,
+            'active_students_today': sum(student['active_today'] for student in taught),
+            'average_completion_rate': round(completed / total_students * 100, 2) if total_students else 0,
+            'average_xp_per_student': round(sum(s['total_xp'] for s in taught) / total_students, 2) if total_students else 0,
+            'top_student_name': taught[0]['student_name'] if taught else 'N/A',
+            'top_student_xp': taught[0]['total_xp'] if taught else 0,
+            'struggling_students': sum(1 for student in taught if not student['levels_completed']),
+        })
+    return teacher_data
+
+
+def build_snapshot():
+    """Recompute every donor dashboard section and store it"""
+    now = timezone.now()
+    total_levels = Level.objects.filter(is_active=True).count()
+    students = _student_rows(total_levels, now.date())
+
+    sections = {
+        'overall_stats': _overall_stats(now, total_levels, students),
+        'campus_data': _campus_data(students),
+        'teacher_performance': _teacher_performance(students),
+        'student_performance': students,
+    }
+
+    snapshots = []
+    for section, data in sections.items():
+        payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))
+        snapshots.append(DashboardSnapshot(
+            section=section,
+            payload=payload,
+            etag=hashlib.sha1(payload.encode()).hexdigest(),
+        ))
+    DashboardSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['section'],
+        update_fields=['payload', 'etag', 'built_at'],
+    )
+    return sections
+
+
+def get_section(section):
+    """The stored snapshot for a section, queueing a rebuild when it is stale"""
+    snapshot = DashboardSnapshot.objects.filter(section=section).first()
+    age = timezone.now() - snapshot.built_at if snapshot else None
+    if snapshot is None or age > timedelta(seconds=SNAPSHOT_STALE_LIMIT):
+        if cache.add(SNAPSHOT_BUILD_LOCK, 1, SNAPSHOT_BUILD_TIMEOUT):
+            try:
+                build_snapshot()
+            finally:
+                cache.delete(SNAPSHOT_BUILD_LOCK)
+            return DashboardSnapshot.objects.get(section=section)
+        if snapshot is not None:
+            # Another request is rebuilding it; the old row will do meanwhile
+            return snapshot
+        return _wait_for_section(section)
+    if age > timedelta(seconds=SNAPSHOT_MAX_AGE):
+        from .tasks import rebuild_dashboard_snapshot
+        rebuild_dashboard_snapshot.schedule(unique_key='analytics:dashboard_snapshot')
+    return snapshot
+
+
+def _wait_for_section(section):
+    """Wait for the request building the first snapshot, building it here if that one gives up"""
+    deadline = time.monotonic() + SNAPSHOT_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(SNAPSHOT_POLL_SECONDS)
+        snapshot = DashboardSnapshot.objects.filter(section=section).first()
+        if snapshot is not None:
+            return snapshot
+        if cache.get(SNAPSHOT_BUILD_LOCK) is None:
+            break
+    build_snapshot()
+    return DashboardSnapshot.objects.get(section=section)
+
+
+def get_section_data(snapshot):
+    """Parsed payload for a snapshot, cached per ETag"""
+    cached = _parsed.get(snapshot.section)
+    if cached and cached[0] == snapshot.etag:
+        return cached[1]
+    data = json.loads(snapshot.payload)
+    _parsed[snapshot.section] = (snapshot.etag, data)
+    return data
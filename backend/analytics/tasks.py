@@ -0,0 +1,53 @@
+from datetime import date
+
+from django.conf import settings
+
+from englishmaster.db_router import record_heartbeat, replica_alias
+from tasks.models import Task
+from tasks.queue import task
+
+from .item_analysis import run_item_analysis
+from .snapshot import SNAPSHOT_REFRESH_SECONDS, build_snapshot
+from .trends import rollup_bucket
+
+ITEM_ANALYSIS_INTERVAL = 6 * 60 * 60
+# Completions within this many seconds share one rollup of their day
+TREND_ROLLUP_DELAY = 60
+
+
+@task(max_attempts=3, retry_backoff=60, every=SNAPSHOT_REFRESH_SECONDS)
+def rebuild_dashboard_snapshot():
+    """Rebuild the donor dashboard snapshot ahead of it going stale"""
+    build_snapshot()
+
+
+@task(max_attempts=3, retry_backoff=300, every=ITEM_ANALYSIS_INTERVAL)
+def refresh_item_analysis():
+    """Fold answers given since the last run into the question statistics"""
+    run_item_analysis()
+
+
+@task(max_attempts=1, every=getattr(settings, 'REPLICA_HEARTBEAT_SECONDS', 10))
+def record_replica_heartbeat():
+    """Refresh the primary heartbeat that replica lag is measured against"""
+    if replica_alias() is not None:
+        record_heartbeat()
+
+
+@task(max_attempts=3, retry_backoff=30)
+def rollup_daily_trends(day):
+    """Recompute the daily trend buckets for one day (YYYY-MM-DD)"""
+    rollup_bucket('daily', date.fromisoformat(day))
+
+
+def queue_daily_rollup(day):
+    """
+    Queue a rollup of day's trend buckets unless one is still waiting to
+    run. A rollup that is already running may have read the day before
+    this completion, so it does not count; two requests racing here at
+    worst queue the same rollup twice.
+    """
+    args = [day.isoformat()]
+    waiting = Task.objects.filter(name=rollup_daily_trends.name, status='queued', args=args)
+    if not waiting.exists():
+        rollup_daily_trends.schedule(args=args, countdown=TREND_ROLLUP_DELAY)
@@ -0,0 +1,258 @@
+"""
+Request latency telemetry
+TelemetryMiddleware times every request into an HDR-style histogram (log
+buckets with 16 linear sub-buckets, so percentiles are within ~6%) kept in
+memory per URL pattern and status class. Each process flushes its
+histograms into RequestTelemetry every TELEMETRY_FLUSH_SECONDS; daily
+figures are rolled into OverallAnalytics.average_response_time and
+system_uptime_percentage (the share of requests that did not fail with 5xx).
+"""
+
+import time
+from datetime import timedelta
+from threading import Lock
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .models import OverallAnalytics, RequestTelemetry
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+TELEMETRY_RETENTION_DAYS = 90
+PERCENTILES = (50, 95, 99)
+
+
+def bucket_index(ms):
+    """Histogram bucket for a latency in milliseconds (microsecond resolution)"""
+    micros = max(int(ms * 1000), 0)
+    if micros < SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - SUB_BUCKET_BITS - 1
+    return shift * SUB_BUCKETS + (micros >> shift)
+
+
+def bucket_value(index):
+    """Midpoint of a bucket in milliseconds"""
+    if index < SUB_BUCKETS:
+        return index / 1000
+    shift = index // SUB_BUCKETS - 1
+    low = (index - shift * SUB_BUCKETS) << shift
+    return (low + (1 << shift) / 2) / 1000
+
+
+class LatencyHistogram:
+    """Request count per latency bucket, plus total and max for averages"""
+
+    def __init__(self, buckets=None, count=0, total_ms=0.0, max_ms=0.0):
+        self.buckets = {int(index): n for index, n in (buckets or {}).items()}
+        self.count = count
+        self.total_ms = total_ms
+        self.max_ms = max_ms
+
+    def record(self, ms):
+        index = bucket_index(ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def merge(self, other):
+        for index, n in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + n
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bucket_value(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        data = {'count': self.count}
+        for p in PERCENTILES:
+            data[f'p{p}_ms'] = round(self.percentile(p), 2)
+        data['average_ms'] = round(self.total_ms / self.count, 2) if self.count else 0.0
+        data['max_ms'] = round(self.max_ms, 2)
+        return data
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row.buckets, row.request_count, row.total_ms, row.max_ms)
+
+
+# Unflushed histograms of this process, keyed by (day, route, status class)
+_pending = {}
+_lock = Lock()
+_last_flush = [time.monotonic()]
+
+
+def status_class(status_code):
+    return f'{status_code // 100}xx'
+
+
+def record_request(route, status_code, ms, day=None):
+    """Add one request to this process's pending histograms"""
+    key = (day or timezone.localdate(), route, status_class(status_code))
+    with _lock:
+        histogram = _pending.get(key)
+        if histogram is None:
+            histogram = _pending[key] = LatencyHistogram()
+        histogram.record(ms)
+
+
+def _restore_pending(pending):
+    """Put histograms whose flush failed back, merged with anything recorded since"""
+    with _lock:
+        for key, histogram in pending.items():
+            recorded = _pending.get(key)
+            if recorded is not None:
+                histogram.merge(recorded)
+            _pending[key] = histogram
+
+
+def _write_pending(pending):
+    lookup = Q()
+    for day, route, status in pending:
+        lookup |= Q(date=day, route=route, status_class=status)
+
+    with transaction.atomic():
+        # select_for_update cannot lock rows that do not exist yet, so
+        # create any missing ones first; a row another process inserts
+        # concurrently is left to it and locked below
+        RequestTelemetry.objects.bulk_create(
+            [RequestTelemetry(date=day, route=route, status_class=status) for day, route, status in pending],
+            ignore_conflicts=True,
+        )
+        rows = list(RequestTelemetry.objects.select_for_update().filter(lookup))
+        for row in rows:
+            merged = LatencyHistogram.from_row(row)
+            merged.merge(pending[row.date, row.route, row.status_class])
+            row.buckets = {str(index): n for index, n in merged.buckets.items()}
+            row.request_count = merged.count
+            row.total_ms = merged.total_ms
+            row.max_ms = merged.max_ms
+            row.updated_at = timezone.now()
+        RequestTelemetry.objects.bulk_update(
+            rows, ['buckets', 'request_count', 'total_ms', 'max_ms', 'updated_at']
+        )
+
+
+def flush_telemetry():
+    """
+    Merge pending histograms into RequestTelemetry; returns rows written.
+    If the write fails the histograms stay pending for the next flush.
+    """
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush[0] = time.monotonic()
+    if not pending:
+        return 0
+
+    try:
+        _write_pending(pending)
+    except DatabaseError:
+        _restore_pending(pending)
+        raise
+
+    for day in {day for day, _, _ in pending}:
+        rollup_overall(day)
+    return len(pending)
+
+
+def maybe_flush():
+    """Flush when this process last flushed over TELEMETRY_FLUSH_SECONDS ago"""
+    if time.monotonic() - _last_flush[0] >= getattr(settings, 'TELEMETRY_FLUSH_SECONDS', 60):
+        try:
+            flush_telemetry()
+        except DatabaseError:
+            # Telemetry must never fail the request it was measuring
+            pass
+
+
+def rollup_overall(day):
+    """Copy a day's average latency and uptime into its OverallAnalytics row"""
+    totals = RequestTelemetry.objects.filter(date=day).aggregate(
+        requests=Sum('request_count'),
+        total_ms=Sum('total_ms'),
+        failed=Sum('request_count', filter=Q(status_class='5xx')),
+    )
+    requests = totals['requests'] or 0
+    if not requests:
+        return 0
+    # Only existing rows are updated; the overall view creates each day's row
+    return OverallAnalytics.objects.filter(date=day).update(
+        average_response_time=round(totals['total_ms'] / requests, 2),
+        system_uptime_percentage=round(100 * (1 - (totals['failed'] or 0) / requests), 3),
+    )
+
+
+def latency_report(start, end, route=None):
+    """Percentiles per route and status class, and overall, for a date range"""
+    rows = RequestTelemetry.objects.filter(date__gte=start, date__lte=end)
+    if route:
+        rows = rows.filter(route__icontains=route)
+
+    by_route = {}
+    overall = LatencyHistogram()
+    for row in rows.iterator():
+        histogram = LatencyHistogram.from_row(row)
+        key = (row.route, row.status_class)
+        if key in by_route:
+            by_route[key].merge(histogram)
+        else:
+            by_route[key] = histogram
+        overall.merge(histogram)
+
+    routes = [
+        {'route': route_name, 'status_class': status, **histogram.summary()}
+        for (route_name, status), histogram in by_route.items()
+    ]
+    routes.sort(key=lambda item: item['p95_ms'], reverse=True)
+    failed = sum(item['count'] for item in routes if item['status_class'] == '5xx')
+    return {
+        'from': start,
+        'to': end,
+        'overall': {
+            **overall.summary(),
+            'error_rate': round(failed / overall.count, 4) if overall.count else 0.0,
+        },
+        'routes': routes,
+    }
+
+
+def prune_telemetry(today=None):
+    """Drop telemetry rows past retention; returns rows deleted"""
+    today = today or timezone.localdate()
+    deleted, _ = RequestTelemetry.objects.filter(
+        date__lt=today - timedelta(days=TELEMETRY_RETENTION_DAYS)
+    ).delete()
+    return deleted
+
+
+class TelemetryMiddleware:
+    """Times each request by URL pattern and status class"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        route = f'{request.method} /{match.route}' if match else 'unmatched'
+        record_request(route, response.status_code, ms)
+        maybe_flush()
+        return response
@@ -0,0 +1,268 @@
+import random
+from datetime import date, timedelta
+from statistics import correlation
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from groups.models import Group
+from levels.models import Level, Question
+from progress.models import QuestionProgress
+from tasks.models import Task
+from . import item_analysis, snapshot, telemetry
+from .item_analysis import analyze, run_item_analysis, student_scores
+from .leaderboard import InMemoryBackend, _SkipList
+from .models import DashboardSnapshot, OverallAnalytics, QuestionStatistics, RequestTelemetry
+from .tasks import queue_daily_rollup, rollup_daily_trends
+from .telemetry import LatencyHistogram, bucket_index, bucket_value, flush_telemetry, record_request
+from .trends import DAILY_RETENTION_DAYS, pick_trend_type
+
+User = get_user_model()
+
+# Per student: answers to the three questions (correct answers are A, B, C)
+ANSWERS = [
+    ['A', 'B', 'C'],
+    ['A', 'B', 'D'],
+    ['A', 'D', 'C'],
+    ['B', 'D', 'C'],
+    ['B', 'A', 'D'],
+    [' B ', 'B', 'A'],
+]
+
+
+class ItemAnalysisTests(TestCase):
+    """Item statistics computed from QuestionProgress answers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(group_number=1, name='Group 1')
+        level = Level.objects.create(group=group, level_number=1, name='Level 1')
+        cls.questions = [
+            Question.objects.create(
+                level=level, question_order=order, question_type='mcq', question_text=f'Q{order}',
+                options=['A', 'B', 'C', 'D', 'E'], correct_answer=correct,
+                distractor_analysis={'B': 'Written by the content team'} if order == 1 else {},
+            )
+            for order, correct in enumerate('ABC', start=1)
+        ]
+        cls.progress = {}
+        for number, answers in enumerate(ANSWERS):
+            user = User.objects.create(username=f'item_student_{number}')
+            for question, answer in zip(cls.questions, answers):
+                cls.progress[user.id, question.id] = QuestionProgress.objects.create(
+                    user=user, question=question, is_answered=True, user_answer=answer,
+                    is_correct=question.validate_answer(answer),
+                )
+
+    def expected_point_biserial(self, question):
+        scores = student_scores()
+        correct, rest = [], []
+        for (user_id, question_id), progress in self.progress.items():
+            if question_id == question.id:
+                user_correct, user_answered = scores[user_id]
+                correct.append(int(progress.is_correct))
+                rest.append((user_correct - progress.is_correct) / (user_answered - 1))
+        return round(correlation(correct, rest), 4)
+
+    def test_statistics(self):
+        run = run_item_analysis()
+        self.assertEqual((run.questions_updated, run.rows_processed), (3, 18))
+
+        first = QuestionStatistics.objects.get(question=self.questions[0])
+        self.assertEqual((first.responses, first.correct_responses, first.p_value), (6, 3, 0.5))
+        self.assertAlmostEqual(first.point_biserial, self.expected_point_biserial(self.questions[0]), places=4)
+        self.assertEqual(
+            [(row['answer'], row['count'], row['correct']) for row in first.answer_distribution],
+            [('A', 3, True), ('B', 3, False)],
+        )
+
+        self.assertEqual(first.distractors['B']['count'], 3)
+        self.assertEqual(first.distractors['E'], {'count': 0, 'share': 0.0, 'mean_score': None})
+        # Authored content is left as written, so content packs still match it
+        question = Question.objects.get(pk=self.questions[0].pk)
+        self.assertEqual(question.distractor_analysis, {'B': 'Written by the content team'})
+
+    def test_python_aggregation_matches_numpy(self):
+        if item_analysis.numpy is None:
+            self.skipTest('NumPy is not installed')
+        rows = list(QuestionProgress.objects.values_list('question_id', 'user_id', 'is_correct', 'user_answer'))
+        scores = student_scores()
+        with mock.patch.object(item_analysis, 'numpy', None):
+            expected = analyze(rows, scores)
+        self.assertEqual(analyze(rows, scores), expected)
+
+    def test_later_runs_only_read_changed_questions(self):
+        run_item_analysis()
+        self.assertEqual(run_item_analysis().questions_updated, 0)
+
+        progress = next(iter(self.progress.values()))
+        progress.user_answer = 'E'
+        progress.is_correct = False
+        progress.save()
+        run = run_item_analysis()
+        self.assertEqual((run.questions_updated, run.rows_processed), (1, 6))
+        statistics = QuestionStatistics.objects.get(question_id=progress.question_id)
+        self.assertEqual(statistics.correct_responses, 2)
+        self.assertEqual(run_item_analysis(full=True).questions_updated, 3)
+
+
+class LeaderboardTests(TestCase):
+    """The in-memory boards against a plain sorted list"""
+
+    def test_skip_list_matches_sorted_list(self):
+        randomizer = random.Random(7)
+        skip_list, expected = _SkipList(), []
+        for _ in range(2000):
+            value = (randomizer.randint(0, 50), randomizer.randint(0, 500))
+            if expected and randomizer.random() < 0.4:
+                value = randomizer.choice(expected)
+                skip_list.remove(value)
+                expected.remove(value)
+            else:
+                skip_list.insert(value)
+                expected.append(value)
+                expected.sort()
+            probe = (randomizer.randint(0, 50), randomizer.randint(0, 500))
+            self.assertEqual(skip_list.rank(probe), sum(item < probe for item in expected))
+        self.assertEqual(len(skip_list), len(expected))
+        self.assertEqual(skip_list.slice(0, len(expected)), expected)
+        self.assertEqual(skip_list.slice(10, 5), expected[10:15])
+        with self.assertRaises(KeyError):
+            skip_list.remove((99, 0))
+
+    def test_board_ranks_highest_score_first(self):
+        backend = InMemoryBackend()
+        backend.replace('global', {1: 30, 2: 10, 3: 20})
+        backend.set_score('global', 2, 40)
+        backend.set_score('global', 4, 20)
+        self.assertEqual(backend.top('global', 10), [(2, 40), (1, 30), (3, 20), (4, 20)])
+        self.assertEqual([backend.rank('global', member) for member in (1, 2, 3, 4, 5)], [1, 0, 2, 3, None])
+        self.assertEqual(backend.top('global', 2, offset=1), [(1, 30), (3, 20)])
+        self.assertEqual(backend.count('global'), 4)
+
+
+class TelemetryTests(TestCase):
+    """Latency histogram maths and flushing into RequestTelemetry"""
+
+    day = date(2026, 10, 1)
+
+    def setUp(self):
+        telemetry._pending.clear()
+        self.addCleanup(telemetry._pending.clear)
+
+    def test_buckets_stay_within_relative_error(self):
+        for ms in (0.001, 0.015, 0.5, 1, 7.3, 42, 250, 999.9, 12000):
+            self.assertLessEqual(abs(bucket_value(bucket_index(ms)) - ms) / ms, 1 / 16 + 1e-9, ms)
+        indexes = [bucket_index(ms / 10) for ms in range(1, 100000)]
+        self.assertEqual(indexes, sorted(indexes))
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms)
+        self.assertAlmostEqual(histogram.percentile(50), 50, delta=50 / 16)
+        self.assertAlmostEqual(histogram.percentile(99), 99, delta=99 / 16)
+        self.assertEqual(histogram.percentile(100), 100)
+        self.assertEqual(histogram.summary()['average_ms'], 50.5)
+
+    def test_flush_merges_into_existing_rows_and_rolls_up(self):
+        OverallAnalytics.objects.create()
+        OverallAnalytics.objects.update(date=self.day)
+        for ms in (10, 20):
+            record_request('GET /api/levels/', 200, ms, day=self.day)
+        self.assertEqual(flush_telemetry(), 1)
+        record_request('GET /api/levels/', 200, 30, day=self.day)
+        record_request('GET /api/levels/', 503, 40, day=self.day)
+        self.assertEqual(flush_telemetry(), 2)
+
+        row = RequestTelemetry.objects.get(date=self.day, status_class='2xx')
+        self.assertEqual((row.request_count, row.total_ms, row.max_ms), (3, 60, 30))
+        self.assertEqual(sum(row.buckets.values()), 3)
+        overall = OverallAnalytics.objects.get(date=self.day)
+        self.assertEqual((overall.average_response_time, overall.system_uptime_percentage), (25, 75))
+
+    def test_failed_flush_keeps_histograms_pending(self):
+        record_request('GET /api/levels/', 200, 10, day=self.day)
+        with mock.patch.object(telemetry, '_write_pending', side_effect=OperationalError('database is locked')):
+            with self.assertRaises(OperationalError):
+                flush_telemetry()
+        record_request('GET /api/levels/', 200, 20, day=self.day)
+        flush_telemetry()
+        row = RequestTelemetry.objects.get(date=self.day)
+        self.assertEqual((row.request_count, row.total_ms), (2, 30))
+
+
+class DashboardSnapshotTests(TestCase):
+    """Donor sections are served from the snapshot with conditional GETs"""
+
+    url = '/api/analytics/overall-stats/'
+
+    def setUp(self):
+        cache.delete(snapshot.SNAPSHOT_BUILD_LOCK)
+        self.client = APIClient()
+
+    def age_snapshots(self, seconds):
+        DashboardSnapshot.objects.update(built_at=timezone.now() - timedelta(seconds=seconds))
+
+    def test_if_none_match_lists_and_weak_tags(self):
+        etag = self.client.get(self.url)['ETag']
+
+        for header in (etag, f'"other", {etag}', f'W/{etag}', '*'):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=header).status_code, 304, header)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_missing_snapshot_is_built_once(self):
+        with mock.patch.object(snapshot, 'build_snapshot', wraps=snapshot.build_snapshot) as build:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(build.call_count, 1)
+        self.assertIsNone(cache.get(snapshot.SNAPSHOT_BUILD_LOCK))
+
+    def test_very_old_snapshot_is_served_while_another_request_rebuilds(self):
+        snapshot.build_snapshot()
+        self.age_snapshots(snapshot.SNAPSHOT_STALE_LIMIT + 60)
+        stale = DashboardSnapshot.objects.get(section='overall_stats')
+
+        cache.add(snapshot.SNAPSHOT_BUILD_LOCK, 1)
+        with mock.patch.object(snapshot, 'build_snapshot') as build:
+            response = self.client.get(self.url)
+        build.assert_not_called()
+        self.assertEqual(response['ETag'], f'"{stale.etag}"')
+
+
+class TrendRollupTests(TestCase):
+    """Daily rollups are queued per day; trend ranges pick a chart-sized tier"""
+
+    day = date(2026, 3, 10)
+
+    def rollups(self, status):
+        return Task.objects.filter(name=rollup_daily_trends.name, status=status).count()
+
+    def test_completions_share_a_queued_rollup(self):
+        queue_daily_rollup(self.day)
+        queue_daily_rollup(self.day)
+        queue_daily_rollup(self.day + timedelta(days=1))
+        self.assertEqual(self.rollups('queued'), 2)
+
+    def test_completion_during_a_running_rollup_queues_another(self):
+        queue_daily_rollup(self.day)
+        Task.objects.update(status='running')
+        queue_daily_rollup(self.day)
+        queue_daily_rollup(self.day)
+        self.assertEqual((self.rollups('running'), self.rollups('queued')), (1, 1))
+
+    def test_pick_trend_type(self):
+        today = self.day
+        cases = [
+            (today - timedelta(days=30), 'daily'),
+            (today - timedelta(days=31), 'weekly'),
+            (today - timedelta(days=DAILY_RETENTION_DAYS), 'weekly'),
+            (today - timedelta(days=DAILY_RETENTION_DAYS + 1), 'monthly'),
+        ]
+        for start, expected in cases:
+            self.assertEqual(pick_trend_type(start, today, today=today), expected, start)
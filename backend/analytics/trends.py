@@ -0,0 +1,161 @@
+"""
+PerformanceTrend rollups
+Completing a level queues one rollup of its day's buckets, shared by the
+completions that follow within TREND_ROLLUP_DELAY; weekly and monthly
+buckets and retention are handled by the rollup_trends command. Daily and
+weekly buckets are kept for DAILY_RETENTION_DAYS, monthly ones forever.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, CharField, Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from progress.models import LevelProgress
+from students.models import Student
+from users.models import User
+from .models import PerformanceTrend
+
+DAILY_RETENTION_DAYS = 90
+MAX_TREND_POINTS = 31
+
+TREND_FIELDS = [
+    'total_users', 'active_users', 'levels_completed', 'total_xp_earned',
+    'average_completion_rate', 'average_xp_per_user', 'new_users',
+]
+
+
+def bucket_start(trend_type, day):
+    """First day of the bucket containing day"""
+    if trend_type == 'weekly':
+        return day - timedelta(days=day.weekday())
+    if trend_type == 'monthly':
+        return day.replace(day=1)
+    return day
+
+
+def bucket_end(trend_type, start):
+    """First day after the bucket starting at start"""
+    if trend_type == 'weekly':
+        return start + timedelta(days=7)
+    if trend_type == 'monthly':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _scope_rows(completions, scope):
+    """Completion totals grouped by campus id or grade"""
+    student = Student.objects.filter(student_id=OuterRef('user__student_id'))
+    if scope == 'campus':
+        key = Cast(Subquery(student.values('campus_id')[:1]), CharField())
+    else:
+        key = Subquery(student.values('grade')[:1])
+
+    return (
+        completions.annotate(scope_key=key)
+        .exclude(scope_key__isnull=True)
+        .values('scope_key')
+        .annotate(
+            levels_completed=Count('id'),
+            total_xp_earned=Sum('xp_earned'),
+            active_users=Count('user_id', distinct=True),
+            average_completion_rate=Avg('completion_percentage'),
+        )
+        .order_by()
+    )
+
+
+def _trend(trend_type, start, scope, scope_key, totals, **extra):
+    active_users = totals['active_users'] or 0
+    total_xp = totals['total_xp_earned'] or 0
+    return PerformanceTrend(
+        trend_type=trend_type,
+        date=start,
+        scope=scope,
+        scope_key=scope_key,
+        active_users=active_users,
+        levels_completed=totals['levels_completed'] or 0,
+        total_xp_earned=total_xp,
+        average_completion_rate=totals['average_completion_rate'] or 0.0,
+        average_xp_per_user=total_xp / active_users if active_users else 0.0,
+        **extra,
+    )
+
+
+def rollup_bucket(trend_type, day):
+    """Recompute every scope of the bucket containing day from LevelProgress"""
+    start = bucket_start(trend_type, day)
+    end = bucket_end(trend_type, start)
+    completions = LevelProgress.objects.filter(
+        is_completed=True, completed_at__date__gte=start, completed_at__date__lt=end
+    )
+
+    totals = completions.aggregate(
+        levels_completed=Count('id'),
+        total_xp_earned=Sum('xp_earned'),
+        active_users=Count('user_id', distinct=True),
+        average_completion_rate=Avg('completion_percentage'),
+    )
+    users = User.objects.aggregate(
+        total_users=Count('id', filter=Q(date_joined__date__lt=end)),
+        new_users=Count('id', filter=Q(date_joined__date__gte=start, date_joined__date__lt=end)),
+    )
+    trends = [_trend(trend_type, start, 'global', '', totals, **users)]
+    for scope in ('campus', 'grade'):
+        trends += [
+            _trend(trend_type, start, scope, row['scope_key'], row)
+            for row in _scope_rows(completions, scope)
+        ]
+
+    PerformanceTrend.objects.bulk_create(
+        trends,
+        update_conflicts=True,
+        unique_fields=['trend_type', 'scope', 'scope_key', 'date'],
+        update_fields=TREND_FIELDS,
+    )
+    return trends
+
+
+def prune_trends(today=None):
+    """Drop daily and weekly buckets past retention; returns rows deleted"""
+    today = today or timezone.now().date()
+    cutoff = today - timedelta(days=DAILY_RETENTION_DAYS)
+    deleted, _ = PerformanceTrend.objects.filter(
+        Q(trend_type='daily', date__lt=cutoff)
+        | Q(trend_type='weekly', date__lt=bucket_start('weekly', cutoff))
+    ).delete()
+    return deleted
+
+
+def pick_trend_type(start, end, today=None):
+    """
+    Tier to serve a date range from
+
+    Daily and weekly buckets are used while they are retained for the
+    whole range and fit in MAX_TREND_POINTS; anything longer or older
+    coarsens to monthly. This is the finest tier that covers the range in
+    a chart-sized series, not the coarsest one: monthly covers every range
+    but would flatten a two-week view into one or two points.
+    """
+    today = today or timezone.now().date()
+    retained = start >= today - timedelta(days=DAILY_RETENTION_DAYS)
+    days = (end - start).days + 1
+    if retained and days <= MAX_TREND_POINTS:
+        return 'daily'
+    if retained and days <= MAX_TREND_POINTS * 7:
+        return 'weekly'
+    return 'monthly'
+
+
+def get_trends(start, end, scope='global', scope_key=''):
+    """(trend_type, buckets) covering start..end for one scope"""
+    trend_type = pick_trend_type(start, end)
+    trends = PerformanceTrend.objects.filter(
+        trend_type=trend_type,
+        scope=scope,
+        scope_key=scope_key,
+        date__gte=bucket_start(trend_type, start),
+        date__lte=end,
+    ).order_by('date')
+    return trend_type, trends
@@ -19,9 +19,15 @@ urlpatterns = [
     path('classes/', views.class_analytics, name='class-analytics'),
     path('students/', views.student_analytics, name='student-analytics'),
     
+    # Leaderboards
+    path('leaderboard/', views.leaderboard_view, name='leaderboard'),
+    
     # Trends
     path('trends/', views.performance_trend, name='performance-trends'),
     
+    # Request latency telemetry
+    path('telemetry/', views.request_telemetry, name='request-telemetry'),
+    
     # List APIs
     path('campus-list/', views.campus_list, name='campus-list'),
     path('teachers-list/', views.teachers_list, name='teachers-list'),
@@ -2,7 +2,11 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date
 from django.db.models import Avg, Sum, Count, Q
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import datetime, timedelta
 
@@ -14,8 +18,14 @@ from classes.models import Grade
 from progress.models import LevelProgress
 from users.models import User
 from levels.models import Level
+from levels.versions import etag_matches
 from groups.models import Group
 from cache_utils import cache_analytics, cache_api_response
+from concurrent_queries import fan_out
+from . import leaderboard
+from .trends import get_trends
+from .snapshot import get_section, get_section_data
+from .telemetry import flush_telemetry, latency_report
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -23,6 +33,8 @@ from cache_utils import cache_analytics, cache_api_response
 def overall_analytics(request):
     """Get overall system analytics"""
     try:
+        top_students = leaderboard.get_top(leaderboard.global_key(), 1)
+        
         # Get latest analytics or create new one
         analytics, created = OverallAnalytics.objects.get_or_create(
             date=timezone.now().date(),
@@ -41,7 +53,7 @@ def overall_analytics(request):
                 'students_with_streak': User.objects.filter(role='student').distinct().count(),
                 'students_active_this_week': User.objects.filter(role='student', last_login__gte=timezone.now() - timedelta(days=7)).distinct().count(),
                 'students_active_this_month': User.objects.filter(role='student', last_login__gte=timezone.now() - timedelta(days=30)).distinct().count(),
-                'top_student_xp': 0,  # Simplified for now
+                'top_student_xp': top_students[0]['xp'] if top_students else 0,
                 'top_student_streak': 0,  # Simplified for now
                 'top_class_completion': 0.0,  # Simplified for now
             }
@@ -68,6 +80,8 @@ def overall_analytics(request):
                 'top_student_xp': analytics.top_student_xp,
                 'top_student_streak': analytics.top_student_streak,
                 'top_class_completion': round(analytics.top_class_completion, 2),
+                'average_response_time': analytics.average_response_time,
+                'system_uptime_percentage': analytics.system_uptime_percentage,
                 'created_at': analytics.created_at,
                 'updated_at': analytics.updated_at,
             }
@@ -85,31 +99,35 @@ def overall_analytics(request):
 def dashboard_summary(request):
     """Get dashboard summary with key metrics"""
     try:
-        # Get overall stats
-        total_users = User.objects.count()
-        total_teachers = User.objects.filter(role='teacher').count()
-        total_students = User.objects.filter(role='student').count()
-        total_campuses = Campus.objects.count()
-        total_classes = Grade.objects.count()
-        
-        # Get today's activity
         today = timezone.now().date()
-        active_users_today = User.objects.filter(last_login__date=today).count()
-        levels_completed_today = LevelProgress.objects.filter(completed_at__date=today).count()
+        
+        # Independent counts, queried concurrently; the user counts share one scan
+        results = fan_out({
+            'users': lambda: User.objects.aggregate(
+                total=Count('id'),
+                teachers=Count('id', filter=Q(role='teacher')),
+                students=Count('id', filter=Q(role='student')),
+                active_today=Count('id', filter=Q(last_login__date=today)),
+            ),
+            'campuses': Campus.objects.count,
+            'classes': Grade.objects.count,
+            'levels_completed_today': LevelProgress.objects.filter(completed_at__date=today).count,
+        })
+        users = results['users']
         
         return Response({
             'success': True,
             'data': {
                 'overview': {
-                    'total_users': total_users,
-                    'total_teachers': total_teachers,
-                    'total_students': total_students,
-                    'total_campuses': total_campuses,
-                    'total_classes': total_classes,
+                    'total_users': users['total'],
+                    'total_teachers': users['teachers'],
+                    'total_students': users['students'],
+                    'total_campuses': results['campuses'],
+                    'total_classes': results['classes'],
                 },
                 'today_activity': {
-                    'active_users': active_users_today,
-                    'levels_completed': levels_completed_today,
+                    'active_users': users['active_today'],
+                    'levels_completed': results['levels_completed_today'],
                 },
                 'last_updated': timezone.now().isoformat(),
             }
@@ -324,13 +342,18 @@ def student_analytics(request):
 def performance_trend(request):
     """Get performance trends over time"""
     try:
-        # Get last 30 days of performance trends
+        # Default to the last 30 days; any range is served from the coarsest tier needed
         end_date = timezone.now().date()
-        start_date = end_date - timedelta(days=30)
+        start_date = end_date - timedelta(days=int(request.GET.get('days', 30)))
+        if request.GET.get('start'):
+            start_date = datetime.strptime(request.GET['start'], '%Y-%m-%d').date()
+        if request.GET.get('end'):
+            end_date = datetime.strptime(request.GET['end'], '%Y-%m-%d').date()
+        
+        scope = request.GET.get('scope', 'global')
+        scope_key = request.GET.get('id', '') if scope != 'global' else ''
         
-        trends = PerformanceTrend.objects.filter(
-            date__range=[start_date, end_date]
-        ).order_by('date')
+        trend_type, trends = get_trends(start_date, end_date, scope, scope_key)
         
         trend_data = []
         for trend in trends:
@@ -339,20 +362,54 @@ def performance_trend(request):
                 'total_xp_earned': trend.total_xp_earned,
                 'levels_completed': trend.levels_completed,
                 'active_users': trend.active_users,
-                'new_registrations': trend.new_registrations,
+                'average_xp_per_user': round(trend.average_xp_per_user, 2),
+                'new_registrations': trend.new_users,
             })
         
         return Response({
             'success': True,
+            'trend_type': trend_type,
             'data': trend_data
         })
         
+    except ValueError:
+        return Response({
+            'success': False,
+            'error': 'days must be an integer and start/end dates YYYY-MM-DD'
+        }, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def request_telemetry(request):
+    """Request latency percentiles per endpoint (admin only)"""
+    user = request.user
+    if not (user.role == 'admin' or user.is_staff):
+        return Response({'error': 'Access denied. Admin role required.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        # Defaults to today; ?days=7 covers the last week
+        end_date = timezone.now().date()
+        if request.GET.get('date'):
+            end_date = datetime.strptime(request.GET['date'], '%Y-%m-%d').date()
+        start_date = end_date - timedelta(days=max(int(request.GET.get('days', 1)), 1) - 1)
+    except ValueError:
+        return Response({
+            'success': False,
+            'error': 'days must be an integer and date YYYY-MM-DD'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Include this process's unflushed requests
+    flush_telemetry()
+    return Response({
+        'success': True,
+        'data': latency_report(start_date, end_date, route=request.GET.get('route')),
+    })
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @cache_api_response(timeout=1800, key_prefix='campus_list')  # 30 minutes cache
@@ -464,265 +521,98 @@ def classes_list(request):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class StudentPerformancePagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+def snapshot_response(request, section, paginate=False):
+    """Serve a donor dashboard section from its snapshot, honouring If-None-Match"""
+    snapshot = get_section(section)
+    etag = f'"{snapshot.etag}"'
+    
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    elif paginate:
+        paginator = StudentPerformancePagination()
+        page = paginator.paginate_queryset(get_section_data(snapshot), request)
+        response = paginator.get_paginated_response(page)
+    else:
+        # Already compact JSON, so skip re-rendering
+        response = HttpResponse(snapshot.payload, content_type='application/json')
+    
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(snapshot.built_at.timestamp())
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def overall_stats(request):
     """Get overall stats for donor dashboard"""
-    try:
-        # Get real data from database
-        total_users = User.objects.count()
-        total_teachers = User.objects.filter(role='teacher').count()
-        total_students = User.objects.filter(role='student').count()
-        total_levels = Level.objects.count()
-        total_groups = Group.objects.count()
-        
-        # Today's activity
-        today = timezone.now().date()
-        active_users_today = User.objects.filter(last_login__date=today).count()
-        levels_completed_today = LevelProgress.objects.filter(completed_at__date=today).count()
-        
-        # Total completed levels
-        total_levels_completed = LevelProgress.objects.filter(is_completed=True).count()
-        
-        # XP calculations
-        total_xp_earned = LevelProgress.objects.aggregate(total=Sum('xp_earned'))['total'] or 0
-        avg_xp_per_student = LevelProgress.objects.values('user').annotate(
-            total_xp=Sum('xp_earned')
-        ).aggregate(avg=Avg('total_xp'))['avg'] or 0
-        
-        # Completion rate
-        avg_completion_rate = LevelProgress.objects.aggregate(
-            avg=Avg('completion_percentage')
-        )['avg'] or 0
-        
-        # Student activity
-        students_active_this_week = User.objects.filter(
-            role='student', 
-            last_login__gte=timezone.now() - timedelta(days=7)
-        ).distinct().count()
-        
-        students_active_this_month = User.objects.filter(
-            role='student', 
-            last_login__gte=timezone.now() - timedelta(days=30)
-        ).distinct().count()
-        
-        return Response({
-            'date': timezone.now().isoformat(),
-            'total_users': total_users,
-            'total_teachers': total_teachers,
-            'total_students': total_students,
-            'active_users_today': active_users_today,
-            'total_levels': total_levels,
-            'total_groups': total_groups,
-            'levels_completed_today': levels_completed_today,
-            'total_levels_completed': total_levels_completed,
-            'average_completion_rate': round(avg_completion_rate, 2),
-            'average_xp_per_student': round(avg_xp_per_student, 2),
-            'total_xp_earned': total_xp_earned,
-            'students_with_streak': total_students,  # Simplified
-            'students_active_this_week': students_active_this_week,
-            'students_active_this_month': students_active_this_month,
-            'top_student_xp': 0,  # Will be calculated later
-            'top_student_streak': 0,  # Will be calculated later
-            'top_class_completion': 0.0,  # Will be calculated later
-        })
-        
-    except Exception as e:
-        return Response({
-            'success': False,
-            'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return snapshot_response(request, 'overall_stats')
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def campus_data(request):
     """Get campus data for donor dashboard"""
-    try:
-        campuses = Campus.objects.all()
-        campus_data = []
-        
-        for campus in campuses:
-            total_teachers = Teacher.objects.filter(campus=campus).count()
-            total_students = Student.objects.filter(campus=campus).count()
-            total_classes = Grade.objects.filter(campus=campus).count()
-            
-            # Calculate XP earned by students in this campus
-            campus_xp = LevelProgress.objects.filter(
-                user__student__campus=campus
-            ).aggregate(total=Sum('xp_earned'))['total'] or 0
-            
-            # Calculate average completion rate
-            avg_completion = LevelProgress.objects.filter(
-                user__student__campus=campus
-            ).aggregate(avg=Avg('completion_percentage'))['avg'] or 0
-            
-            campus_data.append({
-                'campus_id': campus.id,
-                'campus_name': campus.campus_name,
-                'total_teachers': total_teachers,
-                'total_students': total_students,
-                'total_classes': total_classes,
-                'active_students_today': total_students,  # Simplified
-                'total_xp_earned': campus_xp,
-                'average_class_completion': round(avg_completion, 2),
-            })
-        
-        return Response(campus_data)
-        
-    except Exception as e:
-        return Response({
-            'success': False,
-            'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return snapshot_response(request, 'campus_data')
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def teacher_performance(request):
     """Get teacher performance data"""
-    try:
-        teachers = Teacher.objects.all()
-        teacher_data = []
-        
-        for teacher in teachers:
-            # Get students taught by this teacher
-            students_taught = Student.objects.filter(
-                class_room__grade__english_teacher=teacher
-            )
-            total_students = students_taught.count()
-            
-            # Calculate completion rate
-            completed_levels = LevelProgress.objects.filter(
-                user__student__in=students_taught,
-                is_completed=True
-            ).count()
-            
-            # Calculate average XP per student
-            avg_xp = LevelProgress.objects.filter(
-                user__student__in=students_taught
-            ).values('user').annotate(
-                total_xp=Sum('xp_earned')
-            ).aggregate(avg=Avg('total_xp'))['avg'] or 0
-            
-            # Get assigned class
-            assigned_class = Grade.objects.filter(english_teacher=teacher).first()
-            class_name = f"{assigned_class.name} {assigned_class.shift}" if assigned_class else "No Class Assigned"
-            
-            teacher_data.append({
-                'teacher_id': teacher.id,
-                'teacher_name': teacher.name,
-                'teacher_code': teacher.teacher_id,
-                'assigned_class': class_name,
-                'total_students': total_students,
-                'students_completed_levels': completed_levels,
-                'active_students_today': total_students,  # Simplified
-                'average_completion_rate': round((completed_levels / total_students * 100) if total_students > 0 else 0, 2),
-                'average_xp_per_student': round(avg_xp, 2),
-                'top_student_name': 'N/A',  # Will be calculated later
-                'top_student_xp': 0,  # Will be calculated later
-                'struggling_students': 0,  # Will be calculated later
-            })
-        
-        return Response(teacher_data)
-        
-    except Exception as e:
-        return Response({
-            'success': False,
-            'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return snapshot_response(request, 'teacher_performance')
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def student_performance(request):
-    """Get student performance data"""
-    try:
-        students = Student.objects.all()
-        student_data = []
-        
-        for student in students:
-            # Get user associated with student
-            user = User.objects.filter(student=student).first()
-            if not user:
-                continue
-                
-            # Get progress data
-            progress_data = LevelProgress.objects.filter(user=user)
-            
-            # Calculate metrics
-            levels_completed = progress_data.filter(is_completed=True).count()
-            total_xp = progress_data.aggregate(total=Sum('xp_earned'))['total'] or 0
-            
-            # Get class info
-            class_name = f"{student.class_room.grade.name} {student.class_room.section}" if student.class_room else "No Class"
-            
-            # Calculate completion rate (simplified)
-            completion_rate = (levels_completed / 10 * 100) if levels_completed > 0 else 0  # Assuming 10 levels per grade
-            
-            student_data.append({
-                'student_id': student.id,
-                'student_name': student.name,
-                'student_code': student.student_id,
-                'class_name': class_name,
-                'campus_name': student.campus.campus_name,
-                'total_xp': total_xp,
-                'levels_completed': levels_completed,
-                'current_streak': 0,  # Will be calculated later
-                'longest_streak': 0,  # Will be calculated later
-                'last_active': user.last_login.isoformat() if user.last_login else timezone.now().isoformat(),
-                'completion_rate': round(completion_rate, 2),
-                'rank': 0,  # Will be calculated later
-                'teacher_name': student.class_room.grade.english_teacher.name if student.class_room and student.class_room.grade.english_teacher else 'No Teacher',
-            })
-        
-        # Sort by XP and assign ranks
-        student_data.sort(key=lambda x: x['total_xp'], reverse=True)
-        for i, student in enumerate(student_data):
-            student['rank'] = i + 1
-        
-        return Response(student_data)
-        
-    except Exception as e:
-        return Response({
-            'success': False,
-            'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    """Get student performance data, ranked by XP and paginated"""
+    return snapshot_response(request, 'student_performance', paginate=True)
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def daily_activity(request):
     """Get daily activity data for charts"""
     try:
-        # Generate last 7 days of data
+        # Last 7 days; completions come from the daily trend rollups
+        today = timezone.now().date()
+        start_date = today - timedelta(days=6)
+        
+        trends = {
+            trend.date: trend
+            for trend in PerformanceTrend.objects.filter(
+                trend_type='daily', scope='global', date__gte=start_date
+            )
+        }
+        logins = {
+            row['day']: row
+            for row in User.objects.filter(last_login__date__gte=start_date)
+            .annotate(day=TruncDate('last_login'))
+            .values('day')
+            .annotate(
+                login_count=Count('id'),
+                active_students=Count('id', filter=Q(role='student')),
+            )
+            .order_by()
+        }
+        
         daily_data = []
         for i in range(7):
-            date = timezone.now().date() - timedelta(days=6-i)
-            
-            # Count active students for this day
-            active_students = User.objects.filter(
-                role='student',
-                last_login__date=date
-            ).count()
-            
-            # Count levels completed on this day
-            levels_completed = LevelProgress.objects.filter(
-                completed_at__date=date
-            ).count()
-            
-            # Calculate XP earned on this day
-            xp_earned = LevelProgress.objects.filter(
-                completed_at__date=date
-            ).aggregate(total=Sum('xp_earned'))['total'] or 0
-            
-            # Count login attempts
-            login_count = User.objects.filter(
-                last_login__date=date
-            ).count()
+            date = start_date + timedelta(days=i)
+            trend = trends.get(date)
+            login = logins.get(date, {})
             
             daily_data.append({
                 'day': date.strftime('%a'),  # Mon, Tue, etc.
-                'active_students': active_students,
-                'levels_completed': levels_completed,
-                'xp_earned': xp_earned,
-                'login_count': login_count,
+                'active_students': login.get('active_students', 0),
+                'levels_completed': trend.levels_completed if trend else 0,
+                'xp_earned': trend.total_xp_earned if trend else 0,
+                'login_count': login.get('login_count', 0),
             })
         
         return Response(daily_data)
@@ -733,6 +623,52 @@ def daily_activity(request):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard_view(request):
+    """Get a page of the XP leaderboard and the current user's rank"""
+    scope = request.GET.get('scope', 'global')
+    value = request.GET.get('id')
+    
+    if scope == 'global':
+        key = leaderboard.global_key()
+    elif scope == 'week':
+        key = leaderboard.week_key()
+    elif scope in ('campus', 'grade') and value:
+        key = leaderboard.campus_key(value) if scope == 'campus' else leaderboard.grade_key(value)
+    else:
+        return Response({
+            'success': False,
+            'error': 'scope must be global, week, or campus/grade with an id'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+        offset = max(int(request.GET.get('offset', 0)), 0)
+    except ValueError:
+        return Response({
+            'success': False,
+            'error': 'limit and offset must be integers'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    entries = leaderboard.get_top(key, limit, offset)
+    users = User.objects.in_bulk([entry['user_id'] for entry in entries])
+    for entry in entries:
+        user = users.get(entry['user_id'])
+        entry['username'] = user.username if user else None
+        entry['name'] = user.get_full_name() if user else None
+    
+    return Response({
+        'success': True,
+        'data': {
+            'board': key,
+            'total': leaderboard.get_count(key),
+            'entries': entries,
+            'me': leaderboard.get_rank(key, request.user.id),
+        }
+    })
+
+
 
 
 @api_view(['GET'])
@@ -827,74 +763,6 @@ def student_analytics(request):
 
 
 
-@api_view(['GET'])
-
-@permission_classes([IsAuthenticated])
-
-def performance_trend(request):
-
-    """Get performance trends over time"""
-
-    try:
-
-        # Get last 30 days of performance trends
-
-        end_date = timezone.now().date()
-
-        start_date = end_date - timedelta(days=30)
-
-        
-
-        trends = PerformanceTrend.objects.filter(
-
-            date__range=[start_date, end_date]
-
-        ).order_by('date')
-
-        
-
-        trend_data = []
-
-        for trend in trends:
-
-            trend_data.append({
-
-                'date': trend.date,
-
-                'total_xp_earned': trend.total_xp_earned,
-
-                'levels_completed': trend.levels_completed,
-
-                'active_users': trend.active_users,
-
-                'new_registrations': trend.new_registrations,
-
-            })
-
-        
-
-        return Response({
-
-            'success': True,
-
-            'data': trend_data
-
-        })
-
-        
-
-    except Exception as e:
-
-        return Response({
-
-            'success': False,
-
-            'error': str(e)
-
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-
 @api_view(['GET'])
 
 @permission_classes([AllowAny])
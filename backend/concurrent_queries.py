@@ -0,0 +1,65 @@
+"""
+Concurrent aggregates for dashboard views
+Dashboards run several independent aggregate queries; fan_out() runs them
+on a shared thread pool so a response waits for the slowest query instead
+of the sum of all of them. Each call runs in its own thread with its own
+database connection and a copy of the caller's context, so replica routing
+still applies. The pool is sized by DASHBOARD_QUERY_CONCURRENCY and shared
+by every request in the process, which bounds how many dashboard queries
+hit the database at once. DRF views are synchronous, and Django's async
+ORM would queue the queries onto one sync thread anyway, so the pool is
+what gives concurrency under ASGI as well as WSGI.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+_pool = []
+_pool_lock = Lock()
+
+
+def query_pool():
+    """The process-wide pool, created on first use"""
+    if not _pool:
+        with _pool_lock:
+            if not _pool:
+                _pool.append(ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'DASHBOARD_QUERY_CONCURRENCY', 8),
+                    thread_name_prefix='dashboard-query',
+                ))
+    return _pool[0]
+
+
+def _run(func):
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+def _submit(func):
+    context = contextvars.copy_context()
+    return query_pool().submit(context.run, _run, func)
+
+
+def run_inline():
+    """
+    Whether to run the calls in the current thread: other connections
+    cannot see an open transaction's writes (tests run inside one), and a
+    concurrency of 1 turns fan-out off
+    """
+    return connection.in_atomic_block or getattr(settings, 'DASHBOARD_QUERY_CONCURRENCY', 8) <= 1
+
+
+def fan_out(calls):
+    """Run a dict of name -> zero-argument callable concurrently; returns name -> result"""
+    if run_inline():
+        return {name: func() for name, func in calls.items()}
+    futures = {name: _submit(func) for name, func in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
@@ -0,0 +1,180 @@
+"""
+Streaming coordinator exports
+Rows are read with a server-side cursor (iterator(chunk_size=...)) and
+written out one at a time, so memory stays flat from one class to the
+whole network. Every per-student figure is a correlated subquery in the
+same SELECT. XLSX needs the optional openpyxl package.
+"""
+
+import csv
+import tempfile
+
+from django.db.models import Count, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, StreamingHttpResponse
+
+try:
+    import openpyxl
+    XLSX_AVAILABLE = True
+except ImportError:
+    openpyxl = None
+    XLSX_AVAILABLE = False
+
+from plants.models import UserPlant
+from progress.models import LevelProgress
+from students.models import Student
+
+EXPORT_CHUNK_SIZE = 2000
+
+STUDENT_COLUMNS = [
+    ('student_id', 'Student ID'),
+    ('name', 'Student Name'),
+    ('campus__campus_name', 'Campus'),
+    ('grade', 'Grade'),
+    ('shift', 'Shift'),
+    ('class_teacher__name', 'Teacher'),
+    ('total_xp', 'Total XP'),
+    ('total_completions', 'Levels Completed'),
+    ('care_streak', 'Plant Care Streak'),
+    ('last_activity', 'Last Activity'),
+    ('is_active', 'Active'),
+]
+
+GRADE_COLUMNS = [
+    ('code', 'Grade Code'),
+    ('name', 'Grade'),
+    ('campus__campus_name', 'Campus'),
+    ('shift', 'Shift'),
+    ('english_teacher__name', 'English Teacher'),
+    ('total_students', 'Total Students'),
+    ('active_students', 'Active Students'),
+    ('total_xp', 'Total XP'),
+    ('total_completions', 'Levels Completed'),
+    ('last_activity', 'Last Activity'),
+]
+
+
+def _total(queryset, aggregate):
+    """
+    Correlated subquery for one aggregate over all of queryset. Grouping by
+    a constant puts every row in one group, so it is a plain SUM/COUNT/MAX.
+    """
+    return Subquery(
+        queryset.order_by().annotate(scope=Value(1)).values('scope').annotate(total=aggregate).values('total')
+    )
+
+
+def student_export_rows(students):
+    """Students with XP, completions, plant care streak and last activity, one SELECT"""
+    progress = (
+        LevelProgress.objects.filter(user__student_id=OuterRef('student_id'))
+        .order_by().values('user__student_id')
+    )
+    return (
+        students.annotate(
+            total_xp=Coalesce(
+                Subquery(progress.annotate(total=Sum('xp_earned')).values('total')),
+                Value(0), output_field=IntegerField(),
+            ),
+            total_completions=Coalesce(
+                Subquery(progress.annotate(total=Count('id', filter=Q(is_completed=True))).values('total')),
+                Value(0), output_field=IntegerField(),
+            ),
+            last_activity=Subquery(progress.annotate(latest=Max('last_attempted')).values('latest')),
+            care_streak=Coalesce(Subquery(
+                UserPlant.objects.filter(user__student_id=OuterRef('student_id')).values('daily_care_streak')[:1]
+            ), 0),
+        )
+        .order_by('campus_id', 'grade', 'name')
+        .values_list(*[field for field, _ in STUDENT_COLUMNS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def grade_export_rows(grades):
+    """Grades with their students' totals, one SELECT"""
+    grade_students = (
+        Student.objects.filter(campus_id=OuterRef('campus_id'), grade=OuterRef('name'), shift=OuterRef('shift'))
+        .order_by().values('campus_id')
+    )
+    students = Student.objects.filter(
+        campus_id=OuterRef(OuterRef('campus_id')),
+        grade=OuterRef(OuterRef('name')),
+        shift=OuterRef(OuterRef('shift')),
+    ).values('student_id')
+    progress = LevelProgress.objects.filter(user__student_id__in=students)
+    return (
+        grades.annotate(
+            total_students=Coalesce(
+                Subquery(grade_students.annotate(total=Count('id')).values('total')),
+                Value(0), output_field=IntegerField(),
+            ),
+            active_students=Coalesce(
+                Subquery(grade_students.annotate(total=Count('id', filter=Q(is_active=True))).values('total')),
+                Value(0), output_field=IntegerField(),
+            ),
+            total_xp=Coalesce(_total(progress, Sum('xp_earned')), Value(0), output_field=IntegerField()),
+            total_completions=Coalesce(
+                _total(progress, Count('id', filter=Q(is_completed=True))), Value(0), output_field=IntegerField(),
+            ),
+            last_activity=_total(progress, Max('last_attempted')),
+        )
+        .order_by('campus_id', 'name', 'shift')
+        .values_list(*[field for field, _ in GRADE_COLUMNS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+class Echo:
+    """File-like object that hands each written line straight back"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([label for _, label in columns])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_response(filename, columns, rows):
+    """Stream rows as CSV"""
+    response = StreamingHttpResponse(_csv_lines(columns, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_response(filename, columns, rows):
+    """
+    Write rows to a write-only workbook and stream the finished file
+
+    openpyxl's write-only mode keeps rows on disk rather than in memory;
+    the zip container can only be streamed once it is complete.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=filename[:31])
+    sheet.append([label for _, label in columns])
+    for row in rows:
+        sheet.append([
+            value.replace(tzinfo=None) if hasattr(value, 'tzinfo') and value.tzinfo else value
+            for value in row
+        ])
+
+    spool = tempfile.TemporaryFile()
+    workbook.save(spool)
+    spool.seek(0)
+    return FileResponse(
+        spool,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
+def export_response(file_format, filename, columns, rows):
+    """CSV or XLSX streaming response for an export"""
+    if file_format == 'xlsx':
+        return xlsx_response(filename, columns, rows)
+    return csv_response(filename, columns, rows)
@@ -160,11 +160,11 @@ class EnglishCoordinator(models.Model):
         """Get performance data for grades supervised by this coordinator"""
         from classes.models import Grade
         from students.models import Student
-        from progress.models import LevelCompletion
+        from levels.models import LevelCompletion
         
         # Get grades from supervised teachers
         supervised_teachers = self.get_supervised_teachers()
-        grades = Grade.objects.filter(english_teacher__in=supervised_teachers)
+        grades = Grade.objects.filter(english_teacher__in=supervised_teachers).select_related('english_teacher')
         
         performance_data = []
         for grade in grades:
@@ -175,9 +175,9 @@ class EnglishCoordinator(models.Model):
             )
             
             # Get completion data for students in this grade
-            student_ids = students.values_list('student_id', flat=True)
+            student_ids = students.values('student_id')
             completions = LevelCompletion.objects.filter(
-                student_id__in=student_ids
+                user__student_id__in=student_ids
             )
             
             performance_data.append({
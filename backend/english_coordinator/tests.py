@@ -1,3 +1,119 @@
+import csv
+from datetime import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from campus.models import Campus
+from classes.models import Grade
+from groups.models import Group
+from levels.models import Level
+from progress.models import LevelProgress
+from students.models import Student
+from teachers.models import Teacher
+from .models import EnglishCoordinator
+from .permissions import CanViewAllProgress
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+    """Streaming exports carry the same figures as the per-student queries"""
+
+    students_url = '/api/english-coordinator/coordinators/student-progress/export/'
+    grades_url = '/api/english-coordinator/coordinators/grade-performance/export/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.campus = Campus.objects.create(campus_name='North', campus_code='C01')
+        cls.coordinator = EnglishCoordinator.objects.create(
+            name='Sara', email='coordinator@example.com', can_view_all_progress=True,
+        )
+        cls.teacher = Teacher.objects.create(
+            name='Amir', email='amir@example.com', campus=cls.campus, english_coordinator=cls.coordinator,
+        )
+        other_teacher = Teacher.objects.create(name='Nadia', email='nadia@example.com', campus=cls.campus)
+        cls.grade = Grade.objects.create(name='Grade 3', campus=cls.campus, shift='morning', english_teacher=cls.teacher)
+        Grade.objects.create(name='Grade 4', campus=cls.campus, shift='morning', english_teacher=other_teacher)
+
+        # bulk_create skips the account-creating save() and signals
+        Student.objects.bulk_create([
+            Student(name=name, student_id=student_id, grade=grade, shift='morning', campus=cls.campus,
+                    class_teacher=teacher, password='x', is_active=active)
+            for name, student_id, grade, teacher, active in [
+                ('Ali', 'S1', 'Grade 3', cls.teacher, True),
+                ('Bina', 'S2', 'Grade 3', cls.teacher, False),
+                ('Omar', 'S3', 'Grade 4', other_teacher, True),
+            ]
+        ])
+
+        group = Group.objects.create(group_number=1, name='Group 1')
+        levels = [Level.objects.create(group=group, level_number=n, name=f'Level {n}') for n in (1, 2)]
+        cls.latest = timezone.make_aware(datetime(2026, 3, 10, 9, 30))
+        for student_id, rows in {
+            'S1': [(levels[0], 30, True, 1), (levels[1], 15, False, 2)],
+            'S3': [(levels[0], 50, True, 3)],
+        }.items():
+            user = User.objects.create(username=student_id, role='student', student_id=student_id)
+            for level, xp, completed, day in rows:
+                progress = LevelProgress.objects.create(user=user, level=level, xp_earned=xp, is_completed=completed)
+                LevelProgress.objects.filter(pk=progress.pk).update(last_attempted=cls.latest.replace(day=day + 7))
+
+        cls.admin = User.objects.create(username='admin_user', role='admin')
+        # Saving the coordinator created its login
+        cls.coordinator_user = User.objects.get(email='coordinator@example.com')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def rows(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        return list(csv.reader(StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_student_rows(self):
+        header, *rows = self.rows(self.client.get(self.students_url))
+
+        self.assertEqual(header[:2] + header[6:8], ['Student ID', 'Student Name', 'Total XP', 'Levels Completed'])
+        by_id = {row[0]: row for row in rows}
+        self.assertEqual(set(by_id), {'S1', 'S2', 'S3'})
+        self.assertEqual(by_id['S1'][6:9], ['45', '1', '0'])
+        self.assertTrue(by_id['S1'][9].startswith('2026-03-09'))
+        # No progress at all still gives zeros, not blanks
+        self.assertEqual(by_id['S2'][6:10], ['0', '0', '0', ''])
+        self.assertEqual(by_id['S3'][6:8], ['50', '1'])
+
+    def test_grade_rows(self):
+        header, *rows = self.rows(self.client.get(self.grades_url))
+
+        self.assertEqual(header[5:9], ['Total Students', 'Active Students', 'Total XP', 'Levels Completed'])
+        by_name = {row[1]: row for row in rows}
+        self.assertEqual(by_name['Grade 3'][5:9], ['2', '1', '45', '1'])
+        self.assertTrue(by_name['Grade 3'][9].startswith('2026-03-09'))
+        self.assertEqual(by_name['Grade 4'][5:9], ['1', '1', '50', '1'])
+
+    def test_coordinator_sees_only_supervised_grades(self):
+        self.client.force_authenticate(self.coordinator_user)
+
+        _, *rows = self.rows(self.client.get(self.students_url))
+        self.assertEqual([row[0] for row in rows], ['S1', 'S2'])
+        _, *rows = self.rows(self.client.get(self.grades_url, {'grade': self.grade.pk}))
+        self.assertEqual([row[1] for row in rows], ['Grade 3'])
+
+    def test_scope_errors(self):
+        response = self.client.get(self.students_url, {'grade': 'three'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.grades_url, {'file_format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
 
-# Create your tests here.
+        self.coordinator.delete()
+        self.client.force_authenticate(self.coordinator_user)
+        self.assertEqual(self.client.get(self.students_url).status_code, 403)
+        # The scope lookup does not lean on the permission check
+        with mock.patch.object(CanViewAllProgress, 'has_permission', return_value=True):
+            self.assertEqual(self.client.get(self.students_url).status_code, 404)
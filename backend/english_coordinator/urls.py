@@ -18,5 +18,7 @@ urlpatterns = [
     path('coordinators/assign-teacher/', EnglishCoordinatorViewSet.as_view({'post': 'assign_teacher'}), name='assign-teacher'),
     path('coordinators/student-progress/', EnglishCoordinatorViewSet.as_view({'get': 'student_progress'}), name='student-progress'),
     path('coordinators/grade-performance/', EnglishCoordinatorViewSet.as_view({'get': 'grade_performance'}), name='grade-performance'),
+    path('coordinators/student-progress/export/', EnglishCoordinatorViewSet.as_view({'get': 'export_student_progress'}), name='student-progress-export'),
+    path('coordinators/grade-performance/export/', EnglishCoordinatorViewSet.as_view({'get': 'export_grade_performance'}), name='grade-performance-export'),
     path('coordinators/dashboard/', EnglishCoordinatorViewSet.as_view({'get': 'dashboard'}), name='dashboard'),
 ]
@@ -6,6 +6,7 @@ from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 
+from concurrent_queries import fan_out
 from .models import EnglishCoordinator
 from .serializers import (
     EnglishCoordinatorSerializer,
@@ -22,6 +23,14 @@ from .permissions import (
     CanViewAllProgress,
     CampusBasedAccess
 )
+from .exports import (
+    GRADE_COLUMNS,
+    STUDENT_COLUMNS,
+    XLSX_AVAILABLE,
+    export_response,
+    grade_export_rows,
+    student_export_rows
+)
 from teachers.models import Teacher
 from students.models import Student
 from classes.models import Grade
@@ -292,6 +301,97 @@ class EnglishCoordinatorViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    def get_export_scope(self, request):
+        """
+        Students and grades an export may cover, optionally narrowed to one
+        grade; returns (students, grades, error response)
+        """
+        if request.user.role == 'english_coordinator':
+            try:
+                coordinator = EnglishCoordinator.objects.get(email=request.user.email)
+            except EnglishCoordinator.DoesNotExist:
+                return None, None, Response(
+                    {'error': 'English Coordinator profile not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            students = coordinator.get_supervised_students()
+            grades = Grade.objects.filter(english_teacher__in=coordinator.get_supervised_teachers())
+        else:
+            # Admin can export the whole network
+            students = Student.objects.all()
+            grades = Grade.objects.all()
+        
+        grade_id = request.query_params.get('grade')
+        if grade_id:
+            try:
+                grade_id = int(grade_id)
+            except ValueError:
+                return None, None, Response(
+                    {'error': 'grade must be a grade id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            grades = grades.filter(id=grade_id)
+            grade = grades.first()
+            if grade is None:
+                students = students.none()
+            else:
+                students = students.filter(campus=grade.campus_id, grade=grade.name, shift=grade.shift)
+        return students, grades, None
+    
+    def get_export_format(self, request):
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in ('csv', 'xlsx'):
+            return None, Response(
+                {'error': 'file_format must be csv or xlsx'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if file_format == 'xlsx' and not XLSX_AVAILABLE:
+            return None, Response(
+                {'error': 'XLSX export requires openpyxl to be installed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return file_format, None
+    
+    @action(detail=False, methods=['get'])
+    def export_student_progress(self, request):
+        """Stream per-student progress as CSV or XLSX"""
+        if not CanViewAllProgress().has_permission(request, self):
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        file_format, error = self.get_export_format(request)
+        if error:
+            return error
+        
+        students, _, error = self.get_export_scope(request)
+        if error:
+            return error
+        return export_response(
+            file_format, 'student_progress', STUDENT_COLUMNS, student_export_rows(students)
+        )
+    
+    @action(detail=False, methods=['get'])
+    def export_grade_performance(self, request):
+        """Stream per-grade performance as CSV or XLSX"""
+        if not CanViewAllProgress().has_permission(request, self):
+            return Response(
+                {'error': 'Permission denied'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        file_format, error = self.get_export_format(request)
+        if error:
+            return error
+        
+        _, grades, error = self.get_export_scope(request)
+        if error:
+            return error
+        return export_response(
+            file_format, 'grade_performance', GRADE_COLUMNS, grade_export_rows(grades)
+        )
+    
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """Get coordinator dashboard data"""
@@ -307,54 +407,61 @@ class EnglishCoordinatorViewSet(viewsets.ModelViewSet):
             # Get basic counts
             teachers = coordinator.get_supervised_teachers()
             students = coordinator.get_supervised_students()
-            grades = Grade.objects.filter(campus=coordinator.campus)
+            # Coordinators have no campus of their own; scope by their teachers' grades
+            grades = Grade.objects.filter(english_teacher__in=teachers)
             
             # Get completion data
-            student_ids = students.values_list('student_id', flat=True)
-            from progress.models import LevelCompletion
-            completions = LevelCompletion.objects.filter(student_id__in=student_ids)
-            
-            # Get grade performance
-            grade_performance = coordinator.get_grade_performance()
-            formatted_grades = []
-            for data in grade_performance:
-                grade = data['grade']
-                completion_rate = 0
-                if data['total_students'] > 0:
-                    completion_rate = (data['total_completions'] / data['total_students']) * 100
-                
-                formatted_grades.append({
-                    'grade_name': grade.name,
-                    'grade_code': grade.code,
-                    'shift': grade.shift,
-                    'english_teacher': grade.english_teacher.name if grade.english_teacher else 'Not Assigned',
-                    'total_students': data['total_students'],
-                    'active_students': data['active_students'],
-                    'total_completions': data['total_completions'],
-                    'completion_rate': round(completion_rate, 2)
-                })
+            student_ids = students.values('student_id')
+            from levels.models import LevelCompletion
+            completions = LevelCompletion.objects.filter(user__student_id__in=student_ids)
             
-            # Get recent activity (last 7 days)
-            week_ago = timezone.now() - timedelta(days=7)
-            recent_completions = completions.filter(completed_at__gte=week_ago)
+            def formatted_grades():
+                formatted = []
+                for data in coordinator.get_grade_performance():
+                    grade = data['grade']
+                    completion_rate = 0
+                    if data['total_students'] > 0:
+                        completion_rate = (data['total_completions'] / data['total_students']) * 100
+                    
+                    formatted.append({
+                        'grade_name': grade.name,
+                        'grade_code': grade.code,
+                        'shift': grade.shift,
+                        'english_teacher': grade.english_teacher.name if grade.english_teacher else 'Not Assigned',
+                        'total_students': data['total_students'],
+                        'active_students': data['active_students'],
+                        'total_completions': data['total_completions'],
+                        'completion_rate': round(completion_rate, 2)
+                    })
+                return formatted
             
-            recent_activity = []
-            for completion in recent_completions.order_by('-completed_at')[:10]:
-                recent_activity.append({
-                    'student_id': completion.student_id,
-                    'level_name': completion.level.name if completion.level else 'Unknown',
-                    'completed_at': completion.completed_at,
-                    'xp_earned': completion.xp_earned
-                })
+            def recent_activity():
+                # Last 7 days
+                week_ago = timezone.now() - timedelta(days=7)
+                recent_completions = (
+                    completions.filter(completed_at__gte=week_ago)
+                    .select_related('user', 'level')
+                    .order_by('-completed_at')[:10]
+                )
+                return [
+                    {
+                        'student_id': completion.user.student_id,
+                        'level_name': completion.level.name if completion.level else 'Unknown',
+                        'completed_at': completion.completed_at,
+                        'xp_earned': completion.xp_earned
+                    }
+                    for completion in recent_completions
+                ]
             
-            dashboard_data = {
-                'total_teachers': teachers.count(),
-                'total_students': students.count(),
-                'total_grades': grades.count(),
-                'total_completions': completions.count(),
+            # The sections are independent, so they are queried concurrently
+            dashboard_data = fan_out({
+                'total_teachers': teachers.count,
+                'total_students': students.count,
+                'total_grades': grades.count,
+                'total_completions': completions.count,
                 'grade_performance': formatted_grades,
-                'recent_activity': recent_activity
-            }
+                'recent_activity': recent_activity,
+            })
             
             serializer = CoordinatorDashboardSerializer(dashboard_data)
             return Response(serializer.data)
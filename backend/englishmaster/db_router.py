@@ -0,0 +1,165 @@
+"""
+Read-replica routing for reporting traffic
+GET requests to the analytics, teacher and coordinator reporting endpoints
+read from the replica alias so their aggregates stay off the primary that
+serves answer submissions. Everything else, every write and every read made
+after a write in the same request goes to the primary. A user who wrote
+recently is pinned to the primary for a few seconds (read your writes), and
+the replica is skipped while its heartbeat lags too far behind. The
+heartbeat is written to the primary by the record_replica_heartbeat task,
+never from a request.
+"""
+
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject, empty
+
+PRIMARY = 'default'
+PIN_CACHE_KEY = 'replica_pin:{}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_request_state = ContextVar('replica_request_state', default=None)
+
+# Last heartbeat check, shared by the whole process
+_health = {'checked_at': 0.0, 'healthy': False}
+
+
+class RequestState:
+    """Routing facts for the request being served"""
+
+    def __init__(self, request, reporting):
+        self.request = request
+        self.reporting = reporting
+        self.wrote = False
+        self.pinned = None
+
+
+def replica_alias():
+    """Configured replica alias, or None when no replica database is set up"""
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def is_reporting_request(request):
+    """Read-only request to one of the reporting endpoints"""
+    paths = getattr(settings, 'REPLICA_READ_PATHS', [])
+    return request.method in SAFE_METHODS and any(request.path.startswith(path) for path in paths)
+
+
+def pin_user(user_id):
+    """Send this user's reads to the primary for REPLICA_PIN_SECONDS"""
+    cache.set(PIN_CACHE_KEY.format(user_id), True, getattr(settings, 'REPLICA_PIN_SECONDS', 15))
+
+
+def is_pinned(user_id):
+    return bool(cache.get(PIN_CACHE_KEY.format(user_id)))
+
+
+def _request_user(request):
+    """
+    The request's user if already resolved, otherwise None. DRF sets the
+    user on the Django request once authentication has run; before that
+    AuthenticationMiddleware's lazy object must not be evaluated here.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return None
+    return user
+
+
+def record_heartbeat():
+    """Write the primary heartbeat the replica is compared against"""
+    from analytics.models import ReplicaHeartbeat
+    ReplicaHeartbeat.objects.using(PRIMARY).update_or_create(pk=1, defaults={'beat_at': timezone.now()})
+
+
+def replica_lag(alias):
+    """Seconds the replica's heartbeat is behind now, or None if it has none"""
+    from analytics.models import ReplicaHeartbeat
+    beat_at = ReplicaHeartbeat.objects.using(alias).filter(pk=1).values_list('beat_at', flat=True).first()
+    return (timezone.now() - beat_at).total_seconds() if beat_at else None
+
+
+def replica_is_healthy(alias):
+    """
+    Whether the replica is close enough to the primary to serve reads.
+    Checked at most every REPLICA_HEALTH_CHECK_INTERVAL seconds per process.
+    """
+    now = time.monotonic()
+    if now - _health['checked_at'] < getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 10):
+        return _health['healthy']
+
+    try:
+        lag = replica_lag(alias)
+    except DatabaseError:
+        lag = None
+    _health['healthy'] = lag is not None and lag <= getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 30)
+    _health['checked_at'] = now
+    return _health['healthy']
+
+
+def reset_replica_health():
+    """Forget the cached heartbeat check (used by tests)"""
+    _health.update(checked_at=0.0, healthy=False)
+
+
+class ReplicaRouter:
+    """Routes reporting reads to the replica; all other traffic to the primary"""
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        alias = replica_alias()
+        if alias is None or state is None or not state.reporting or state.wrote:
+            return PRIMARY
+
+        user = _request_user(state.request)
+        if user is None:
+            return PRIMARY
+        if user.is_authenticated:
+            if state.pinned is None:
+                state.pinned = is_pinned(user.pk)
+            if state.pinned:
+                return PRIMARY
+
+        return alias if replica_is_healthy(alias) else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Tracks each request for ReplicaRouter and pins users after writes"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RequestState(request, is_reporting_request(request))
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        # Snapshot and cache rebuilds during reporting GETs write derived
+        # data only, so just user-initiated writes pin the user
+        if state.wrote and request.method not in SAFE_METHODS:
+            user = _request_user(request)
+            if user is not None and user.is_authenticated:
+                pin_user(user.pk)
+        return response
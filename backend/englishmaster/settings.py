@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -59,15 +60,18 @@ INSTALLED_APPS = [
     'grammar',
     'placement',
     'english_coordinator',
+    'tasks',
 ]
 
 MIDDLEWARE = [
+    'analytics.telemetry.TelemetryMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'englishmaster.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -102,6 +106,62 @@ DATABASES = {
     }
 }
 
+# Read replica for reporting traffic (analytics, teacher and coordinator
+# dashboards), set up with the REPLICA_DB_* variables. Without
+# REPLICA_DB_NAME the 'replica' alias only mirrors default, so tests can
+# route to it, and every query goes to default.
+if os.environ.get('REPLICA_DB_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': os.environ.get('REPLICA_DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.environ['REPLICA_DB_NAME'],
+        'USER': os.environ.get('REPLICA_DB_USER', ''),
+        'PASSWORD': os.environ.get('REPLICA_DB_PASSWORD', ''),
+        'HOST': os.environ.get('REPLICA_DB_HOST', ''),
+        'PORT': os.environ.get('REPLICA_DB_PORT', ''),
+        'TEST': {'MIRROR': 'default'},
+    }
+else:
+    DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+# Production SQLite profile for campus servers without Postgres
+# (SQLITE_PRODUCTION=1). WAL lets reads run alongside the one writer, and
+# IMMEDIATE transactions take the write lock when they begin, so a busy
+# database makes writers wait up to the busy timeout instead of failing
+# with "database is locked" when a read transaction tries to upgrade.
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION') == '1'
+SQLITE_BUSY_TIMEOUT = 20
+SQLITE_PRAGMAS = [
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+    'mmap_size=268435456',
+    'cache_size=-65536',
+    'temp_store=MEMORY',
+    f'busy_timeout={SQLITE_BUSY_TIMEOUT * 1000}',
+]
+SQLITE_PRODUCTION_OPTIONS = {
+    'timeout': SQLITE_BUSY_TIMEOUT,
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': ';'.join(f'PRAGMA {pragma}' for pragma in SQLITE_PRAGMAS),
+}
+if SQLITE_PRODUCTION:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.sqlite3':
+            database['OPTIONS'] = dict(SQLITE_PRODUCTION_OPTIONS)
+# Hot write views run one at a time per process, retried while locked
+SQLITE_SERIALIZE_WRITES = SQLITE_PRODUCTION
+SQLITE_WRITE_RETRIES = 5
+
+DATABASE_ROUTERS = ['englishmaster.db_router.ReplicaRouter']
+REPLICA_DATABASE_ALIAS = 'replica' if os.environ.get('REPLICA_DB_NAME') else None
+REPLICA_READ_PATHS = ['/api/analytics/', '/api/teachers/', '/api/english-coordinator/']
+# Users who wrote read from the primary for this long afterwards
+REPLICA_PIN_SECONDS = 15
+# The replica is skipped while its heartbeat is older than this
+REPLICA_MAX_LAG_SECONDS = 30
+REPLICA_HEALTH_CHECK_INTERVAL = 10
+# The run_tasks worker writes the primary heartbeat this often
+REPLICA_HEARTBEAT_SECONDS = 10
+
 # Cache Configuration
 CACHES = {
     'default': {
@@ -130,6 +190,29 @@ try:
 except ImportError:
     CACHE_BACKEND = 'default'
 
+# XP leaderboards use Redis sorted sets when a URL is set, otherwise
+# in-process sorted lists rebuilt from the database every MAX_AGE seconds
+LEADERBOARD_REDIS_URL = None
+LEADERBOARD_MAX_AGE = 300
+
+# Dashboard aggregates run concurrently on a pool of this many threads
+# per process (1 runs them one after another)
+DASHBOARD_QUERY_CONCURRENCY = 8
+
+# Request latency histograms are flushed from each process this often
+TELEMETRY_FLUSH_SECONDS = 60
+
+# Background tasks are stored in the database and run by
+# `manage.py run_tasks`; eager mode runs them after the request's commit.
+# DEPLOYMENTS MUST RUN A run_tasks WORKER: without one, queued tasks never
+# run, so DailyProgress, trend rollups and password-reset emails silently
+# stop. Set TASKS_RUN_EAGERLY=1 where no worker can be run.
+TASKS_RUN_EAGERLY = os.environ.get('TASKS_RUN_EAGERLY') == '1'
+TASKS_CONCURRENCY = 4
+# A task running longer than this is assumed to have lost its worker
+TASKS_LOCK_TIMEOUT = 10 * 60
+TASKS_RETENTION_DAYS = 7
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -189,6 +272,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Same bytes as JSONRenderer, encoded with orjson when it is installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'fast_serializers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
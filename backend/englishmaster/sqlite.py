@@ -0,0 +1,55 @@
+"""
+Write serialization for the production SQLite profile
+SQLite allows one writer at a time. With SQLITE_SERIALIZE_WRITES on,
+views wrapped in serialized_write() run as a single transaction while
+holding a process-wide lock, so a process's request threads queue for the
+write lock in Python instead of competing for it inside SQLite. Other
+processes are held off by the IMMEDIATE transactions and busy timeout of
+the profile; a write that still finds the database locked is rolled back
+and retried with backoff.
+"""
+
+import random
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+_write_lock = threading.RLock()
+
+
+def is_locked_error(error):
+    """Whether an OperationalError is SQLite reporting a busy database"""
+    message = str(error).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+def serialize_writes():
+    return connection.vendor == 'sqlite' and getattr(settings, 'SQLITE_SERIALIZE_WRITES', False)
+
+
+def run_serialized(func, *args, **kwargs):
+    """Run func in one transaction, one caller per process at a time, retrying while locked"""
+    retries = getattr(settings, 'SQLITE_WRITE_RETRIES', 5)
+    for attempt in range(retries + 1):
+        with _write_lock:
+            try:
+                with transaction.atomic():
+                    return func(*args, **kwargs)
+            except OperationalError as error:
+                # Inside an outer transaction the caller has to retry it
+                if not is_locked_error(error) or attempt == retries or connection.in_atomic_block:
+                    raise
+        time.sleep(0.05 * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+def serialized_write(view_func):
+    """Decorator for write views under the production SQLite profile"""
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        if not serialize_writes():
+            return view_func(*args, **kwargs)
+        return run_serialized(view_func, *args, **kwargs)
+    return wrapper
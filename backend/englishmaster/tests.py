@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.db import OperationalError
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from analytics.models import ReplicaHeartbeat
+from analytics.tasks import record_replica_heartbeat
+from englishmaster.db_router import (
+    ReplicaRouter, ReplicaRoutingMiddleware, is_pinned, reset_replica_health,
+)
+from englishmaster.sqlite import serialized_write
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASE_ALIAS='replica')
+class ReplicaRouterTests(TransactionTestCase):
+    """
+    Routing between the primary and the replica, which tests run as a
+    mirror; transactions are committed so its connection sees them
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        reset_replica_health()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = User.objects.create(username='router_teacher', role='teacher')
+
+    def mark_replica_fresh(self, age=0):
+        ReplicaHeartbeat.objects.using('replica').update_or_create(
+            pk=1, defaults={'beat_at': timezone.now() - timedelta(seconds=age)}
+        )
+
+    def route(self, request, write=False):
+        """Serve a request through the middleware; returns the read alias seen by the view"""
+        seen = {}
+
+        def view(request):
+            if write:
+                self.router.db_for_write(User)
+            seen['read'] = self.router.db_for_read(User)
+            return HttpResponse()
+
+        request.user = self.user
+        ReplicaRoutingMiddleware(view)(request)
+        return seen['read']
+
+    def test_reporting_reads_go_to_fresh_replica(self):
+        self.mark_replica_fresh()
+        self.assertEqual(self.route(self.factory.get('/api/teachers/dashboard/')), 'replica')
+        self.assertEqual(self.route(self.factory.get('/api/analytics/overall/')), 'replica')
+
+    def test_other_traffic_stays_on_primary(self):
+        self.mark_replica_fresh()
+        self.assertEqual(self.route(self.factory.get('/api/levels/levels/1/')), 'default')
+        self.assertEqual(self.route(self.factory.post('/api/analytics/overall/')), 'default')
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+    def test_reads_after_a_write_use_primary(self):
+        self.mark_replica_fresh()
+        self.assertEqual(self.route(self.factory.get('/api/teachers/dashboard/'), write=True), 'default')
+        # Derived writes during a reporting GET do not pin the user
+        self.assertFalse(is_pinned(self.user.pk))
+
+    def test_user_is_pinned_after_a_write(self):
+        self.mark_replica_fresh()
+        self.route(self.factory.post('/api/levels/submit-answer/'), write=True)
+        self.assertTrue(is_pinned(self.user.pk))
+        self.assertEqual(self.route(self.factory.get('/api/teachers/dashboard/')), 'default')
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        self.mark_replica_fresh(age=3600)
+        self.assertEqual(self.route(self.factory.get('/api/teachers/dashboard/')), 'default')
+
+    def test_health_check_does_not_write(self):
+        self.assertEqual(self.route(self.factory.get('/api/teachers/dashboard/')), 'default')
+        self.assertFalse(ReplicaHeartbeat.objects.exists())
+
+    def test_heartbeat_task_writes_primary_heartbeat(self):
+        record_replica_heartbeat()
+        self.assertTrue(ReplicaHeartbeat.objects.using('default').filter(pk=1).exists())
+
+
+@override_settings(SQLITE_SERIALIZE_WRITES=True, SQLITE_WRITE_RETRIES=2)
+class SerializedWriteTests(TransactionTestCase):
+    """Write views under the production SQLite profile"""
+
+    def flaky_view(self, error, failures):
+        calls = []
+
+        @serialized_write
+        def view():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise error
+            User.objects.create(username=f'writer_{len(calls)}')
+            return len(calls)
+        return view, calls
+
+    def test_locked_writes_are_retried(self):
+        view, calls = self.flaky_view(OperationalError('database is locked'), failures=2)
+        self.assertEqual(view(), 3)
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['writer_3'])
+
+    def test_gives_up_after_the_retries(self):
+        view, calls = self.flaky_view(OperationalError('database is locked'), failures=3)
+        with self.assertRaises(OperationalError):
+            view()
+        self.assertEqual(len(calls), 3)
+
+    def test_other_errors_are_not_retried(self):
+        view, calls = self.flaky_view(OperationalError('no such table: missing'), failures=1)
+        with self.assertRaises(OperationalError):
+            view()
+        self.assertEqual(len(calls), 1)
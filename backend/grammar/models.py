@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from users.models import User
 
 
@@ -262,3 +264,10 @@ class GrammarProgress(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.grammar_rule.name} (Level {self.mastery_level})"
 
+
+@receiver(post_save, sender=GrammarRule)
+@receiver(post_delete, sender=GrammarRule)
+def bump_grammar_version(sender, instance, **kwargs):
+    """Invalidate cached grammar rule responses"""
+    from levels.versions import bump_content_versions
+    bump_content_versions('grammar')
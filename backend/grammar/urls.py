@@ -11,6 +11,7 @@ urlpatterns = [
     path('', include(router.urls)),
     
     # Custom endpoints
+    path('rules/', views.GrammarRuleListView.as_view(), name='grammar-rules'),
     path('practice/<int:grammar_rule_id>/', views.practice_grammar, name='practice_grammar'),
     path('practice-rules/', views.get_practice_rules, name='get_practice_rules'),
     path('stats/', views.grammar_stats, name='grammar_stats'),
@@ -6,10 +6,12 @@ from django.db.models import Q, Avg, Count, Sum
 from django.utils import timezone
 from .models import GrammarRule, GrammarProgress
 from .serializers import GrammarRuleSerializer, GrammarProgressSerializer
+from levels.versions import ContentVersionMixin
 
 
-class GrammarRuleListView(generics.ListAPIView):
+class GrammarRuleListView(ContentVersionMixin, generics.ListAPIView):
     """List grammar rules with filtering"""
+    content_kinds = ('grammar',)
     serializer_class = GrammarRuleSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -0,0 +1,163 @@
+"""
+Offline group bundles
+Everything a device needs to play a group (levels, questions, media URLs and
+the vocabulary and grammar they reference) in one payload with a version
+token. Passing that token back as ``since`` returns only the items changed
+after it, plus the ids still live so the device can drop removed ones.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Max, Q
+
+from grammar.models import GrammarRule
+from levels.models import ContentVersion, Level, Question
+from vocabulary.models import Vocabulary
+
+LEVEL_FIELDS = [
+    'id', 'level_number', 'name', 'description', 'difficulty', 'difficulty_score',
+    'xp_reward', 'learning_objectives', 'vocabulary_words', 'grammar_points',
+    'is_unlocked', 'is_test_level', 'test_questions_count', 'test_pass_percentage',
+    'test_time_limit_minutes', 'updated_at',
+]
+
+QUESTION_FIELDS = [
+    'id', 'level_id', 'question_order', 'question_type', 'question_text', 'options',
+    'correct_answer', 'hint', 'explanation', 'audio_url', 'image_url',
+    'vocabulary_tested', 'grammar_tested', 'difficulty', 'xp_value',
+    'time_limit_seconds', 'updated_at',
+]
+
+VOCABULARY_FIELDS = [
+    'id', 'word', 'translation_urdu', 'pronunciation', 'oxford_rank', 'part_of_speech',
+    'definition', 'definition_urdu', 'example_sentence', 'example_sentence_urdu',
+    'audio_url', 'image_url', 'synonyms', 'antonyms', 'updated_at',
+]
+
+GRAMMAR_FIELDS = [
+    'id', 'name', 'short_name', 'description', 'category', 'difficulty_level',
+    'rules', 'examples', 'common_mistakes', 'when_to_use', 'signal_words', 'updated_at',
+]
+
+GROUP_FIELDS = [
+    'name', 'description', 'difficulty', 'track', 'topic_category', 'grammar_focus',
+    'oxford_word_range_start', 'oxford_word_range_end', 'test_questions',
+    'pass_percentage', 'xp_reward', 'badge_name', 'badge_description',
+]
+
+
+def version_token(moment):
+    """Opaque version token (milliseconds since the epoch) for a timestamp"""
+    return str(int(moment.timestamp() * 1000)) if moment else '0'
+
+
+def parse_version_token(token):
+    """Timestamp for a client-supplied token, raising ValueError if malformed"""
+    return datetime.fromtimestamp(int(token) / 1000, tz=dt_timezone.utc)
+
+
+def _names(values):
+    """String entries of a JSON list field (other shapes are ignored)"""
+    if isinstance(values, str):
+        values = [values]
+    return {value.strip() for value in values or [] if isinstance(value, str) and value.strip()}
+
+
+def bundle_version(group):
+    """
+    Version token for a group's bundle. Every content save, deletion and
+    deactivation moves a ContentVersion row, so this costs one aggregate
+    and can answer a conditional request before any content is loaded.
+    """
+    latest = ContentVersion.objects.aggregate(latest=Max('updated_at'))['latest']
+    return version_token(max(moment for moment in (group.updated_at, latest) if moment))
+
+
+def build_group_bundle(group, since=None, version=None):
+    """
+    Bundle dict for a group; with ``since`` only items changed after it.
+    A delta also carries everything a changed item brings into scope: all
+    questions of a changed level, the vocabulary and grammar a changed
+    level or question references, and all vocabulary and grammar when the
+    group itself changed.
+    """
+    levels = list(
+        Level.objects.filter(group=group, is_active=True).order_by('level_number').values(*LEVEL_FIELDS)
+    )
+    questions = list(
+        Question.objects.filter(level__group=group, level__is_active=True, is_active=True)
+        .order_by('level__level_number', 'question_order')
+        .values(*QUESTION_FIELDS)
+    )
+
+    def is_changed(item):
+        return since is None or item['updated_at'] > since
+
+    words, rules = set(), _names(group.grammar_focus)
+    new_words, new_rules = set(), set()
+    for item in levels:
+        item_words, item_rules = _names(item['vocabulary_words']), _names(item['grammar_points'])
+        words |= item_words
+        rules |= item_rules
+        if is_changed(item):
+            new_words |= item_words
+            new_rules |= item_rules
+    changed_levels = {level['id'] for level in levels if is_changed(level)}
+    changed_questions = []
+    for item in questions:
+        item_words, item_rules = _names(item['vocabulary_tested']), _names(item['grammar_tested'])
+        words |= item_words
+        rules |= item_rules
+        if is_changed(item) or item['level_id'] in changed_levels:
+            changed_questions.append(item)
+            new_words |= item_words
+            new_rules |= item_rules
+
+    vocabulary_filter = Q(word__in=words)
+    if group.oxford_word_range_start and group.oxford_word_range_end:
+        vocabulary_filter |= Q(oxford_rank__range=(group.oxford_word_range_start, group.oxford_word_range_end))
+    vocabulary = list(
+        Vocabulary.objects.filter(vocabulary_filter, is_active=True).order_by('oxford_rank', 'word').values(*VOCABULARY_FIELDS)
+    )
+    grammar_rules = list(
+        GrammarRule.objects.filter(Q(name__in=rules) | Q(short_name__in=rules), is_active=True)
+        .order_by('name')
+        .values(*GRAMMAR_FIELDS)
+    )
+
+    # A changed group can move its oxford range or grammar focus, so
+    # everything it references is resent
+    group_changed = since is None or group.updated_at > since
+    changed_vocabulary = [
+        word for word in vocabulary
+        if group_changed or is_changed(word) or word['word'] in new_words
+    ]
+    changed_grammar = [
+        rule for rule in grammar_rules
+        if group_changed or is_changed(rule) or rule['name'] in new_rules or rule['short_name'] in new_rules
+    ]
+
+    media = sorted({
+        url for question in changed_questions
+        for url in (question['audio_url'], question['image_url']) if url
+    })
+
+    bundle = {
+        'group_number': group.group_number,
+        'version': version or bundle_version(group),
+        'since': version_token(since) if since else None,
+        'full': since is None,
+        'levels': [level for level in levels if level['id'] in changed_levels],
+        'questions': changed_questions,
+        'vocabulary': changed_vocabulary,
+        'grammar_rules': changed_grammar,
+        'media': media,
+        # Everything still live, so devices can drop what is not listed
+        'level_ids': [level['id'] for level in levels],
+        'question_ids': [question['id'] for question in questions],
+        'vocabulary_ids': [word['id'] for word in vocabulary],
+        'grammar_rule_ids': [rule['id'] for rule in grammar_rules],
+    }
+    if group_changed:
+        bundle['group'] = {field: getattr(group, field) for field in GROUP_FIELDS}
+    return bundle
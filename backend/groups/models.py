@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from users.models import User
 
 
@@ -234,14 +236,14 @@ class GroupProgress(models.Model):
         """Unlock group for user"""
         self.is_unlocked = True
         self.unlocked_at = timezone.now()
-        self.save()
+        self.save(update_fields=['is_unlocked', 'unlocked_at', 'updated_at'])
     
     def complete_group(self):
         """Mark group as completed"""
         self.is_completed = True
         self.completion_percentage = 100.0
         self.completed_at = timezone.now()
-        self.save()
+        self.save(update_fields=['is_completed', 'completion_percentage', 'completed_at', 'updated_at'])
     
     def update_progress(self, levels_completed=0, xp_earned=0, time_spent=0):
         """Update group progress"""
@@ -266,7 +268,9 @@ class GroupProgress(models.Model):
             self.unlock_test_passed = True
             self.unlock_group()
         
-        self.save()
+        self.save(update_fields=[
+            'unlock_test_attempts', 'best_unlock_test_score', 'unlock_test_passed', 'updated_at'
+        ])
 
 
 class GroupUnlockTest(models.Model):
@@ -417,4 +421,12 @@ class GroupUnlockTestAttempt(models.Model):
         if self.completed_at:
             self.percentage = self.calculate_percentage()
             self.passed = self.check_pass_status()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_groups_version(sender, instance, **kwargs):
+    """Invalidate cached group responses"""
+    from levels.versions import bump_content_versions
+    bump_content_versions('groups')
@@ -13,6 +13,7 @@ urlpatterns = [
     path('<int:group_number>/unlock/', views.unlock_group, name='group-unlock'),
     path('<int:group_number>/complete/', views.complete_group, name='group-complete'),
     path('<int:group_number>/stats/', views.group_stats, name='group-stats'),
+    path('<int:group_number>/bundle/', views.group_bundle, name='group-bundle'),
     
     # Unlock test endpoints
     path('unlock-tests/', views.GroupUnlockTestListView.as_view(), name='unlock-test-list'),
@@ -1,36 +1,52 @@
+import gzip
+import json
+
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q, Avg, Count, Sum
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from .models import Group, GroupProgress, GroupUnlockTest, GroupUnlockTestAttempt
 from .serializers import (
     GroupSerializer, GroupProgressSerializer, GroupUnlockTestSerializer,
     GroupUnlockTestAttemptSerializer, GroupStatsSerializer
 )
-from levels.serializers import LevelSerializer
+from levels.models import Level
+from levels.serializers import LevelSerializer, level_rows, serialize_levels
+from levels.versions import ContentVersionMixin, etag_matches
+from fast_serializers import FastListMixin, FastRows
+from .bundle import build_group_bundle, bundle_version, parse_version_token
 from cache_utils import cache_group_data, cache_api_response
 
 
-class GroupListView(generics.ListAPIView):
+# Progress defaults GroupListView shows; per-user progress comes from the
+# progress endpoints
+group_list_rows = FastRows(GroupSerializer, computed={
+    'is_unlocked': (('group_number',), lambda group_number: group_number <= 1),
+    'completion_percentage': ((), lambda: 0),
+    'levels_completed': ((), lambda: 0),
+    'total_levels': (('total_levels',), lambda total_levels: total_levels),
+    'xp_earned': ((), lambda: 0),
+})
+
+
+class GroupListView(FastListMixin, generics.ListAPIView):
     """List all groups with user progress"""
     serializer_class = GroupSerializer
+    fast_rows = group_list_rows
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        """Get groups with user progress"""
-        groups = Group.objects.filter(is_active=True).order_by('group_number')
-        
-        # Add default progress for each group (for non-authenticated users)
-        for group in groups:
-            group.completion_percentage = 0
-            group.levels_completed = 0
-            group.total_levels = group.levels.count()
-            group.xp_earned = 0
-            group.is_unlocked = group.group_number <= 1  # First group unlocked by default
-        
-        return groups
+        """Get groups with their level counts; the first group is unlocked by default"""
+        return (
+            Group.objects.filter(is_active=True)
+            .annotate(total_levels=Count('levels'))
+            .order_by('group_number')
+        )
 
 
 class GroupDetailView(generics.RetrieveAPIView):
@@ -43,30 +59,25 @@ class GroupDetailView(generics.RetrieveAPIView):
         return Group.objects.filter(is_active=True)
 
 
-class GroupLevelsView(generics.ListAPIView):
+class GroupLevelsView(ContentVersionMixin, FastListMixin, generics.ListAPIView):
     """Get all levels in a group with user progress"""
+    content_kinds = ('groups', 'levels')
     serializer_class = LevelSerializer
+    fast_rows = level_rows
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         group_number = self.kwargs['group_number']
-        
-        try:
-            group = Group.objects.get(group_number=group_number, is_active=True)
-            levels = group.levels.filter(is_active=True).order_by('level_number')
-            
-            # Add default progress for each level (for non-authenticated users)
-            for level in levels:
-                level.completion_percentage = 0
-                level.is_completed = False
-                level.score = 0
-                level.attempts = 0
-                level.time_spent = 0
-                level.is_unlocked = level.level_number <= 1  # First level unlocked by default
-            
-            return levels
-        except Group.DoesNotExist:
-            return []
+        return Level.objects.filter(
+            group__group_number=group_number, group__is_active=True, is_active=True
+        ).order_by('level_number')
+    
+    def serialize_rows(self, rows):
+        levels = serialize_levels(rows)
+        # Default progress for non-authenticated users: only level 1 is open
+        for level in levels:
+            level['is_unlocked'] = level['level_number'] <= 1
+        return levels
 
 
 @api_view(['POST'])
@@ -223,6 +234,69 @@ def group_stats(request, group_number):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def group_bundle(request, group_number):
+    """Download a whole group for offline use, or only what changed since ?since=<version>"""
+    try:
+        group = Group.objects.get(group_number=group_number, is_active=True)
+    except Group.DoesNotExist:
+        return Response(
+            {'error': 'Group not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    since = request.query_params.get('since')
+    if since:
+        try:
+            since = parse_version_token(since)
+        except (TypeError, ValueError, OverflowError, OSError):
+            return Response(
+                {'error': 'since must be a version returned by a previous bundle'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    # Low-bandwidth campuses: compress here rather than relying on a proxy.
+    # Each encoding is its own representation, so it gets its own ETag
+    use_gzip = accepts_gzip(request)
+    version = bundle_version(group)
+    etag = f'"{group.group_number}-{version}{"-gzip" if use_gzip else ""}"'
+    
+    # Answer a revalidation before loading any content
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        bundle = build_group_bundle(group, since=since or None, version=version)
+        payload = json.dumps(bundle, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+        response = HttpResponse(content_type='application/json')
+        if use_gzip:
+            payload = gzip.compress(payload)
+            response['Content-Encoding'] = 'gzip'
+        response.content = payload
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def accepts_gzip(request):
+    """Whether Accept-Encoding allows gzip, honouring q=0 and the * wildcard"""
+    qualities = {}
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, *params = [piece.strip() for piece in part.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
 class GroupUnlockTestListView(generics.ListAPIView):
     """List available unlock tests"""
     serializer_class = GroupUnlockTestSerializer
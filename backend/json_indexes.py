@@ -0,0 +1,75 @@
+"""
+Indexed lookups into JSONField values
+The has_element lookup matches a JSON array containing a value, or a JSON
+scalar equal to it: ``Level.objects.filter(vocabulary_words__has_element='apple')``.
+On Postgres it compiles to jsonb containment (``@>``), which a GIN
+jsonb_path_ops index serves; CreateGinIndex adds those indexes from
+migrations. SQLite cannot index array membership, so there the lookup
+scans with json_each; JSON lookups that SQLite can serve from an index
+(equality on a whole value, expressions over it) use ordinary Meta.indexes.
+"""
+
+from django.db.migrations.operations.base import Operation
+from django.db.models import JSONField
+from django.db.models.fields.json import DataContains
+
+
+@JSONField.register_lookup
+class HasElement(DataContains):
+    lookup_name = 'has_element'
+
+    def as_sqlite(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        # Objects are excluded, as jsonb containment never matches their values
+        return (
+            f"(json_type({lhs}) <> 'object' AND EXISTS "
+            f"(SELECT 1 FROM json_each({lhs}) WHERE json_each.value = json_extract({rhs}, '$')))",
+            (*lhs_params, *lhs_params, *rhs_params),
+        )
+
+
+class CreateGinIndex(Operation):
+    """
+    GIN (jsonb_path_ops) index on a JSONField, created on Postgres only.
+    It is left out of the model state so SQLite, which has no GIN indexes,
+    never sees it when it rebuilds the table.
+    """
+    reversible = True
+    reduces_to_sql = True
+
+    def __init__(self, model_name, field_name, name):
+        self.model_name = model_name
+        self.field_name = field_name
+        self.name = name
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {
+            'model_name': self.model_name, 'field_name': self.field_name, 'name': self.name,
+        }
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = to_state.apps.get_model(app_label, self.model_name)
+        quote = schema_editor.quote_name
+        column = model._meta.get_field(self.field_name).column
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {quote(self.name)} ON {quote(model._meta.db_table)} '
+            f'USING gin ({quote(column)} jsonb_path_ops)'
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(self.name)}')
+
+    def describe(self):
+        return f'Create GIN index {self.name} on {self.model_name}.{self.field_name} (Postgres only)'
+
+    @property
+    def migration_name_fragment(self):
+        return self.name.lower()
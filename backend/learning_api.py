@@ -10,6 +10,8 @@ from rest_framework import status, permissions
 from django.db.models import Q, Avg, Count, Sum
 from django.utils import timezone
 
+from concurrent_queries import fan_out
+
 # Import existing views
 from groups.views import (
     GroupListView, GroupDetailView, GroupLevelsView,
@@ -81,7 +83,7 @@ def learning_dashboard(request):
     
     # Get overall progress
     from progress.views import progress_overview
-    progress_response = progress_overview(request)
+    progress_response = progress_overview(request._request)
     overall_progress = progress_response.data if hasattr(progress_response, 'data') else {}
     
     return Response({
@@ -108,48 +110,53 @@ def my_groups(request):
 def learning_stats(request):
     """Get comprehensive learning statistics"""
     user = request.user
+    from groups.models import GroupProgress
+    from progress.models import LevelProgress
     
-    # Get progress overview
-    progress_response = progress_overview(request)
-    progress_data = progress_response.data if hasattr(progress_response, 'data') else {}
+    def progress_data():
+        progress_response = progress_overview(request._request)
+        return progress_response.data if hasattr(progress_response, 'data') else {}
     
-    # Get group statistics
-    from groups.models import GroupProgress
-    group_stats_data = GroupProgress.objects.filter(user=user).aggregate(
-        total_groups_started=Count('id'),
-        total_groups_completed=Count('id', filter=Q(is_completed=True)),
-        total_xp_earned=Sum('total_xp_earned'),
-        total_time_spent=Sum('time_spent_minutes')
-    )
+    def group_stats_data():
+        return GroupProgress.objects.filter(user=user).aggregate(
+            total_groups_started=Count('id'),
+            total_groups_completed=Count('id', filter=Q(is_completed=True)),
+            total_xp_earned=Sum('total_xp_earned'),
+            total_time_spent=Sum('time_spent_minutes')
+        )
     
-    # Get level statistics
-    from progress.models import LevelProgress
-    level_stats_data = LevelProgress.objects.filter(user=user).aggregate(
-        total_levels_attempted=Count('id'),
-        total_levels_completed=Count('id', filter=Q(is_completed=True)),
-        average_accuracy=Avg('completion_percentage'),
-        total_attempts=Sum('attempts')
-    )
+    def level_stats_data():
+        return LevelProgress.objects.filter(user=user).aggregate(
+            total_levels_attempted=Count('id'),
+            total_levels_completed=Count('id', filter=Q(is_completed=True)),
+            average_accuracy=Avg('completion_percentage'),
+            total_attempts=Sum('attempts')
+        )
     
-    # Get plant statistics
-    try:
-        from plants.models import UserPlant
-        user_plant = UserPlant.objects.get(user=user)
-        plant_data = {
-            'current_stage': user_plant.current_stage.get_stage_name_display(),
-            'health_points': user_plant.health_points,
-            'is_healthy': user_plant.is_healthy,
-            'daily_care_streak': user_plant.daily_care_streak,
-            'max_care_streak': user_plant.max_care_streak
-        }
-    except:
-        plant_data = None
+    def plant_data():
+        try:
+            from plants.models import UserPlant
+            user_plant = UserPlant.objects.select_related('current_stage').get(user=user)
+            return {
+                'current_stage': user_plant.current_stage.get_stage_name_display(),
+                'health_points': user_plant.health_points,
+                'is_healthy': user_plant.is_healthy,
+                'daily_care_streak': user_plant.daily_care_streak,
+                'max_care_streak': user_plant.max_care_streak
+            }
+        except:
+            return None
     
-    return Response({
+    # The four sections are independent, so they are queried concurrently
+    results = fan_out({
         'progress_overview': progress_data,
         'group_statistics': group_stats_data,
         'level_statistics': level_stats_data,
         'plant_status': plant_data,
+    })
+    
+    return Response({
+        **results,
         'generated_at': timezone.now()
     })
 
@@ -215,7 +222,7 @@ def learning_recommendations(request):
         })
     
     # Check streak maintenance
-    streak_data = progress_overview(request)
+    streak_data = progress_overview(request._request)
     if hasattr(streak_data, 'data') and streak_data.data.get('current_streak', 0) > 0:
         recommendations.append({
             'type': 'streak_maintenance',
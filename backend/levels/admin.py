@@ -4,7 +4,7 @@ from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.forms import ModelForm, Textarea, TextInput
 from django import forms
-from .models import Level, Question, LevelCompletion
+from .models import Level, Question, LevelCompletion, ContentPack
 
 
 class QuestionForm(ModelForm):
@@ -176,4 +176,12 @@ class LevelCompletionAdmin(admin.ModelAdmin):
     )
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'level')
\ No newline at end of file
+        return super().get_queryset(request).select_related('user', 'level')
+
+@admin.register(ContentPack)
+class ContentPackAdmin(admin.ModelAdmin):
+    list_display = ('version', 'content_hash', 'size_bytes', 'created_at', 'applied_at')
+    search_fields = ('version', 'note')
+    ordering = ('-created_at',)
+    exclude = ('data',)
+    readonly_fields = ('content_hash', 'size_bytes', 'created_at', 'applied_at')
@@ -5,10 +5,9 @@ from django.views import View
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db import models
 import json
-import csv
-import io
 from levels.models import Level, Question
 from levels.serializers import QuestionSerializer
+from levels.importer import ImportAborted, import_questions
 
 
 def is_admin_user(user):
@@ -68,65 +67,45 @@ def admin_dashboard_stats(request):
 @login_required
 @user_passes_test(is_admin_user)
 def bulk_import_questions(request):
-    """Bulk import questions from CSV/JSON file"""
+    """Bulk import questions from CSV/JSON file, upserting on (level, question_order)"""
     try:
         uploaded_file = request.FILES.get('questions_file')
         level_id = request.POST.get('level_id')
         file_format = request.POST.get('file_format', 'csv')
+        dry_run = request.POST.get('dry_run') in ('1', 'true', 'True')
         
-        if not uploaded_file or not level_id:
+        if not uploaded_file:
             return JsonResponse({
                 'success': False,
-                'message': 'File and level_id are required'
+                'message': 'A questions_file is required'
             }, status=400)
         
+        # Rows without their own level_number/level_id go to this level
+        level = None
+        if level_id:
+            try:
+                level = Level.objects.get(id=level_id)
+            except Level.DoesNotExist:
+                return JsonResponse({
+                    'success': False,
+                    'message': 'Level not found'
+                }, status=400)
+        
         try:
-            level = Level.objects.get(id=level_id)
-        except Level.DoesNotExist:
+            report = import_questions(uploaded_file, file_format, default_level=level, dry_run=dry_run)
+        except ImportAborted as e:
+            # Batches before the unreadable part stay imported
             return JsonResponse({
                 'success': False,
-                'message': 'Level not found'
+                'message': f'Import stopped: {e}',
+                **e.report
             }, status=400)
         
-        imported_count = 0
-        errors = []
-        
-        # Read file content
-        file_content = uploaded_file.read().decode('utf-8')
-        
-        if file_format == 'csv':
-            questions_data = parse_csv_content(file_content)
-        else:
-            questions_data = parse_json_content(file_content)
-        
-        # Import questions
-        for i, question_data in enumerate(questions_data):
-            try:
-                question = Question.objects.create(
-                    level=level,
-                    question_order=question_data.get('question_order', 1),
-                    question_type=question_data.get('question_type', 'mcq'),
-                    question_text=question_data['question_text'],
-                    options=question_data.get('options', ''),
-                    correct_answer=question_data['correct_answer'],
-                    hint=question_data.get('hint', ''),
-                    explanation=question_data.get('explanation', ''),
-                    difficulty=question_data.get('difficulty', 1),
-                    xp_value=question_data.get('xp_value', 10),
-                    time_limit_seconds=question_data.get('time_limit_seconds', 0),
-                    audio_url=question_data.get('audio_url', ''),
-                    image_url=question_data.get('image_url', ''),
-                    is_active=True
-                )
-                imported_count += 1
-            except Exception as e:
-                errors.append(f'Row {i+1}: {str(e)}')
-        
         return JsonResponse({
             'success': True,
-            'message': f'Successfully imported {imported_count} questions',
-            'imported_count': imported_count,
-            'errors': errors
+            'message': f"Imported {report['imported_count']} questions "
+                       f"({report['created']} created, {report['updated']} updated)",
+            **report
         })
         
     except Exception as e:
@@ -136,43 +115,6 @@ def bulk_import_questions(request):
         }, status=500)
 
 
-def parse_csv_content(content):
-    """Parse CSV content and return list of question dictionaries"""
-    questions = []
-    csv_reader = csv.DictReader(io.StringIO(content))
-    
-    for row in csv_reader:
-        question_data = {
-            'question_order': int(row.get('question_order', 1)),
-            'question_type': row.get('question_type', 'mcq'),
-            'question_text': row['question_text'].strip(),
-            'options': row.get('options', '').strip(),
-            'correct_answer': row['correct_answer'].strip(),
-            'hint': row.get('hint', '').strip(),
-            'explanation': row.get('explanation', '').strip(),
-            'difficulty': int(row.get('difficulty', 1)),
-            'xp_value': int(row.get('xp_value', 10)),
-            'time_limit_seconds': int(row.get('time_limit_seconds', 0)),
-            'audio_url': row.get('audio_url', '').strip(),
-            'image_url': row.get('image_url', '').strip(),
-        }
-        questions.append(question_data)
-    
-    return questions
-
-
-def parse_json_content(content):
-    """Parse JSON content and return list of question dictionaries"""
-    data = json.loads(content)
-    
-    if isinstance(data, list):
-        return data
-    elif isinstance(data, dict) and 'questions' in data:
-        return data['questions']
-    else:
-        raise ValueError('JSON file must contain a list of questions or an object with "questions" key')
-
-
 @login_required
 @user_passes_test(is_admin_user)
 def question_list_admin(request):
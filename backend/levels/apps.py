@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LevelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'levels'
+
+    def ready(self):
+        # Registers the has_element lookup used by the content queries
+        import json_indexes  # noqa: F401
@@ -0,0 +1,271 @@
+"""
+Student journey benchmark
+Seeds a small synthetic school into a throwaway database and drives the
+exam-day hot path (login, learning dashboard, level questions, six answers,
+level completion, progress overview) with concurrent simulated students
+through the Django test client. Each step reports latency percentiles and
+queries per request, and the whole run its throughput, as a JSON-ready dict
+so results can be compared across commits. run_writes() drives only the
+level-completion write path, for comparing SQLite write profiles.
+"""
+
+import subprocess
+import threading
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from django.utils import timezone
+
+from campus.models import Campus
+from groups.models import Group
+from students.models import Student
+from users.models import User
+from .models import Level, Question
+
+BENCHMARK_PASSWORD = 'bench-pass-123'
+QUESTIONS_PER_LEVEL = 6
+
+STEPS = [
+    'login', 'learning_dashboard', 'level_questions', 'submit_answer',
+    'complete_level', 'progress_overview',
+]
+
+
+def seed_school(students=20, groups=2, levels_per_group=10):
+    """Curriculum plus student accounts for the journey; returns the students' usernames"""
+    campus = Campus.objects.create(campus_name='Benchmark Campus', campus_code='B01')
+
+    Group.objects.bulk_create([
+        Group(group_number=number, name=f'Benchmark Group {number}')
+        for number in range(groups)
+    ])
+    group_ids = dict(Group.objects.values_list('group_number', 'id'))
+    Level.objects.bulk_create([
+        Level(
+            group_id=group_ids[group], level_number=group * levels_per_group + offset + 1,
+            name=f'Benchmark Level {group * levels_per_group + offset + 1}',
+        )
+        for group in range(groups) for offset in range(levels_per_group)
+    ])
+    Question.objects.bulk_create([
+        Question(
+            level=level, question_order=order, question_type='mcq',
+            question_text=f'Benchmark question {order}', options=['A', 'B', 'C', 'D'],
+            correct_answer='A',
+        )
+        for level in Level.objects.all() for order in range(1, QUESTIONS_PER_LEVEL + 1)
+    ])
+
+    # One hash for everyone; hashing per student would dominate seeding
+    password = make_password(BENCHMARK_PASSWORD)
+    student_rows = [
+        Student(
+            name=f'Bench Student {n}', grade='Grade 5', campus=campus,
+            password=password, student_id=f'B01-M-G05-{n:04d}',
+        )
+        for n in range(1, students + 1)
+    ]
+    Student.objects.bulk_create(student_rows)
+    User.objects.bulk_create([
+        User(
+            username=f'student_{student.student_id}', first_name='Bench',
+            last_name=f'Student {n}', role='student', is_verified=True,
+            student_id=student.student_id, password=password,
+        )
+        for n, student in enumerate(student_rows, start=1)
+    ])
+    return [f'student_{student.student_id}' for student in student_rows]
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[rank - 1]
+
+
+class JourneyRunner:
+    """Runs journeys for one simulated student and records every step"""
+
+    def __init__(self, username, records):
+        self.username = username
+        self.records = records
+        self.client = Client(raise_request_exception=False)
+
+    def call(self, step, method, path, data=None):
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            if method == 'post':
+                response = self.client.post(path, data, content_type='application/json')
+            else:
+                response = self.client.get(path)
+        self.records.append({
+            'step': step,
+            'ms': (time.perf_counter() - started) * 1000,
+            'queries': len(queries),
+            'ok': response.status_code < 400,
+        })
+        return response
+
+    def login(self):
+        response = self.call('login', 'post', '/api/users/auth/login/', {
+            'username': self.username, 'password': BENCHMARK_PASSWORD,
+        })
+        if response.status_code != 200:
+            return False
+        self.client.defaults['HTTP_AUTHORIZATION'] = f"Bearer {response.json()['tokens']['access']}"
+        return True
+
+    def play_level(self, level_number):
+        started_at = timezone.now().isoformat()
+        self.call('learning_dashboard', 'get', '/api/learning/')
+        response = self.call('level_questions', 'get', f'/api/levels/levels/{level_number}/questions/')
+        questions = response.json() if response.status_code == 200 else []
+        if isinstance(questions, dict):
+            questions = questions.get('results', [])
+
+        answers = {}
+        for question in questions[:QUESTIONS_PER_LEVEL]:
+            answers[str(question['id'])] = 'A'
+            self.call('submit_answer', 'post', '/api/levels/submit-answer/', {
+                'question_id': question['id'], 'answer': 'A',
+            })
+
+        self.call('complete_level', 'post', '/api/levels/complete-level/', {
+            'level': self.level_ids[level_number],
+            'score': len(answers),
+            'total_questions': len(answers),
+            'correct_answers': len(answers),
+            'time_taken_seconds': 60,
+            'started_at': started_at,
+            'user_answers': answers,
+        })
+        self.call('progress_overview', 'get', '/api/progress/overview/')
+
+    def run(self, levels, level_ids, start_barrier):
+        self.level_ids = level_ids
+        try:
+            start_barrier.wait()
+            if self.login():
+                for level_number in levels:
+                    self.play_level(level_number)
+        finally:
+            connections.close_all()
+
+
+def run_journeys(usernames, iterations=1):
+    """Every student plays ``iterations`` levels concurrently; returns the records and wall time"""
+    level_ids = dict(Level.objects.values_list('level_number', 'id'))
+    levels = sorted(level_ids)[:iterations]
+    barrier = threading.Barrier(len(usernames) + 1)
+    records = []
+    threads = [
+        threading.Thread(target=JourneyRunner(username, records).run, args=(levels, level_ids, barrier))
+        for username in usernames
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return records, time.perf_counter() - started
+
+
+def run_writes(writes_per_student=10):
+    """
+    Every student completes ``writes_per_student`` levels concurrently,
+    calling the complete_level view directly; returns the latencies of the
+    completed writes, the number that failed and the wall time
+    """
+    from .views import complete_level
+
+    users = list(User.objects.filter(role='student'))
+    level_ids = list(Level.objects.order_by('level_number').values_list('id', flat=True))[:writes_per_student]
+    barrier = threading.Barrier(len(users) + 1)
+    latencies = []
+    failures = []
+
+    def write(user):
+        factory = APIRequestFactory()
+        try:
+            barrier.wait()
+            for level_id in level_ids:
+                request = factory.post('/api/levels/complete-level/', {
+                    'level': level_id, 'score': 6, 'total_questions': 6, 'correct_answers': 6,
+                    'time_taken_seconds': 60, 'started_at': timezone.now().isoformat(), 'user_answers': {},
+                }, format='json')
+                force_authenticate(request, user=user)
+                started = time.perf_counter()
+                try:
+                    response = complete_level(request)
+                except Exception as e:
+                    failures.append(repr(e))
+                    continue
+                if response.status_code < 400:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    failures.append(response.status_code)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=write, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return latencies, failures, time.perf_counter() - started
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(records, wall_seconds, students, iterations):
+    """Per-step percentiles and query counts plus run throughput"""
+    steps = {}
+    for step in STEPS:
+        rows = [record for record in records if record['step'] == step]
+        latencies = [record['ms'] for record in rows]
+        queries = [record['queries'] for record in rows]
+        steps[step] = {
+            'count': len(rows),
+            'errors': sum(1 for record in rows if not record['ok']),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(max(latencies, default=0), 2),
+            'queries_mean': round(sum(queries) / len(queries), 2) if queries else 0,
+            'queries_max': max(queries, default=0),
+        }
+
+    journeys = steps['progress_overview']['count']
+    return {
+        'commit': git_commit(),
+        'run_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'students': students,
+        'iterations': iterations,
+        'steps': steps,
+        'totals': {
+            'requests': len(records),
+            'errors': sum(1 for record in records if not record['ok']),
+            'journeys': journeys,
+            'wall_seconds': round(wall_seconds, 3),
+            'journeys_per_second': round(journeys / wall_seconds, 2) if wall_seconds else 0,
+            'requests_per_second': round(len(records) / wall_seconds, 2) if wall_seconds else 0,
+        },
+    }
@@ -0,0 +1,256 @@
+"""
+Curriculum content packs
+A pack is one gzip-compressed JSON file holding groups, levels, questions,
+vocabulary and grammar rules keyed by their natural keys, each row carrying
+a content hash. Loading a pack diffs those hashes against the database and
+writes only new and changed rows with bulk operations, so curricula can be
+synced between environments and rolled back to an earlier pack version.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import NamedTuple, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from groups.models import Group
+from grammar.models import GrammarRule
+from vocabulary.models import Vocabulary
+from .models import ContentPack, Level, Question
+from .versions import bump_content_versions
+
+PACK_FORMAT = 'lingo-content-pack'
+PACK_FORMAT_VERSION = 1
+PACK_BATCH_SIZE = 500
+
+# Bookkeeping and authorship columns that are not curriculum content
+EXCLUDED_FIELDS = {'id', 'created_at', 'updated_at', 'created_by'}
+
+
+class PackSection(NamedTuple):
+    """One model in a pack: its natural key and optional parent reference"""
+    name: str
+    model: type
+    key: tuple
+    # ContentVersion kind invalidated when the section changes
+    kind: str
+    # (foreign key field, natural key field on the parent model)
+    parent: Optional[tuple] = None
+
+
+# Parents come before children so their ids exist when children are written
+SECTIONS = [
+    PackSection('groups', Group, ('group_number',), 'groups'),
+    PackSection('levels', Level, ('level_number',), 'levels', ('group', 'group_number')),
+    PackSection('questions', Question, ('level', 'question_order'), 'levels', ('level', 'level_number')),
+    PackSection('vocabulary', Vocabulary, ('word',), 'vocabulary'),
+    PackSection('grammar_rules', GrammarRule, ('name',), 'grammar'),
+]
+
+
+def content_fields(section):
+    """Plain (non-relational) content columns of a section's model"""
+    return [
+        field.name for field in section.model._meta.concrete_fields
+        if field.name not in EXCLUDED_FIELDS and not field.is_relation
+    ]
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), cls=DjangoJSONEncoder)
+
+
+def row_hash(fields):
+    """Stable content hash of one row's fields"""
+    return hashlib.sha256(_canonical(fields).encode('utf-8')).hexdigest()
+
+
+def row_key(section, fields):
+    key = tuple(fields[name] for name in section.key)
+    return key[0] if len(key) == 1 else list(key)
+
+
+def _hashable(key):
+    return tuple(key) if isinstance(key, list) else key
+
+
+def iter_section_rows(section, queryset=None, with_pk=False):
+    """Yield the pack fields of every row of a section, parents as natural keys"""
+    queryset = queryset if queryset is not None else section.model.objects.all()
+    names = content_fields(section)
+    extra = {}
+    if section.parent:
+        fk, parent_key = section.parent
+        extra['_parent'] = F(f'{fk}__{parent_key}')
+    if with_pk:
+        names = names + ['pk']
+
+    for row in queryset.order_by('pk').values(*names, **extra).iterator(chunk_size=2000):
+        if section.parent:
+            row[section.parent[0]] = row.pop('_parent')
+        yield row
+
+
+def export_pack(version, note=''):
+    """Build the pack dict for the current database content"""
+    sections = {}
+    digest = hashlib.sha256()
+    for section in SECTIONS:
+        records = []
+        for fields in iter_section_rows(section):
+            content_hash = row_hash(fields)
+            digest.update(content_hash.encode('ascii'))
+            records.append({'key': row_key(section, fields), 'hash': content_hash, 'fields': fields})
+        sections[section.name] = records
+
+    return {
+        'format': PACK_FORMAT,
+        'format_version': PACK_FORMAT_VERSION,
+        'version': version,
+        'note': note,
+        'created_at': timezone.now().isoformat(),
+        'content_hash': digest.hexdigest(),
+        'sections': sections,
+    }
+
+
+def dump_pack(pack):
+    """Serialize a pack dict to compressed bytes"""
+    return gzip.compress(_canonical(pack).encode('utf-8'))
+
+
+def read_pack(data):
+    """Decompress and validate pack bytes, raising ValueError"""
+    try:
+        pack = json.loads(gzip.decompress(data).decode('utf-8'))
+    except (OSError, ValueError) as e:
+        raise ValueError(f'Not a content pack: {e}')
+
+    if not isinstance(pack, dict) or pack.get('format') != PACK_FORMAT:
+        raise ValueError('Not a content pack')
+    if pack.get('format_version') != PACK_FORMAT_VERSION:
+        raise ValueError(f"Unsupported content pack format version {pack.get('format_version')}")
+    if not pack.get('version'):
+        raise ValueError('Content pack has no version')
+    return pack
+
+
+def save_pack(pack, data=None):
+    """Store a pack in the ContentPack table so it can be re-applied later"""
+    data = data if data is not None else dump_pack(pack)
+    content_pack, _ = ContentPack.objects.update_or_create(
+        version=pack['version'],
+        defaults={
+            'content_hash': pack['content_hash'],
+            'note': pack.get('note', ''),
+            'data': data,
+            'size_bytes': len(data),
+        },
+    )
+    return content_pack
+
+
+class PackLoader:
+    """Diffs a pack against the database and applies the changed rows"""
+
+    def __init__(self, pack, prune=False, dry_run=False, batch_size=PACK_BATCH_SIZE):
+        self.pack = pack
+        self.prune = prune
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.now = timezone.now()
+        self.report = {}
+
+    def load(self):
+        """Apply every section in one transaction; returns per-section counts"""
+        with transaction.atomic():
+            changed = set()
+            for section in SECTIONS:
+                counts = self.apply_section(section)
+                self.report[section.name] = counts
+                if counts['created'] or counts['updated'] or counts['deactivated']:
+                    changed.add(section.kind)
+            if self.dry_run:
+                transaction.set_rollback(True)
+            elif changed:
+                # Bulk writes skip post_save, so move the versions by hand
+                bump_content_versions(*sorted(changed))
+        return self.report
+
+    def resolve_parents(self, section):
+        """Map parent natural keys to ids after the parent section was applied"""
+        fk, parent_key = section.parent
+        parent_model = section.model._meta.get_field(fk).related_model
+        return dict(parent_model.objects.values_list(parent_key, 'pk'))
+
+    def build(self, section, fields, parent_ids, pk=None):
+        values = dict(fields)
+        if section.parent:
+            fk = section.parent[0]
+            parent_id = parent_ids.get(values.pop(fk))
+            if parent_id is None:
+                raise ValueError(f'{section.name} row {row_key(section, fields)} references a missing {fk}')
+            values[f'{fk}_id'] = parent_id
+        instance = section.model(**values)
+        if pk is not None:
+            instance.pk = pk
+            instance.updated_at = self.now
+        return instance
+
+    def apply_section(self, section):
+        records = self.pack.get('sections', {}).get(section.name, [])
+        names = content_fields(section)
+
+        existing = {}
+        for fields in iter_section_rows(section, with_pk=True):
+            pk = fields.pop('pk')
+            existing[_hashable(row_key(section, fields))] = (pk, row_hash(fields), fields.get('is_active'))
+
+        parent_ids = self.resolve_parents(section) if section.parent else {}
+        to_create, to_update, seen = [], [], set()
+        for record in records:
+            key = _hashable(record['key'])
+            seen.add(key)
+            current = existing.get(key)
+            if current is None:
+                to_create.append(self.build(section, record['fields'], parent_ids))
+            elif current[1] != record['hash']:
+                to_update.append(self.build(section, record['fields'], parent_ids, pk=current[0]))
+
+        # Rows missing from the pack are deactivated rather than deleted, so
+        # learner progress that points at them survives a rollback
+        to_deactivate = [
+            pk for key, (pk, _, is_active) in existing.items()
+            if key not in seen and is_active
+        ] if self.prune else []
+
+        update_fields = names + ['updated_at']
+        if section.parent:
+            update_fields.append(section.parent[0])
+        section.model.objects.bulk_create(to_create, batch_size=self.batch_size)
+        section.model.objects.bulk_update(to_update, update_fields, batch_size=self.batch_size)
+        for start in range(0, len(to_deactivate), self.batch_size):
+            section.model.objects.filter(pk__in=to_deactivate[start:start + self.batch_size]).update(
+                is_active=False, updated_at=self.now
+            )
+
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'deactivated': len(to_deactivate),
+            'unchanged': len(records) - len(to_create) - len(to_update),
+        }
+
+
+def load_pack(pack, prune=False, dry_run=False, data=None):
+    """Apply a pack and record it as the applied version; returns the report"""
+    report = PackLoader(pack, prune=prune, dry_run=dry_run).load()
+    if not dry_run:
+        content_pack = save_pack(pack, data=data)
+        content_pack.applied_at = timezone.now()
+        content_pack.save(update_fields=['applied_at'])
+    return report
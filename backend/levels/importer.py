@@ -0,0 +1,346 @@
+"""
+Streaming question importer
+Reads CSV or JSON question files row by row, validates them in batches
+and upserts on (level, question_order) with bulk_create, so corrected
+files can be re-imported and a content drop spanning several levels
+loads in a handful of queries per batch.
+"""
+
+import csv
+import io
+import json
+
+from django.db import transaction
+
+from .models import Level, Question
+from .versions import bump_content_versions
+
+IMPORT_BATCH_SIZE = 500
+
+# Columns written on insert and refreshed on re-import
+UPSERT_FIELDS = [
+    'question_type', 'question_text', 'options', 'correct_answer', 'hint',
+    'explanation', 'difficulty', 'xp_value', 'time_limit_seconds',
+    'audio_url', 'image_url', 'is_active', 'updated_at',
+]
+
+QUESTION_TYPES = {choice for choice, _ in Question.QUESTION_TYPE_CHOICES}
+
+JSON_WHITESPACE = ' \t\r\n'
+
+
+class ImportAborted(ValueError):
+    """
+    The file stopped being readable part way through; batches before that
+    point are already imported, as ``report`` records
+    """
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+
+def _text_stream(file):
+    """Text view over an uploaded (binary) file or an already-open text file"""
+    if isinstance(file, io.TextIOBase):
+        return file
+    return io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+
+
+def iter_csv_rows(file):
+    """Yield (row_number, row dict) from a CSV file without loading it whole"""
+    reader = csv.DictReader(_text_stream(file))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _skip_whitespace(buffer, index):
+    while index < len(buffer) and buffer[index] in JSON_WHITESPACE:
+        index += 1
+    return index
+
+
+def _questions_list_start(decoder, buffer, position):
+    """
+    Index just inside the "questions" list of the wrapper object starting
+    at position, skipping whatever keys come before it; None if the buffer
+    does not reach that far or the object has no such list
+    """
+    index = position + 1
+    while True:
+        index = _skip_whitespace(buffer, index)
+        if index >= len(buffer) or buffer[index] == '}':
+            return None
+        try:
+            key, index = decoder.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            return None
+        index = _skip_whitespace(buffer, index)
+        if not isinstance(key, str) or index >= len(buffer) or buffer[index] != ':':
+            return None
+        index = _skip_whitespace(buffer, index + 1)
+        if index >= len(buffer):
+            return None
+        if key == 'questions' and buffer[index] == '[':
+            return index + 1
+        try:
+            _, index = decoder.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            return None
+        index = _skip_whitespace(buffer, index)
+        if index >= len(buffer) or buffer[index] != ',':
+            return None
+        index += 1
+
+
+def iter_json_rows(file, chunk_size=64 * 1024):
+    """
+    Yield (row_number, row dict) from a JSON list of questions, an object
+    with a "questions" list, or JSON Lines, decoding one object at a time
+    """
+    stream = _text_stream(file)
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    in_list = False
+    row_number = 0
+
+    while True:
+        # Skip whitespace and the commas between list items
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+
+        if position < len(buffer):
+            if in_list and buffer[position] == ']':
+                return
+            if not in_list and buffer[position] == '[':
+                in_list = True
+                position += 1
+                continue
+
+            try:
+                row, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                row = None
+                if not in_list and buffer[position] == '{':
+                    # A wrapper object: jump into its "questions" list
+                    start = _questions_list_start(decoder, buffer, position)
+                    if start is not None:
+                        in_list = True
+                        position = start
+                        continue
+
+            if row is not None:
+                position = end
+                if not in_list and isinstance(row, dict) and isinstance(row.get('questions'), list):
+                    # Small wrapper object that fitted in one read
+                    for item in row['questions']:
+                        row_number += 1
+                        yield row_number, item
+                    continue
+                row_number += 1
+                yield row_number, row
+                continue
+
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            if position < len(buffer):
+                raise ValueError(f'Invalid JSON after row {row_number}')
+            return
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def _int(row, field, default, minimum=None, maximum=None):
+    value = row.get(field)
+    if value in (None, ''):
+        return default
+    value = int(value)
+    if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        raise ValueError(f'{field} must be between {minimum} and {maximum}')
+    return value
+
+
+def _json_value(value):
+    """CSV cells holding a JSON list/object are decoded; plain text is kept"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value[:1] in ('[', '{'):
+            try:
+                return json.loads(value)
+            except ValueError:
+                pass
+    return value
+
+
+def _level_key(row):
+    """Level reference in a row: ('id', pk) or ('number', level_number)"""
+    if row.get('level_id') not in (None, ''):
+        return ('id', int(row['level_id']))
+    for field in ('level_number', 'level'):
+        if row.get(field) not in (None, ''):
+            return ('number', int(row[field]))
+    return None
+
+
+def clean_row(row):
+    """Validate a raw row into Question field values, raising ValueError"""
+    if not isinstance(row, dict):
+        raise ValueError('Row must be an object')
+
+    question_text = str(row.get('question_text') or '').strip()
+    if not question_text:
+        raise ValueError('question_text is required')
+
+    correct_answer = _json_value(row.get('correct_answer'))
+    if correct_answer in (None, '', []):
+        raise ValueError('correct_answer is required')
+
+    question_type = str(row.get('question_type') or 'mcq').strip()
+    if question_type not in QUESTION_TYPES:
+        raise ValueError(f'Unknown question_type "{question_type}"')
+
+    return {
+        'question_order': _int(row, 'question_order', 1, minimum=1),
+        'question_type': question_type,
+        'question_text': question_text,
+        'options': _json_value(row.get('options') or ''),
+        'correct_answer': correct_answer,
+        'hint': str(row.get('hint') or '').strip(),
+        'explanation': str(row.get('explanation') or '').strip(),
+        'difficulty': _int(row, 'difficulty', 1, minimum=1, maximum=5),
+        'xp_value': _int(row, 'xp_value', 10, minimum=1),
+        'time_limit_seconds': _int(row, 'time_limit_seconds', 30, minimum=5, maximum=300),
+        'audio_url': str(row.get('audio_url') or '').strip() or None,
+        'image_url': str(row.get('image_url') or '').strip() or None,
+        'is_active': True,
+    }
+
+
+class QuestionImporter:
+    """Upserts question rows in batches and collects a per-row report"""
+
+    def __init__(self, default_level=None, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+        self.default_level = default_level
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+        self._level_ids = {}
+        self._seen = set()
+
+    def error(self, row_number, message):
+        self.errors.append({'row': row_number, 'error': message})
+
+    def run(self, rows):
+        """
+        Import an iterable of (row_number, row dict); returns the report.
+        Raises ImportAborted if the file cannot be read to the end.
+        """
+        batch = []
+        rows = iter(rows)
+        while True:
+            try:
+                row_number, row = next(rows)
+            except StopIteration:
+                break
+            except (ValueError, csv.Error) as e:
+                imported = 0 if self.dry_run else self.created + self.updated
+                raise ImportAborted(
+                    f'{e}; {imported} questions from earlier rows were already imported',
+                    self.report(),
+                )
+            batch.append((row_number, row))
+            if len(batch) >= self.batch_size:
+                self.import_batch(batch)
+                batch = []
+        if batch:
+            self.import_batch(batch)
+        return self.report()
+
+    def resolve_levels(self, keys):
+        """Map level references in a batch to Level ids with one query per kind"""
+        missing = {key for key in keys if key not in self._level_ids}
+        ids = [value for kind, value in missing if kind == 'id']
+        numbers = [value for kind, value in missing if kind == 'number']
+        if ids:
+            for pk in Level.objects.filter(id__in=ids).values_list('id', flat=True):
+                self._level_ids[('id', pk)] = pk
+        if numbers:
+            for pk, number in Level.objects.filter(level_number__in=numbers).values_list('id', 'level_number'):
+                self._level_ids[('number', number)] = pk
+        for key in missing:
+            self._level_ids.setdefault(key, None)
+
+    def import_batch(self, batch):
+        cleaned = []
+        for row_number, row in batch:
+            try:
+                key = _level_key(row) if isinstance(row, dict) else None
+                if key is None and self.default_level is not None:
+                    key = ('id', self.default_level.id)
+                    self._level_ids[key] = self.default_level.id
+                if key is None:
+                    raise ValueError('level_number is required when no level is selected')
+                cleaned.append((row_number, key, clean_row(row)))
+            except (TypeError, ValueError) as e:
+                self.error(row_number, str(e))
+
+        self.resolve_levels({key for _, key, _ in cleaned})
+
+        questions = []
+        for row_number, key, fields in cleaned:
+            level_id = self._level_ids.get(key)
+            if level_id is None:
+                self.error(row_number, f'Level {key[1]} not found')
+                continue
+            identity = (level_id, fields['question_order'])
+            if identity in self._seen:
+                self.error(row_number, f'Duplicate question_order {identity[1]} for this level in file')
+                continue
+            self._seen.add(identity)
+            questions.append(Question(level_id=level_id, **fields))
+
+        if not questions:
+            return
+
+        existing = set(
+            Question.objects.filter(
+                level_id__in={question.level_id for question in questions},
+                question_order__in={question.question_order for question in questions},
+            ).values_list('level_id', 'question_order')
+        )
+        updated = sum(1 for q in questions if (q.level_id, q.question_order) in existing)
+        self.updated += updated
+        self.created += len(questions) - updated
+
+        if self.dry_run:
+            return
+
+        with transaction.atomic():
+            Question.objects.bulk_create(
+                questions,
+                update_conflicts=True,
+                unique_fields=['level', 'question_order'],
+                update_fields=UPSERT_FIELDS,
+            )
+            # bulk_create skips post_save, so move the version by hand
+            bump_content_versions('levels')
+
+    def report(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'imported_count': self.created + self.updated,
+            'error_count': len(self.errors),
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'dry_run': self.dry_run,
+        }
+
+
+def import_questions(file, file_format='csv', default_level=None, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """Stream-import a CSV or JSON questions file; returns the report dict"""
+    rows = iter_csv_rows(file) if file_format == 'csv' else iter_json_rows(file)
+    importer = QuestionImporter(default_level=default_level, batch_size=batch_size, dry_run=dry_run)
+    return importer.run(rows)
@@ -0,0 +1,96 @@
+"""
+Django management command to benchmark the student journey
+Usage: python manage.py benchmark_journey --students 50 --iterations 3 --output bench.json
+
+Seeds a synthetic school into a throwaway database, runs the journey with
+concurrent simulated students and prints per-step latency percentiles,
+queries per request and throughput. Pass a previous --output file as
+--compare to see the change per step.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from levels.benchmark import STEPS, run_journeys, seed_school, summarize
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the login to progress overview journey with concurrent simulated students'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=20, help='Concurrent simulated students')
+        parser.add_argument('--iterations', type=int, default=1, help='Levels each student plays')
+        parser.add_argument('--output', type=str, help='Write the results as JSON to this path')
+        parser.add_argument('--compare', type=str, help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        students = options['students']
+        iterations = options['iterations']
+        if students < 1 or iterations < 1:
+            raise CommandError('--students and --iterations must be at least 1')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as file:
+                    baseline = json.load(file)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read {options["compare"]}: {e}')
+
+        # Never seed into the configured database
+        workdir = None
+        if connection.vendor == 'sqlite':
+            workdir = tempfile.mkdtemp(prefix='benchmark-')
+            connection.settings_dict['TEST'] = {
+                **connection.settings_dict.get('TEST', {}),
+                'NAME': os.path.join(workdir, 'benchmark.sqlite3'),
+            }
+            # Concurrent writers wait for the lock instead of failing
+            connection.settings_dict['OPTIONS'].setdefault('timeout', 30)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            usernames = seed_school(students=students, levels_per_group=max(iterations, 10))
+            records, wall_seconds = run_journeys(usernames, iterations=iterations)
+            result = summarize(records, wall_seconds, students, iterations)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        self.print_report(result, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(result, file, indent=2)
+            self.stdout.write(f'Wrote {options["output"]}')
+
+        totals = result['totals']
+        message = (
+            f"{totals['journeys']} journeys in {totals['wall_seconds']}s: "
+            f"{totals['journeys_per_second']} journeys/s, {totals['requests_per_second']} requests/s"
+        )
+        if totals['errors']:
+            self.stdout.write(self.style.WARNING(f"{message}, {totals['errors']} failed requests"))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
+
+    def print_report(self, result, baseline):
+        self.stdout.write(f"{'step':<20}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}")
+        for step in STEPS:
+            row = result['steps'][step]
+            line = (
+                f"{step:<20}{row['count']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+                f"{row['p99_ms']:>10}{row['queries_mean']:>9}{row['errors']:>8}"
+            )
+            before = (baseline or {}).get('steps', {}).get(step)
+            if before:
+                line += (
+                    f"   p95 {row['p95_ms'] - before['p95_ms']:+.2f} ms,"
+                    f" queries {row['queries_mean'] - before['queries_mean']:+.2f}"
+                )
+            self.stdout.write(line)
+        if baseline:
+            self.stdout.write(f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('run_at')})")
@@ -0,0 +1,78 @@
+"""
+Django management command to benchmark SQLite write throughput
+Usage: python manage.py benchmark_sqlite_writes --students 16 --writes 10
+
+Runs the same concurrent level-completion workload against a throwaway
+database twice: once with the plain SQLite settings and once with the
+production profile (WAL, pragmas, IMMEDIATE transactions and serialized
+writes), and prints writes per second and failed writes for each.
+"""
+
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from levels.benchmark import percentile, run_writes, seed_school
+
+PROFILES = {
+    'default': ({}, False),
+    'production': (settings.SQLITE_PRODUCTION_OPTIONS, True),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent level-completion writes per second with and without the production SQLite profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=16, help='Concurrent writing students')
+        parser.add_argument('--writes', type=int, default=10, help='Levels each student completes')
+
+    def handle(self, *args, **options):
+        students = options['students']
+        writes = options['writes']
+        if students < 1 or writes < 1:
+            raise CommandError('--students and --writes must be at least 1')
+        if connection.vendor != 'sqlite':
+            raise CommandError('The write benchmark compares SQLite profiles; the default database is not SQLite')
+
+        original_options = connection.settings_dict.get('OPTIONS', {})
+        workdir = tempfile.mkdtemp(prefix='benchmark-writes-')
+        results = {}
+        try:
+            for profile, (profile_options, serialize) in PROFILES.items():
+                connection.settings_dict['OPTIONS'] = dict(profile_options)
+                connection.settings_dict['TEST'] = {
+                    **connection.settings_dict.get('TEST', {}),
+                    'NAME': os.path.join(workdir, f'{profile}.sqlite3'),
+                }
+                old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    seed_school(students=students, levels_per_group=writes)
+                    with override_settings(SQLITE_SERIALIZE_WRITES=serialize):
+                        results[profile] = run_writes(writes)
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+        finally:
+            connection.settings_dict['OPTIONS'] = original_options
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.stdout.write(f"{'profile':<12}{'writes':>8}{'failed':>8}{'writes/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        rates = {}
+        for profile, (latencies, failures, wall_seconds) in results.items():
+            rates[profile] = len(latencies) / wall_seconds if wall_seconds else 0
+            self.stdout.write(
+                f"{profile:<12}{len(latencies):>8}{len(failures):>8}{rates[profile]:>10.1f}"
+                f"{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}"
+            )
+            if failures:
+                self.stdout.write(f'  first failure: {failures[0]}')
+
+        message = f"Production profile: {rates['production']:.1f} writes/s against {rates['default']:.1f} writes/s"
+        if results['production'][1]:
+            self.stdout.write(self.style.WARNING(f"{message}, {len(results['production'][1])} failed writes"))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
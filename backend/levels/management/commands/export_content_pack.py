@@ -0,0 +1,43 @@
+"""
+Django management command to export the curriculum as a content pack
+Usage: python manage.py export_content_pack --pack-version 2025.10 --output curriculum.pack.gz
+
+The pack holds groups, levels, questions, vocabulary and grammar rules with
+a content hash per row; load it elsewhere with load_content_pack.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from levels.content_pack import dump_pack, export_pack, save_pack
+
+
+class Command(BaseCommand):
+    help = 'Export curriculum content as a versioned, compressed content pack'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pack-version', type=str, help='Version label for the pack')
+        parser.add_argument('--output', type=str, help='Path of the pack file to write')
+        parser.add_argument('--note', type=str, default='', help='Release note stored with the pack')
+        parser.add_argument('--store', action='store_true', help='Also keep the pack in the database for rollback')
+
+    def handle(self, *args, **options):
+        version = options['pack_version']
+        output = options['output']
+
+        if not version:
+            raise CommandError('--pack-version is required')
+        if not output and not options['store']:
+            raise CommandError('--output or --store is required')
+
+        pack = export_pack(version, note=options['note'])
+        data = dump_pack(pack)
+
+        if output:
+            with open(output, 'wb') as file:
+                file.write(data)
+            self.stdout.write(f'Wrote {output} ({len(data)} bytes)')
+        if options['store']:
+            save_pack(pack, data=data)
+            self.stdout.write(f'Stored content pack {version}')
+
+        counts = ', '.join(f'{len(rows)} {name}' for name, rows in pack['sections'].items())
+        self.stdout.write(self.style.SUCCESS(f'Exported content pack {version}: {counts}'))
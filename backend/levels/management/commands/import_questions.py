@@ -1,13 +1,15 @@
 """
 Django management command to import questions from CSV/JSON files
 Usage: python manage.py import_questions --file questions.csv --level 1
+
+Rows are upserted on (level, question_order), so a corrected file can be
+re-imported. Rows carrying a level_number (or level_id) column go to that
+level, which lets one file cover many levels; --level is then optional.
 """
 
-import csv
-import json
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-from levels.models import Level, Question
+from levels.models import Level
+from levels.importer import IMPORT_BATCH_SIZE, import_questions
 
 
 class Command(BaseCommand):
@@ -15,9 +17,10 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('--file', type=str, help='Path to the questions file (CSV or JSON)')
-        parser.add_argument('--level', type=int, help='Level ID to assign questions to')
+        parser.add_argument('--level', type=int, help='Level ID for rows without a level_number column')
         parser.add_argument('--format', type=str, choices=['csv', 'json'], default='csv', help='File format')
-        parser.add_argument('--dry-run', action='store_true', help='Show what would be imported without saving')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Rows per upsert batch')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report without saving')
 
     def handle(self, *args, **options):
         file_path = options['file']
@@ -25,101 +28,35 @@ class Command(BaseCommand):
         file_format = options['format']
         dry_run = options['dry_run']
 
-        if not file_path or not level_id:
-            raise CommandError('Both --file and --level are required')
-
-        try:
-            level = Level.objects.get(id=level_id)
-        except Level.DoesNotExist:
-            raise CommandError(f'Level with ID {level_id} does not exist')
-
-        self.stdout.write(f'Importing questions to Level: {level.name} (ID: {level.id})')
-
-        if file_format == 'csv':
-            questions_data = self.parse_csv(file_path)
-        else:
-            questions_data = self.parse_json(file_path)
+        if not file_path:
+            raise CommandError('--file is required')
 
-        if dry_run:
-            self.stdout.write(f'DRY RUN: Would import {len(questions_data)} questions')
-            for i, q in enumerate(questions_data[:3]):  # Show first 3
-                self.stdout.write(f'  {i+1}. {q["question_text"][:50]}...')
-            return
+        level = None
+        if level_id:
+            try:
+                level = Level.objects.get(id=level_id)
+            except Level.DoesNotExist:
+                raise CommandError(f'Level with ID {level_id} does not exist')
+            self.stdout.write(f'Importing questions to Level: {level.name} (ID: {level.id})')
 
-        imported_count = 0
-        with transaction.atomic():
-            for question_data in questions_data:
-                try:
-                    question = Question.objects.create(
-                        level=level,
-                        question_order=question_data.get('question_order', 1),
-                        question_type=question_data.get('question_type', 'mcq'),
-                        question_text=question_data['question_text'],
-                        options=question_data.get('options', ''),
-                        correct_answer=question_data['correct_answer'],
-                        hint=question_data.get('hint', ''),
-                        explanation=question_data.get('explanation', ''),
-                        difficulty=question_data.get('difficulty', 1),
-                        xp_value=question_data.get('xp_value', 10),
-                        time_limit_seconds=question_data.get('time_limit_seconds', 0),
-                        audio_url=question_data.get('audio_url', ''),
-                        image_url=question_data.get('image_url', ''),
-                        is_active=True
-                    )
-                    imported_count += 1
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f'Error importing question: {question_data.get("question_text", "Unknown")[:50]}... - {str(e)}')
-                    )
-
-        self.stdout.write(
-            self.style.SUCCESS(f'Successfully imported {imported_count} questions to Level: {level.name}')
-        )
-
-    def parse_csv(self, file_path):
-        """Parse CSV file and return list of question dictionaries"""
-        questions = []
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Clean and validate data
-                    question_data = {
-                        'question_order': int(row.get('question_order', 1)),
-                        'question_type': row.get('question_type', 'mcq'),
-                        'question_text': row['question_text'].strip(),
-                        'options': row.get('options', '').strip(),
-                        'correct_answer': row['correct_answer'].strip(),
-                        'hint': row.get('hint', '').strip(),
-                        'explanation': row.get('explanation', '').strip(),
-                        'difficulty': int(row.get('difficulty', 1)),
-                        'xp_value': int(row.get('xp_value', 10)),
-                        'time_limit_seconds': int(row.get('time_limit_seconds', 0)),
-                        'audio_url': row.get('audio_url', '').strip(),
-                        'image_url': row.get('image_url', '').strip(),
-                    }
-                    questions.append(question_data)
+            with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+                report = import_questions(
+                    file, file_format,
+                    default_level=level,
+                    batch_size=options['batch_size'],
+                    dry_run=dry_run,
+                )
         except FileNotFoundError:
             raise CommandError(f'File not found: {file_path}')
-        except Exception as e:
-            raise CommandError(f'Error reading CSV file: {str(e)}')
+        except ValueError as e:
+            raise CommandError(f'Error reading {file_format.upper()} file: {str(e)}')
 
-        return questions
+        for error in report['errors']:
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {error['error']}"))
 
-    def parse_json(self, file_path):
-        """Parse JSON file and return list of question dictionaries"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                if isinstance(data, list):
-                    return data
-                elif isinstance(data, dict) and 'questions' in data:
-                    return data['questions']
-                else:
-                    raise CommandError('JSON file must contain a list of questions or an object with "questions" key')
-        except FileNotFoundError:
-            raise CommandError(f'File not found: {file_path}')
-        except json.JSONDecodeError as e:
-            raise CommandError(f'Invalid JSON file: {str(e)}')
-        except Exception as e:
-            raise CommandError(f'Error reading JSON file: {str(e)}')
+        prefix = 'DRY RUN: Would import' if dry_run else 'Successfully imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {report['imported_count']} questions "
+            f"({report['created']} created, {report['updated']} updated, {report['error_count']} errors)"
+        ))
@@ -0,0 +1,56 @@
+"""
+Django management command to load a curriculum content pack
+Usage: python manage.py load_content_pack --file curriculum.pack.gz
+       python manage.py load_content_pack --pack-version 2025.09   (roll back to a stored pack)
+
+Only rows whose content hash differs from the database are written.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from levels.content_pack import load_pack, read_pack
+from levels.models import ContentPack
+
+
+class Command(BaseCommand):
+    help = 'Apply a content pack, writing only new and changed rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', type=str, help='Path to the pack file')
+        parser.add_argument('--pack-version', type=str, help='Re-apply a stored pack version')
+        parser.add_argument('--prune', action='store_true', help='Deactivate content that is not in the pack')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without saving')
+
+    def handle(self, *args, **options):
+        file_path = options['file']
+        version = options['pack_version']
+        dry_run = options['dry_run']
+
+        if bool(file_path) == bool(version):
+            raise CommandError('Pass exactly one of --file or --pack-version')
+
+        if file_path:
+            try:
+                with open(file_path, 'rb') as file:
+                    data = file.read()
+            except FileNotFoundError:
+                raise CommandError(f'File not found: {file_path}')
+        else:
+            try:
+                data = bytes(ContentPack.objects.get(version=version).data)
+            except ContentPack.DoesNotExist:
+                raise CommandError(f'Content pack {version} is not stored')
+
+        try:
+            pack = read_pack(data)
+            report = load_pack(pack, prune=options['prune'], dry_run=dry_run, data=data)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name, counts in report.items():
+            self.stdout.write(
+                f"{name}: {counts['created']} created, {counts['updated']} updated, "
+                f"{counts['deactivated']} deactivated, {counts['unchanged']} unchanged"
+            )
+
+        prefix = 'DRY RUN: Would apply' if dry_run else 'Applied'
+        self.stdout.write(self.style.SUCCESS(f"{prefix} content pack {pack['version']}"))
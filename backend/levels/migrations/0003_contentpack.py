@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0002_level_difficulty_score_level_grammar_points_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentPack',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(help_text='Pack version label', max_length=50, unique=True)),
+                ('content_hash', models.CharField(help_text='Hash over every row hash in the pack', max_length=64)),
+                ('note', models.CharField(blank=True, help_text='Release note', max_length=255)),
+                ('data', models.BinaryField(help_text='Compressed pack file')),
+                ('size_bytes', models.PositiveIntegerField(default=0, help_text='Compressed pack size')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('applied_at', models.DateTimeField(blank=True, help_text='When this pack was last loaded', null=True)),
+            ],
+            options={
+                'verbose_name': 'Content Pack',
+                'verbose_name_plural': 'Content Packs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
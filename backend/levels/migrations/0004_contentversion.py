@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0003_contentpack'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Content kind, e.g. levels or vocabulary', max_length=30, unique=True)),
+                ('version', models.CharField(help_text='Opaque token replaced on every change', max_length=32)),
+                ('updated_at', models.DateTimeField(help_text='When this content last changed')),
+            ],
+            options={
+                'verbose_name': 'Content Version',
+                'verbose_name_plural': 'Content Versions',
+                'ordering': ['kind'],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0004_contentversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='levelcompletion',
+            index=models.Index(fields=['user', 'completed_at', 'id'], name='levels_leve_user_id_35239c_idx'),
+        ),
+    ]
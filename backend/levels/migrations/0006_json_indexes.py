@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:40
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+from json_indexes import CreateGinIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0005_levelcompletion_cursor_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(django.db.models.functions.text.Lower('vocabulary_tested'), name='question_vocab_tested_idx'),
+        ),
+        CreateGinIndex('level', 'vocabulary_words', 'level_vocabulary_gin'),
+        CreateGinIndex('level', 'grammar_points', 'level_grammar_gin'),
+        CreateGinIndex('question', 'options', 'question_options_gin'),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Lower
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from users.models import User
 
 
@@ -127,8 +130,13 @@ class Level(models.Model):
     
     def get_questions_count(self):
         """Get number of questions in this level"""
-        if self.is_test_level:
-            return self.test_questions_count
+        return self.questions_count_for(self.is_test_level, self.test_questions_count)
+    
+    @staticmethod
+    def questions_count_for(is_test_level, test_questions_count):
+        """Question count from the two columns it depends on"""
+        if is_test_level:
+            return test_questions_count
         return 6  # Regular levels have exactly 6 questions
     
     def get_next_level(self):
@@ -152,6 +160,20 @@ class Level(models.Model):
             return None
 
 
+QUESTION_TYPE_NAMES = {
+    'mcq': 'Multiple Choice',
+    'text_to_speech': 'Pronunciation',
+    'fill_blank': 'Fill in the Blank',
+    'synonyms': 'Synonyms',
+    'antonyms': 'Antonyms',
+    'sentence_completion': 'Complete Sentence',
+    'listening': 'Listening',
+    'reading': 'Reading',
+    'writing': 'Writing',
+    'grammar': 'Grammar',
+}
+
+
 class Question(models.Model):
     """
     Questions within levels - Exactly 6 questions per regular level
@@ -298,26 +320,30 @@ class Question(models.Model):
             models.Index(fields=['question_type']),
             models.Index(fields=['difficulty']),
             models.Index(fields=['is_active']),
+            models.Index(Lower('vocabulary_tested'), name='question_vocab_tested_idx'),
         ]
     
     def __str__(self):
         return f"Q{self.question_order}: {self.question_text[:50]}..."
     
+    @classmethod
+    def testing_word(cls, word):
+        """Questions tagged with a vocabulary word, case-insensitively (expression-indexed)"""
+        return cls.objects.alias(vocabulary=Lower('vocabulary_tested')).filter(vocabulary=word.lower())
+    
+    @classmethod
+    def offering_option(cls, option):
+        """Questions that list a value among their options, e.g. as a distractor"""
+        return cls.objects.filter(options__has_element=option)
+    
     def get_question_type_display_name(self):
         """Get user-friendly question type name"""
-        type_names = {
-            'mcq': 'Multiple Choice',
-            'text_to_speech': 'Pronunciation',
-            'fill_blank': 'Fill in the Blank',
-            'synonyms': 'Synonyms',
-            'antonyms': 'Antonyms',
-            'sentence_completion': 'Complete Sentence',
-            'listening': 'Listening',
-            'reading': 'Reading',
-            'writing': 'Writing',
-            'grammar': 'Grammar',
-        }
-        return type_names.get(self.question_type, self.question_type)
+        return self.type_display_name(self.question_type)
+    
+    @staticmethod
+    def type_display_name(question_type):
+        """User-friendly name for a question type value"""
+        return QUESTION_TYPE_NAMES.get(question_type, question_type)
     
     def validate_answer(self, user_answer):
         """Validate user's answer based on question type"""
@@ -444,6 +470,7 @@ class LevelCompletion(models.Model):
         indexes = [
             models.Index(fields=['user', 'level']),
             models.Index(fields=['completed_at']),
+            models.Index(fields=['user', 'completed_at', 'id']),
             models.Index(fields=['passed']),
         ]
     
@@ -469,4 +496,54 @@ class LevelCompletion(models.Model):
         """Override save to calculate percentage and pass status"""
         self.percentage = self.calculate_percentage()
         self.passed = self.check_pass_status()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class ContentPack(models.Model):
+    """
+    A versioned curriculum content pack, kept so it can be re-applied
+    """
+    version = models.CharField(max_length=50, unique=True, help_text="Pack version label")
+    content_hash = models.CharField(max_length=64, help_text="Hash over every row hash in the pack")
+    note = models.CharField(max_length=255, blank=True, help_text="Release note")
+    data = models.BinaryField(help_text="Compressed pack file")
+    size_bytes = models.PositiveIntegerField(default=0, help_text="Compressed pack size")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    applied_at = models.DateTimeField(null=True, blank=True, help_text="When this pack was last loaded")
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Content Pack'
+        verbose_name_plural = 'Content Packs'
+    
+    def __str__(self):
+        return f"Content pack {self.version}"
+
+
+class ContentVersion(models.Model):
+    """
+    Current version of one kind of curriculum content, bumped on every change
+    """
+    kind = models.CharField(max_length=30, unique=True, help_text="Content kind, e.g. levels or vocabulary")
+    version = models.CharField(max_length=32, help_text="Opaque token replaced on every change")
+    updated_at = models.DateTimeField(help_text="When this content last changed")
+    
+    class Meta:
+        ordering = ['kind']
+        verbose_name = 'Content Version'
+        verbose_name_plural = 'Content Versions'
+    
+    def __str__(self):
+        return f"{self.kind} @ {self.version}"
+
+
+# Level pages embed their questions and neighbours, so any level or
+# question edit moves the shared "levels" version
+@receiver(post_save, sender=Level)
+@receiver(post_delete, sender=Level)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def bump_levels_version(sender, instance, **kwargs):
+    """Invalidate cached level and question responses"""
+    from .versions import bump_content_versions
+    bump_content_versions('levels')
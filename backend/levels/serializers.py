@@ -1,4 +1,7 @@
+from bisect import bisect_left, bisect_right
+
 from rest_framework import serializers
+from fast_serializers import FastRows
 from .models import Level, Question, LevelCompletion
 
 
@@ -60,6 +63,56 @@ class LevelSerializer(serializers.ModelSerializer):
         return None
 
 
+# Fast paths for the student-facing lists; output matches the serializers above
+question_rows = FastRows(QuestionSerializer, computed={
+    'question_type_display': (('question_type',), Question.type_display_name),
+})
+
+level_rows = FastRows(
+    LevelSerializer,
+    computed={
+        'questions_count': (('is_test_level', 'test_questions_count'), Level.questions_count_for),
+    },
+    deferred=('questions', 'next_level', 'previous_level'),
+)
+
+
+def _level_link(row):
+    level_id, level_number, name, is_unlocked = row
+    return {'id': level_id, 'level_number': level_number, 'name': name, 'is_unlocked': is_unlocked}
+
+
+def serialize_levels(rows):
+    """
+    LevelSerializer(many=True).data for rows from level_rows.values(), with
+    the questions of every level and the neighbouring active levels loaded
+    in two queries instead of three per level
+    """
+    levels = level_rows.serialize(rows)
+    if not levels:
+        return levels
+
+    questions = question_rows.serialize_grouped(question_rows.values(
+        Question.objects.filter(level_id__in=[level['id'] for level in levels])
+        .order_by('level_id', 'question_order'),
+        'level_id',
+    ))
+    active = list(
+        Level.objects.filter(is_active=True).order_by('level_number')
+        .values_list('id', 'level_number', 'name', 'is_unlocked')
+    )
+    numbers = [row[1] for row in active]
+
+    for level in levels:
+        number = level['level_number']
+        following = bisect_right(numbers, number)
+        preceding = bisect_left(numbers, number) - 1
+        level['questions'] = questions.get(level['id'], [])
+        level['next_level'] = _level_link(active[following]) if following < len(active) else None
+        level['previous_level'] = _level_link(active[preceding]) if preceding >= 0 else None
+    return levels
+
+
 class LevelCompletionSerializer(serializers.ModelSerializer):
     """Serializer for level completions"""
     level_name = serializers.CharField(source='level.name', read_only=True)
@@ -1,3 +1,373 @@
+import gzip
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Sum
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from fast_serializers import FastJSONRenderer
+from grammar.models import GrammarRule
+from groups.models import Group, GroupProgress
+from groups.serializers import GroupSerializer
+from groups.views import group_list_rows
+from progress.models import QuestionProgress, XPTransaction
+from users.serializers import UserSerializer, user_rows
+from vocabulary.models import Vocabulary
+from .content_pack import dump_pack, export_pack, load_pack, read_pack, row_hash
+from .importer import ImportAborted, import_questions, iter_json_rows
+from .models import ContentPack, ContentVersion, Level, Question
+from .serializers import (
+    LevelSerializer, QuestionSerializer, level_rows, question_rows, serialize_levels
+)
+
+User = get_user_model()
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+class FastSerializerTests(TestCase):
+    """The fast paths must render the same bytes as the DRF serializers they replace"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='fast_student', email='fast@example.com', password='pass12345',
+            role='student', first_name='Zoë', last_name='\u2028Línea',
+        )
+        cls.groups = [
+            Group.objects.create(group_number=number, name=f'Group {number}', description='Ünïcode')
+            for number in (1, 2)
+        ]
+        cls.levels = []
+        for number in range(1, 13):
+            level = Level.objects.create(
+                group=cls.groups[0] if number <= 6 else cls.groups[1],
+                level_number=number, name=f'Level {number}', difficulty=number % 5 + 1,
+                is_active=number != 4, is_unlocked=number % 3 != 0,
+            )
+            cls.levels.append(level)
+            for order in range(1, 4):
+                Question.objects.create(
+                    level=level, question_order=order,
+                    question_type=['mcq', 'fill_blank', 'unknown'][order - 1],
+                    question_text=f'Q{order} of level {number} "quoted" \\ slash',
+                    options=['A', 'B', {'nested': [1, 2.5, None]}] if order != 2 else None,
+                    correct_answer='A', audio_url=None if order == 1 else 'https://example.com/a.mp3',
+                    hint='', explanation='Because…', is_active=order != 3,
+                )
+
+    def assertSameJSON(self, fast, slow):
+        self.assertEqual(render(fast), render(slow))
+        self.assertEqual(FastJSONRenderer().render(fast), render(slow))
+
+    def test_questions_match_serializer(self):
+        queryset = Question.objects.all()
+        self.assertSameJSON(
+            question_rows.serialize(question_rows.values(queryset)),
+            QuestionSerializer(queryset, many=True).data,
+        )
+
+    def test_levels_match_serializer(self):
+        queryset = Level.objects.filter(is_active=True).prefetch_related('questions')
+        self.assertSameJSON(
+            serialize_levels(level_rows.values(queryset)),
+            LevelSerializer(queryset, many=True).data,
+        )
+
+    def test_levels_use_fixed_number_of_queries(self):
+        queryset = Level.objects.all()
+        with self.assertNumQueries(3):
+            serialize_levels(level_rows.values(queryset))
+
+    def test_group_list_matches_view_defaults(self):
+        groups = list(Group.objects.filter(is_active=True).order_by('group_number'))
+        for group in groups:
+            group.completion_percentage = 0
+            group.levels_completed = 0
+            group.total_levels = group.levels.count()
+            group.xp_earned = 0
+            group.is_unlocked = group.group_number <= 1
+        rows = group_list_rows.values(
+            Group.objects.filter(is_active=True).annotate(total_levels=Count('levels')).order_by('group_number')
+        )
+        self.assertSameJSON(group_list_rows.serialize(rows), GroupSerializer(groups, many=True).data)
+
+    def test_users_match_serializer(self):
+        queryset = User.objects.all()
+        self.assertSameJSON(
+            user_rows.serialize(user_rows.values(queryset)),
+            UserSerializer(queryset, many=True).data,
+        )
+
+    def test_renderer_matches_json_renderer(self):
+        data = {'text': 'a\u2028b\u2029c\x01é"\\', 'float': 83.97, 'none': None, 1: [True, False]}
+        self.assertEqual(FastJSONRenderer().render(data), render(data))
+
+    def test_group_levels_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/groups/2/levels/')
+        self.assertEqual(response.status_code, 200)
+        levels = json.loads(response.content)['results']
+        self.assertEqual([level['level_number'] for level in levels], [7, 8, 9, 10, 11, 12])
+        self.assertFalse(any(level['is_unlocked'] for level in levels))
+        self.assertEqual(levels[0]['previous_level']['level_number'], 6)
+        self.assertIsNone(levels[-1]['next_level'])
+        self.assertEqual(len(levels[0]['questions']), 3)
+
+
+class JSONLookupTests(TestCase):
+    """Indexed lookups into the content and answer JSON fields"""
+
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(group_number=1, name='Group 1')
+        cls.level = Level.objects.create(
+            group=group, level_number=1, name='Fruit',
+            vocabulary_words=['apple', 'pear'], grammar_points=['past simple'],
+        )
+        Level.objects.create(group=group, level_number=2, name='Other', vocabulary_words=['Apple'])
+        cls.question = Question.objects.create(
+            level=cls.level, question_order=1, question_type='mcq', question_text='Pick the fruit',
+            options=['apple', 'pear', 3], correct_answer='apple', vocabulary_tested='Apple',
+        )
+        Question.objects.create(
+            level=cls.level, question_order=2, question_type='mcq', question_text='Pick a number',
+            options={'a': 'pear'}, correct_answer=3,
+        )
+        for number, answer in enumerate(['pear', 'pear', 3, 'apple']):
+            QuestionProgress.objects.create(
+                user=User.objects.create(username=f'json_student_{number}'), question=cls.question,
+                user_answer=answer, is_correct=answer == 'apple',
+            )
+
+    def test_has_element_matches_array_members(self):
+        self.assertEqual(list(Level.objects.filter(vocabulary_words__has_element='apple')), [self.level])
+        self.assertEqual(list(Level.objects.filter(grammar_points__has_element='past simple')), [self.level])
+        self.assertEqual(list(Question.offering_option(3)), [self.question])
+        self.assertEqual(list(Question.offering_option('pear')), [self.question])
+
+    def test_questions_testing_word_ignore_case(self):
+        self.assertEqual(list(Question.testing_word('APPLE')), [self.question])
+        self.assertFalse(Question.testing_word('pear').exists())
+
+    def test_wrong_answers_by_value(self):
+        self.assertEqual(QuestionProgress.wrong_answers(self.question, 'pear').count(), 2)
+        self.assertEqual(QuestionProgress.wrong_answers(self.question, 'apple').count(), 0)
+        self.assertEqual(
+            list(QuestionProgress.wrong_answer_counts(self.question)),
+            [{'user_answer': 'pear', 'count': 2}, {'user_answer': 3, 'count': 1}],
+        )
+
+
+class QuestionImportTests(TestCase):
+    """Streaming JSON import"""
+
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(group_number=1, name='Group 1')
+        cls.level = Level.objects.create(group=group, level_number=1, name='Level 1')
+
+    def rows(self, count):
+        return [
+            {'question_order': order, 'question_text': f'Q{order}', 'correct_answer': 'A', 'options': ['A', 'B']}
+            for order in range(1, count + 1)
+        ]
+
+    def test_wrapper_with_other_arrays_before_questions(self):
+        text = json.dumps({'tags': ['a', 'b'], 'meta': {'sets': [[1], [2]]}, 'questions': self.rows(40)})
+        rows = list(iter_json_rows(io.StringIO(text), chunk_size=64))
+        self.assertEqual([row['question_order'] for _, row in rows], list(range(1, 41)))
+
+    def test_unreadable_file_reports_rows_already_imported(self):
+        text = json.dumps(self.rows(5))[:-1] + ', {"question_text": '
+        with self.assertRaises(ImportAborted) as aborted:
+            import_questions(io.StringIO(text), 'json', default_level=self.level, batch_size=2)
+        self.assertEqual(aborted.exception.report['imported_count'], 4)
+        self.assertEqual(Question.objects.filter(level=self.level).count(), 4)
+
+
+class CompleteLevelTests(TestCase):
+    """Cached XP totals must match the ledger however completions interleave"""
+
+    def setUp(self):
+        self.group = Group.objects.create(group_number=1, name='Group 1')
+        self.levels = [
+            Level.objects.create(group=self.group, level_number=number, name=f'Level {number}', xp_reward=xp)
+            for number, xp in ((1, 10), (2, 20), (3, 30), (4, 40))
+        ]
+        self.user = User.objects.create_user(username='racer', password='pass12345', role='student')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def complete(self, level):
+        return self.client.post('/api/levels/complete-level/', {
+            'level': level.pk, 'score': 6, 'total_questions': 6, 'correct_answers': 6,
+            'time_taken_seconds': 120, 'started_at': timezone.now().isoformat(), 'user_answers': {},
+        }, format='json')
+
+    def test_stale_group_progress_does_not_overwrite_credited_xp(self):
+        # The second request reads its GroupProgress before the first one
+        # credits XP, and saves it after
+        stale = GroupProgress.objects.create(user=self.user, group=self.group)
+        self.assertEqual(self.complete(self.levels[0]).status_code, 201)
+        with mock.patch.object(GroupProgress.objects, 'get_or_create', return_value=(stale, False)):
+            self.assertEqual(self.complete(self.levels[1]).status_code, 201)
+
+        ledger = XPTransaction.objects.filter(user=self.user, group=self.group).aggregate(total=Sum('amount'))['total']
+        progress = GroupProgress.objects.get(user=self.user, group=self.group)
+        self.assertEqual(ledger, 30)
+        self.assertEqual(progress.total_xp_earned, ledger)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_xp, ledger)
+
+    def test_group_completion_keeps_credited_xp(self):
+        for level in self.levels:
+            self.assertEqual(self.complete(level).status_code, 201)
+
+        progress = GroupProgress.objects.get(user=self.user, group=self.group)
+        self.assertTrue(progress.is_completed)
+        self.assertEqual(progress.total_xp_earned, 100)
+
+
+class ContentPackTests(TestCase):
+    """Packs round-trip through an empty database and reload only what changed"""
+
+    def setUp(self):
+        for group_number in (1, 2):
+            group = Group.objects.create(group_number=group_number, name=f'Group {group_number}')
+            for offset in (1, 2):
+                level = Level.objects.create(
+                    group=group, level_number=group_number * 10 + offset, name=f'Level {offset}',
+                    vocabulary_words=['apple'], grammar_points=['Present simple'],
+                )
+                for order in (1, 2, 3):
+                    Question.objects.create(
+                        level=level, question_order=order, question_type='mcq', question_text=f'Q{order}',
+                        options=['A', 'B'], correct_answer='A', distractor_analysis={'B': 'Not A'},
+                    )
+        Vocabulary.objects.create(word='apple', translation_urdu='سیب', definition='A fruit')
+        GrammarRule.objects.create(name='Present simple', description='Habits and facts')
+
+    def clear_content(self):
+        Group.objects.all().delete()
+        Vocabulary.objects.all().delete()
+        GrammarRule.objects.all().delete()
+
+    def counts(self, report, key):
+        return {name: counts[key] for name, counts in report.items()}
+
+    def test_round_trip(self):
+        pack = read_pack(dump_pack(export_pack('2026.1')))
+        self.clear_content()
+
+        report = load_pack(pack)
+        self.assertEqual(
+            self.counts(report, 'created'),
+            {'groups': 2, 'levels': 4, 'questions': 12, 'vocabulary': 1, 'grammar_rules': 1},
+        )
+        self.assertEqual(export_pack('2026.1')['content_hash'], pack['content_hash'])
+        self.assertIsNotNone(ContentPack.objects.get(version='2026.1').applied_at)
+
+        versions = dict(ContentVersion.objects.values_list('kind', 'version'))
+        report = load_pack(pack)
+        self.assertEqual(set(self.counts(report, 'created').values()), {0})
+        self.assertEqual(set(self.counts(report, 'updated').values()), {0})
+        self.assertEqual(self.counts(report, 'unchanged')['questions'], 12)
+        # Nothing changed, so cached curriculum responses stay valid
+        self.assertEqual(dict(ContentVersion.objects.values_list('kind', 'version')), versions)
+
+    def test_edited_row_is_the_only_update(self):
+        pack = export_pack('2026.2')
+        record = next(record for record in pack['sections']['questions'] if record['key'] == [21, 2])
+        record['fields']['question_text'] = 'Q2, reworded'
+        record['hash'] = row_hash(record['fields'])
+        untouched = dict(Question.objects.values_list('pk', 'updated_at'))
+
+        report = load_pack(pack)
+        self.assertEqual(
+            self.counts(report, 'updated'),
+            {'groups': 0, 'levels': 0, 'questions': 1, 'vocabulary': 0, 'grammar_rules': 0},
+        )
+        edited = Question.objects.get(level__level_number=21, question_order=2)
+        self.assertEqual(edited.question_text, 'Q2, reworded')
+        changed = [pk for pk, updated_at in Question.objects.values_list('pk', 'updated_at') if untouched[pk] != updated_at]
+        self.assertEqual(changed, [edited.pk])
+
+    def test_prune_deactivates_rows_missing_from_the_pack(self):
+        pack = export_pack('2026.3')
+        pack['sections']['vocabulary'] = []
+
+        report = load_pack(pack, prune=True)
+        self.assertEqual(report['vocabulary']['deactivated'], 1)
+        self.assertFalse(Vocabulary.objects.get(word='apple').is_active)
+
+
+class ConditionalGetTests(TestCase):
+    """Curriculum reads and group bundles revalidate against content versions"""
+
+    def setUp(self):
+        self.group = Group.objects.create(group_number=1, name='Group 1')
+        self.level = Level.objects.create(group=self.group, level_number=1, name='Level 1', vocabulary_words=['apple'])
+        self.other_level = Level.objects.create(group=self.group, level_number=2, name='Level 2')
+        Question.objects.create(level=self.level, question_order=1, question_type='mcq', question_text='Q1', correct_answer='A')
+        for word in ('apple', 'banana'):
+            Vocabulary.objects.create(word=word, definition=f'A {word}')
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='reader', password='pass12345'))
+
+    def test_group_levels_revalidation(self):
+        url = '/api/groups/1/levels/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'"stale", W/{etag}').status_code, 304)
+
+        self.level.name = 'Level 1, renamed'
+        self.level.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_bundle_revalidation(self):
+        url = '/api/groups/1/bundle/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Vocabulary.objects.create(word='cherry')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_delta_carries_newly_referenced_content(self):
+        version = json.loads(self.client.get('/api/groups/1/bundle/').content)['version']
+        self.level.vocabulary_words = ['apple', 'banana']
+        self.level.save()
+
+        delta = json.loads(self.client.get(f'/api/groups/1/bundle/?since={version}').content)
+        self.assertFalse(delta['full'])
+        self.assertEqual([level['level_number'] for level in delta['levels']], [1])
+        self.assertEqual([question['question_text'] for question in delta['questions']], ['Q1'])
+        # banana is unchanged, but the device has never needed it before
+        self.assertEqual({word['word'] for word in delta['vocabulary']}, {'apple', 'banana'})
+        self.assertEqual(len(delta['level_ids']), 2)
+
+    def test_bundle_encodings(self):
+        url = '/api/groups/1/bundle/'
+        plain = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        packed = self.client.get(url, HTTP_ACCEPT_ENCODING='br, gzip;q=0.5')
+        self.assertEqual(packed['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(packed.content)), json.loads(plain.content))
+        self.assertNotEqual(packed['ETag'], plain['ETag'])
 
-# Create your tests here.
+        # A gzip ETag does not validate the identity representation
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=packed['ETag']).status_code, 200)
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=packed['ETag'], HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn('Accept-Encoding', not_modified['Vary'])
@@ -0,0 +1,89 @@
+"""
+Content versions for the curriculum read endpoints
+Each kind of content (groups, levels, vocabulary, grammar) has one row in
+ContentVersion whose token changes whenever that content is edited. Views
+derive their ETag and Last-Modified from those rows, so a revalidation
+costs a single indexed lookup and a 304 skips the queryset and serializer.
+"""
+
+import hashlib
+import uuid
+
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from .models import ContentVersion
+
+CONTENT_KINDS = ('groups', 'levels', 'vocabulary', 'grammar')
+
+
+def bump_content_versions(*kinds):
+    """Give each kind a new version token with one upsert"""
+    now = timezone.now()
+    ContentVersion.objects.bulk_create(
+        [ContentVersion(kind=kind, version=uuid.uuid4().hex, updated_at=now) for kind in kinds],
+        update_conflicts=True,
+        unique_fields=['kind'],
+        update_fields=['version', 'updated_at'],
+    )
+
+
+def get_content_versions(kinds):
+    """Map each kind to its (version, updated_at) row"""
+    return {
+        kind: (version, updated_at)
+        for kind, version, updated_at in ContentVersion.objects.filter(kind__in=kinds).values_list(
+            'kind', 'version', 'updated_at'
+        )
+    }
+
+
+def content_etag(request, kinds, versions):
+    """ETag for one URL (path and query) at the current content versions"""
+    parts = [request.get_full_path()]
+    parts.extend(f'{kind}={versions.get(kind, ("", None))[0]}' for kind in kinds)
+    return '"%s"' % hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32]
+
+
+def etag_matches(request, etag):
+    """Whether If-None-Match lists etag (weak comparison, so W/ is ignored) or is *"""
+    tags = parse_etags(request.headers.get('If-None-Match', ''))
+    if tags == ['*']:
+        return True
+    return etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in tags}
+
+
+def is_not_modified(request, etag, last_modified):
+    """Conditional GET check; If-None-Match wins over If-Modified-Since"""
+    if request.headers.get('If-None-Match'):
+        return etag_matches(request, etag)
+
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return bool(
+        if_modified_since and last_modified and int(last_modified.timestamp()) <= if_modified_since
+    )
+
+
+class ContentVersionMixin:
+    """Adds ETag/Last-Modified validation to a read-only curriculum view"""
+    content_kinds = ()
+
+    def get(self, request, *args, **kwargs):
+        versions = get_content_versions(self.content_kinds)
+        etag = content_etag(request, self.content_kinds, versions)
+        modified = [updated_at for _, updated_at in versions.values()]
+        last_modified = max(modified) if modified else None
+
+        if is_not_modified(request, etag, last_modified):
+            response = HttpResponseNotModified()
+        else:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -1,5 +1,5 @@
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from django.db.models import Q, Avg, Count, Sum
@@ -7,15 +7,21 @@ from django.utils import timezone
 from .models import Level, Question, LevelCompletion
 from .serializers import (
     LevelSerializer, QuestionSerializer, LevelCompletionSerializer,
-    LevelCompletionCreateSerializer, LevelStatsSerializer
+    LevelCompletionCreateSerializer, LevelStatsSerializer,
+    level_rows, question_rows, serialize_levels
 )
 from cache_utils import cache_level_data, cache_api_response
+from englishmaster.sqlite import serialized_write
+from fast_serializers import FastListMixin
+from pagination import KeysetPagination
+from .versions import ContentVersionMixin
 
 
-class LevelListView(generics.ListAPIView):
+class LevelListView(FastListMixin, generics.ListAPIView):
     """List all levels with pagination and filtering"""
     queryset = Level.objects.filter(is_active=True).prefetch_related('questions')
     serializer_class = LevelSerializer
+    fast_rows = level_rows
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -37,20 +43,34 @@ class LevelListView(generics.ListAPIView):
         if is_unlocked is not None:
             queryset = queryset.filter(is_unlocked=is_unlocked.lower() == 'true')
         
+        # Filter by taught vocabulary word or grammar point (GIN-indexed on Postgres)
+        vocabulary_word = self.request.query_params.get('vocabulary_word')
+        if vocabulary_word:
+            queryset = queryset.filter(vocabulary_words__has_element=vocabulary_word)
+        grammar_point = self.request.query_params.get('grammar_point')
+        if grammar_point:
+            queryset = queryset.filter(grammar_points__has_element=grammar_point)
+        
         return queryset
+    
+    def serialize_rows(self, rows):
+        return serialize_levels(rows)
 
 
-class LevelDetailView(generics.RetrieveAPIView):
+class LevelDetailView(ContentVersionMixin, generics.RetrieveAPIView):
     """Get specific level details"""
+    content_kinds = ('levels',)
     queryset = Level.objects.filter(is_active=True).prefetch_related('questions')
     serializer_class = LevelSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'level_number'
 
 
-class LevelQuestionsView(generics.ListAPIView):
+class LevelQuestionsView(ContentVersionMixin, FastListMixin, generics.ListAPIView):
     """Get questions for a specific level"""
+    content_kinds = ('levels',)
     serializer_class = QuestionSerializer
+    fast_rows = question_rows
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -71,6 +91,7 @@ class QuestionDetailView(generics.RetrieveAPIView):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@serialized_write
 def submit_answer(request):
     """Submit answer for a question"""
     question_id = request.data.get('question_id')
@@ -109,11 +130,10 @@ def submit_answer(request):
             question_progress.xp_earned = question.xp_value if is_correct else 0
             question_progress.save()
         
-        # Update user's total XP if answer is correct
+        # Credit XP through the ledger, once per question
         if is_correct:
-            user = request.user
-            user.total_xp += question.xp_value
-            user.save()
+            from progress.xp import award_xp
+            award_xp(request.user, question.xp_value, 'question', question.id)
         
         return Response({
             'is_correct': is_correct,
@@ -132,17 +152,14 @@ def submit_answer(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@serialized_write
 def complete_level(request):
     """Complete a level and record progress"""
     serializer = LevelCompletionCreateSerializer(data=request.data, context={'request': request})
     
     if serializer.is_valid():
         completion = serializer.save()
-        
-        # Update user's total XP
         user = request.user
-        user.total_xp += completion.xp_earned
-        user.save()
         
         # Update LevelProgress for this user and level
         from progress.models import LevelProgress
@@ -171,11 +188,15 @@ def complete_level(request):
             level_progress.time_spent = completion.time_taken_seconds
             level_progress.completed_at = completion.completed_at
             level_progress.daily_level_completed = completion.passed
-            level_progress.save()
+            level_progress.save(update_fields=[
+                'is_completed', 'completion_percentage', 'questions_answered', 'correct_answers',
+                'xp_earned', 'time_spent', 'completed_at', 'daily_level_completed', 'last_attempted',
+            ])
         
         # Update group progress
         from groups.models import GroupProgress
         group = completion.level.group
+        next_group = None
         group_progress, created = GroupProgress.objects.get_or_create(
             user=user,
             group=group
@@ -183,7 +204,6 @@ def complete_level(request):
         
         if completion.passed:
             group_progress.levels_completed += 1
-            group_progress.total_xp_earned += completion.xp_earned
             group_progress.time_spent_minutes += completion.time_taken_seconds // 60
             group_progress.last_accessed_at = timezone.now()
             
@@ -205,31 +225,21 @@ def complete_level(request):
                         )
                         next_group_progress.unlock_group()
             
-            group_progress.save()
+            # total_xp_earned is left out: other requests bump it with F()
+            # while this row is in hand, and a full save would undo them
+            group_progress.save(update_fields=[
+                'levels_completed', 'time_spent_minutes', 'last_accessed_at',
+                'completion_percentage', 'updated_at',
+            ])
         
-        # Update daily progress
-        from progress.models import DailyProgress
-        today = timezone.now().date()
-        daily_progress, created = DailyProgress.objects.get_or_create(
-            user=user,
-            date=today,
-            defaults={
-                'levels_completed': 1 if completion.passed else 0,
-                'questions_answered': completion.total_questions,
-                'correct_answers': completion.correct_answers,
-                'xp_earned': completion.xp_earned,
-                'time_spent': completion.time_taken_seconds // 60,
-                'streak_maintained': True
-            }
-        )
+        # Daily progress is updated by a task worker after the response
+        from progress.tasks import record_daily_completion
+        record_daily_completion.enqueue(completion.id)
         
-        if not created and completion.passed:
-            daily_progress.levels_completed += 1
-            daily_progress.questions_answered += completion.total_questions
-            daily_progress.correct_answers += completion.correct_answers
-            daily_progress.xp_earned += completion.xp_earned
-            daily_progress.time_spent += completion.time_taken_seconds // 60
-            daily_progress.save()
+        # The saves above name their fields, so this F() increment of the
+        # cached totals survives them and concurrent completions alike
+        from progress.xp import award_xp
+        award_xp(user, completion.xp_earned, 'level', completion.level_id, group_id=group.id)
         
         return Response({
             'success': True,
@@ -248,6 +258,8 @@ class LevelCompletionListView(generics.ListAPIView):
     """List user's level completions"""
     serializer_class = LevelCompletionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-completed_at', '-id')
     
     def get_queryset(self):
         return LevelCompletion.objects.filter(user=self.request.user).order_by('-completed_at')
@@ -356,8 +368,7 @@ def get_test_levels(request):
         is_test_level=True
     ).order_by('level_number')
     
-    serializer = LevelSerializer(test_levels, many=True)
-    return Response(serializer.data)
+    return Response(serialize_levels(level_rows.values(test_levels)))
 
 
 class LevelViewSet(ModelViewSet):
@@ -379,4 +390,44 @@ class QuestionViewSet(ModelViewSet):
     filterset_fields = ['question_type', 'difficulty', 'is_active', 'level']
     search_fields = ['question_text']
     ordering_fields = ['question_order', 'difficulty', 'created_at']
-    ordering = ['level', 'question_order']
\ No newline at end of file
+    ordering = ['level', 'question_order']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        vocabulary_word = self.request.query_params.get('vocabulary_word')
+        if vocabulary_word:
+            queryset = queryset & Question.testing_word(vocabulary_word)
+        option = self.request.query_params.get('option')
+        if option:
+            queryset = queryset & Question.offering_option(option)
+        return queryset
+    
+    @action(detail=True, methods=['get'], url_path='wrong-answers')
+    def wrong_answers(self, request, pk=None):
+        """Wrong answer counts per answer, or with ?answer= the students who gave that answer"""
+        from progress.models import QuestionProgress
+        question = self.get_object()
+        answer = request.query_params.get('answer')
+        if answer is None:
+            return Response({
+                'question_id': question.id,
+                'correct_answer': question.correct_answer,
+                'wrong_answers': [
+                    {'answer': row['user_answer'], 'count': row['count']}
+                    for row in QuestionProgress.wrong_answer_counts(question)
+                ],
+            })
+        students = QuestionProgress.wrong_answers(question, answer).values(
+            'user_id', 'user__username', 'attempts', 'answered_at'
+        ).order_by('-answered_at')
+        return Response({
+            'question_id': question.id,
+            'answer': answer,
+            'students': [
+                {
+                    'user_id': row['user_id'], 'username': row['user__username'],
+                    'attempts': row['attempts'], 'answered_at': row['answered_at'],
+                }
+                for row in students
+            ],
+        })
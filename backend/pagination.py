@@ -0,0 +1,114 @@
+"""
+Keyset pagination for history lists
+Page-number pagination runs COUNT(*) plus OFFSET, which both slow down as
+history grows, and pages drift when rows are inserted between requests.
+KeysetPagination keeps the page-number behaviour by default and switches to
+a cursor keyed on (timestamp, id) when the client asks for it with
+?pagination=cursor or passes a ?cursor= token; the cursor response carries
+"has_more" instead of a total count.
+"""
+
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page numbers by default, keyset cursor on request. Views declare the
+    cursor order as ``cursor_ordering = ('-<timestamp field>', '-id')``.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    invalid_cursor_message = 'Invalid cursor'
+
+    def use_cursor(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == 'cursor'
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, 'cursor_ordering', None)
+        self.cursor_mode = bool(ordering) and self.use_cursor(request)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.time_field, self.id_field = (field.lstrip('-') for field in ordering)
+        self.descending = ordering[0].startswith('-')
+
+        queryset = queryset.order_by(*ordering)
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+        if position:
+            moment, pk = position
+            before = 'lt' if self.descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.time_field}__{before}': moment})
+                | Q(**{self.time_field: moment, f'{self.id_field}__{before}': pk})
+            )
+
+        # One extra row tells us whether another page exists, without COUNT(*)
+        rows = list(queryset[:self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        self.page_rows = rows[:self.page_size]
+        return self.page_rows
+
+    def decode_cursor(self, token):
+        if not token:
+            return None
+        try:
+            moment, pk = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+            moment = parse_datetime(moment)
+            if moment is None:
+                raise ValueError
+            return moment, int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        moment = getattr(row, self.time_field)
+        position = json.dumps([moment.isoformat(), getattr(row, self.id_field)])
+        return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_more:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page_rows[-1]))
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('has_more', self.has_more),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_paginated_response_schema(schema)
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'has_more': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
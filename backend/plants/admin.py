@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import PlantType, PlantStage, UserPlant, PlantCareLog
+from .models import PlantType, PlantStage, UserPlant, PlantCareLog, PlantDecayRun
 
 
 class PlantStageInline(admin.TabularInline):
@@ -135,4 +135,11 @@ class PlantCareLogAdmin(admin.ModelAdmin):
     )
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user_plant__user', 'user_plant__plant_type')
\ No newline at end of file
+        return super().get_queryset(request).select_related('user_plant__user', 'user_plant__plant_type')
+
+
+@admin.register(PlantDecayRun)
+class PlantDecayRunAdmin(admin.ModelAdmin):
+    list_display = ('date', 'plants_decayed', 'plants_cared', 'processed_at')
+    ordering = ('-date',)
+    readonly_fields = ('date', 'plants_decayed', 'plants_cared', 'processed_at')
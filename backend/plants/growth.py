@@ -0,0 +1,144 @@
+"""
+Precomputed plant growth rules
+Stage thresholds are loaded once per PlantType and kept in memory,
+so stage advancement and progress lookups never query PlantStage.
+Stage edits bump the 'plant_stages' ContentVersion row; each process
+checks it every STAGE_TABLE_CHECK_SECONDS and drops its tables when it
+has changed, so edits made in another process are picked up too.
+"""
+
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from threading import Lock
+from typing import NamedTuple, Optional, Tuple
+
+
+class StageRow(NamedTuple):
+    """Immutable snapshot of a single active PlantStage"""
+    id: int
+    stage_order: int
+    stage_name: str
+    display_name: str
+    xp_required: int
+    levels_required: int
+
+
+class StageTable(NamedTuple):
+    """
+    Sorted, immutable stage table for one plant type
+
+    xp_thresholds and level_thresholds hold the running maximum of each
+    requirement, so a stage counts as reached only when every stage before
+    it is reached too, and both tuples stay sorted for bisect.
+    """
+    plant_type_id: int
+    stages: Tuple[StageRow, ...]
+    orders: Tuple[int, ...]
+    xp_thresholds: Tuple[int, ...]
+    level_thresholds: Tuple[int, ...]
+
+    def __len__(self):
+        return len(self.stages)
+
+    def index_of(self, stage_order: int) -> int:
+        """Index of the last stage at or below stage_order (-1 if none)"""
+        return bisect_right(self.orders, stage_order) - 1
+
+    def reached_index(self, total_xp: int, levels_completed: int) -> int:
+        """Index of the furthest stage whose requirements are met (-1 if none)"""
+        by_xp = bisect_right(self.xp_thresholds, total_xp)
+        by_levels = bisect_right(self.level_thresholds, levels_completed)
+        return min(by_xp, by_levels) - 1
+
+    def next_stage(self, stage_order: int) -> Optional[StageRow]:
+        """First active stage after stage_order"""
+        index = bisect_right(self.orders, stage_order)
+        return self.stages[index] if index < len(self.stages) else None
+
+    def advance(self, stage_order: int, total_xp: int, levels_completed: int) -> Optional[StageRow]:
+        """
+        Stage the plant should move to, or None if it stays put
+
+        A large XP/level jump can skip several stages at once; plants never
+        move backwards.
+        """
+        reached = self.reached_index(total_xp, levels_completed)
+        if reached > self.index_of(stage_order):
+            return self.stages[reached]
+        return None
+
+
+STAGE_VERSION_KIND = 'plant_stages'
+STAGE_TABLE_CHECK_SECONDS = 30
+
+_tables = {}
+_lock = Lock()
+# Version the cached tables were built at, and when it was last checked
+_checked = {'version': None, 'at': float('-inf')}
+
+
+def _check_version():
+    """Drop every cached table if stages were edited since the last check"""
+    now = time.monotonic()
+    if now - _checked['at'] < STAGE_TABLE_CHECK_SECONDS:
+        return
+    from levels.versions import get_content_versions
+
+    version = get_content_versions([STAGE_VERSION_KIND]).get(STAGE_VERSION_KIND, (None, None))[0]
+    with _lock:
+        _checked['at'] = now
+        if version != _checked['version']:
+            _tables.clear()
+            _checked['version'] = version
+
+
+def build_stage_table(plant_type_id: int) -> StageTable:
+    """Load active stages for a plant type into a StageTable"""
+    from .models import PlantStage
+
+    stage_names = dict(PlantStage.STAGE_CHOICES)
+    rows = tuple(
+        StageRow(
+            id=stage_id,
+            stage_order=stage_order,
+            stage_name=stage_name,
+            display_name=stage_names.get(stage_name, stage_name),
+            xp_required=xp_required,
+            levels_required=levels_required,
+        )
+        for stage_id, stage_order, stage_name, xp_required, levels_required in
+        PlantStage.objects.filter(plant_type_id=plant_type_id, is_active=True)
+        .order_by('stage_order')
+        .values_list('id', 'stage_order', 'stage_name', 'xp_required', 'levels_required')
+    )
+
+    return StageTable(
+        plant_type_id=plant_type_id,
+        stages=rows,
+        orders=tuple(row.stage_order for row in rows),
+        xp_thresholds=tuple(accumulate((row.xp_required for row in rows), max)),
+        level_thresholds=tuple(accumulate((row.levels_required for row in rows), max)),
+    )
+
+
+def get_stage_table(plant_type_id: int) -> StageTable:
+    """Get the cached stage table for a plant type, loading it on first use"""
+    _check_version()
+    table = _tables.get(plant_type_id)
+    if table is None:
+        with _lock:
+            table = _tables.get(plant_type_id)
+            if table is None:
+                table = build_stage_table(plant_type_id)
+                _tables[plant_type_id] = table
+    return table
+
+
+def invalidate_stage_table(plant_type_id: Optional[int] = None):
+    """Drop the cached table for one plant type, or all of them"""
+    with _lock:
+        if plant_type_id is None:
+            _tables.clear()
+        else:
+            _tables.pop(plant_type_id, None)
@@ -0,0 +1,98 @@
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Exists, F, OuterRef, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from plants.models import PlantCareLog, PlantDecayRun, UserPlant
+from progress.models import XPTransaction
+
+
+class Command(BaseCommand):
+    help = 'Apply nightly plant health decay, wilting and care streak resets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date', type=str,
+            help='Last day to process (YYYY-MM-DD), defaults to yesterday'
+        )
+
+    def handle(self, *args, **options):
+        end_date = timezone.now().date() - timedelta(days=1)
+        if options.get('date'):
+            try:
+                end_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('Invalid --date, expected YYYY-MM-DD')
+
+        # Catch up on every day missed since the last run
+        last_run = PlantDecayRun.objects.order_by('-date').first()
+        day = last_run.date + timedelta(days=1) if last_run else end_date
+
+        if day > end_date:
+            self.stdout.write('Plant decay is already up to date')
+            return
+
+        while day <= end_date:
+            run = self.process_day(day)
+            if run is None:
+                self.stdout.write(f'{day}: already processed, skipped')
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{day}: {run.plants_decayed} plants decayed, {run.plants_cared} plants cared for'
+                ))
+            day += timedelta(days=1)
+
+    def process_day(self, day):
+        """
+        Apply one day of decay; returns None if the day was already processed.
+        A plant counts as cared for on a past day if it was last cared for
+        then, or if a care action or any XP award (learning tends the plant)
+        was logged that day, so days caught up late are judged as they were.
+        """
+        start = timezone.make_aware(datetime.combine(day, time.min))
+        end = start + timedelta(days=1)
+        cared_for = (
+            Q(last_care_date=day)
+            | Exists(PlantCareLog.objects.filter(
+                user_plant=OuterRef('pk'), performed_at__gte=start, performed_at__lt=end,
+            ))
+            | Exists(XPTransaction.objects.filter(
+                user=OuterRef('user'), created_at__gte=start, created_at__lt=end,
+            ))
+        )
+
+        try:
+            with transaction.atomic():
+                run = PlantDecayRun.objects.create(date=day)
+
+                plants = UserPlant.objects.filter(created_at__date__lte=day)
+                neglected = plants.exclude(cared_for)
+
+                # Only plants still untended since then lose their streak; a
+                # later care day already restarted it
+                neglected.filter(Q(last_care_date__isnull=True) | Q(last_care_date__lt=day)).update(
+                    daily_care_streak=0,
+                )
+
+                # Flags are computed from the pre-decay value in the same UPDATE
+                decay = UserPlant.DAILY_HEALTH_DECAY
+                run.plants_decayed = neglected.update(
+                    health_points=Greatest(F('health_points') - decay, Value(0)),
+                    is_wilting=Case(
+                        When(health_points__lt=UserPlant.WILTING_THRESHOLD + decay, then=Value(True)),
+                        default=Value(False),
+                    ),
+                    is_healthy=Case(
+                        When(health_points__gte=UserPlant.HEALTHY_THRESHOLD + decay, then=Value(True)),
+                        default=Value(False),
+                    ),
+                )
+                run.plants_cared = plants.filter(cared_for).count()
+                run.save(update_fields=['plants_decayed', 'plants_cared'])
+        except IntegrityError:
+            # Another run recorded this day first
+            return None
+        return run
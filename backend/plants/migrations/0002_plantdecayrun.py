@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlantDecayRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Day whose health decay was applied', unique=True)),
+                ('plants_decayed', models.PositiveIntegerField(default=0, help_text='Plants that were not cared for and lost health')),
+                ('plants_cared', models.PositiveIntegerField(default=0, help_text='Plants that were cared for on this day')),
+                ('processed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Plant Decay Run',
+                'verbose_name_plural': 'Plant Decay Runs',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
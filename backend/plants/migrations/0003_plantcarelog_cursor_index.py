@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plants', '0002_plantdecayrun'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='plantcarelog',
+            name='plants_plan_user_pl_14bb8b_idx',
+        ),
+        migrations.AddIndex(
+            model_name='plantcarelog',
+            index=models.Index(fields=['user_plant', 'performed_at', 'id'], name='plants_plan_user_pl_7a0e12_idx'),
+        ),
+    ]
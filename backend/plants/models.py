@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import F
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from users.models import User
+from .growth import STAGE_VERSION_KIND, get_stage_table, invalidate_stage_table
 
 
 class PlantType(models.Model):
@@ -223,100 +227,115 @@ class UserPlant(models.Model):
             models.Index(fields=['last_care_date']),
         ]
     
+    # Health rules applied by care actions and the nightly decay job
+    DAILY_HEALTH_DECAY = 5
+    CONSECUTIVE_CARE_HEALTH = 10
+    WILTING_THRESHOLD = 50
+    HEALTHY_THRESHOLD = 70
+    
     def __str__(self):
         return f"{self.user.username}'s {self.plant_type.name} ({self.current_stage.get_stage_name_display()})"
     
-    def update_progress(self, level_completed=False, xp_earned=0):
+    def update_progress(self, level_completed=False, xp_earned=0, levels_completed=0):
         """Update plant progress"""
         if level_completed:
-            self.levels_completed += 1
-            self.current_level += 1
+            levels_completed += 1
         
-        if xp_earned > 0:
-            self.total_xp += xp_earned
+        # Counters move with F() so concurrent awards are never lost
+        if levels_completed > 0 or xp_earned > 0:
+            UserPlant.objects.filter(pk=self.pk).update(
+                total_xp=F('total_xp') + max(xp_earned, 0),
+                levels_completed=F('levels_completed') + max(levels_completed, 0),
+                current_level=F('current_level') + max(levels_completed, 0),
+            )
+            self.refresh_from_db(fields=['total_xp', 'levels_completed', 'current_level'])
         
         # Check for stage advancement
         self.check_stage_advancement()
         
-        # Update health
-        self.update_health()
+        # Learning counts as tending the plant; health decay is applied
+        # nightly by the decay_plants command
+        self.record_care()
         
-        self.save()
+        self.save(update_fields=[
+            'current_stage', 'has_flowers', 'has_fruits', 'health_points', 'is_wilting',
+            'is_healthy', 'last_care_date', 'daily_care_streak', 'max_care_streak',
+            'updated_at', 'last_updated',
+        ])
+    
+    def get_stage_table(self):
+        """Get the precomputed stage table for this plant's type"""
+        return get_stage_table(self.plant_type_id)
     
     def check_stage_advancement(self):
-        """Check if plant should advance to next stage"""
-        next_stage = PlantStage.objects.filter(
-            plant_type=self.plant_type,
-            stage_order__gt=self.current_stage.stage_order,
-            is_active=True
-        ).order_by('stage_order').first()
+        """Check if plant should advance, possibly through several stages at once"""
+        new_stage = self.get_stage_table().advance(
+            self.current_stage.stage_order,
+            self.total_xp,
+            self.levels_completed
+        )
         
-        if next_stage:
-            # Check if requirements are met
-            if (self.total_xp >= next_stage.xp_required and 
-                self.levels_completed >= next_stage.levels_required):
-                self.current_stage = next_stage
-                self.has_flowers = next_stage.stage_name in ['flowering', 'fruiting', 'mature']
-                self.has_fruits = next_stage.stage_name in ['fruiting', 'mature']
-    
-    def update_health(self):
-        """Update plant health based on daily care"""
-        today = timezone.now().date()
+        if new_stage:
+            self.current_stage_id = new_stage.id
+            self.has_flowers = new_stage.stage_name in ['flowering', 'fruiting', 'mature']
+            self.has_fruits = new_stage.stage_name in ['fruiting', 'mature']
+        return new_stage
+    
+    def extend_care_streak(self, today=None):
+        """Mark the plant tended today; returns whether yesterday was a care day too"""
+        today = today or timezone.now().date()
         
-        if self.last_care_date:
-            days_since_care = (today - self.last_care_date).days
-            
-            if days_since_care == 1:
-                # Plant was cared for yesterday, maintain streak
-                self.daily_care_streak += 1
-                self.max_care_streak = max(self.max_care_streak, self.daily_care_streak)
-                self.health_points = min(100, self.health_points + 10)
-                self.is_wilting = False
-            elif days_since_care == 0:
-                # Plant was cared for today, no change
-                pass
-            else:
-                # Plant wasn't cared for, health decreases
-                self.daily_care_streak = 0
-                self.health_points = max(0, self.health_points - (days_since_care * 5))
-                self.is_wilting = self.health_points < 50
+        if self.last_care_date == today:
+            # Already cared for today, streak unchanged
+            return False
+        
+        consecutive = self.last_care_date is not None and (today - self.last_care_date).days == 1
+        if consecutive:
+            # Cared for yesterday, extend streak
+            self.daily_care_streak += 1
         else:
-            # First time, set as cared for
-            self.last_care_date = today
             self.daily_care_streak = 1
         
-        self.is_healthy = self.health_points >= 70
+        self.max_care_streak = max(self.max_care_streak, self.daily_care_streak)
+        self.last_care_date = today
+        return consecutive
+    
+    def record_care(self, today=None):
+        """
+        Record learning as tending the plant: a second consecutive day of
+        care heals it and stops wilting. Missed days are decayed by the
+        decay_plants command.
+        """
+        if self.extend_care_streak(today):
+            self.health_points = min(100, self.health_points + self.CONSECUTIVE_CARE_HEALTH)
+            self.is_wilting = False
+        self.is_healthy = self.health_points >= self.HEALTHY_THRESHOLD
     
     def care_plant(self):
         """User cares for the plant"""
-        today = timezone.now().date()
-        self.last_care_date = today
+        self.extend_care_streak()
         self.health_points = min(100, self.health_points + 20)
         self.is_wilting = False
         self.is_healthy = True
-        self.save()
+        self.save(update_fields=[
+            'health_points', 'is_wilting', 'is_healthy', 'last_care_date',
+            'daily_care_streak', 'max_care_streak', 'updated_at', 'last_updated',
+        ])
     
     def get_growth_progress(self):
         """Get growth progress percentage"""
-        total_stages = PlantStage.objects.filter(
-            plant_type=self.plant_type,
-            is_active=True
-        ).count()
+        total_stages = len(self.get_stage_table())
         
         current_stage_order = self.current_stage.stage_order
         return (current_stage_order / total_stages) * 100 if total_stages > 0 else 0
     
     def get_next_stage_requirements(self):
         """Get requirements for next stage"""
-        next_stage = PlantStage.objects.filter(
-            plant_type=self.plant_type,
-            stage_order__gt=self.current_stage.stage_order,
-            is_active=True
-        ).order_by('stage_order').first()
+        next_stage = self.get_stage_table().next_stage(self.current_stage.stage_order)
         
         if next_stage:
             return {
-                'stage_name': next_stage.get_stage_name_display(),
+                'stage_name': next_stage.display_name,
                 'xp_required': next_stage.xp_required,
                 'levels_required': next_stage.levels_required,
                 'xp_progress': min(100, (self.total_xp / next_stage.xp_required) * 100) if next_stage.xp_required > 0 else 100,
@@ -368,9 +387,50 @@ class PlantCareLog(models.Model):
         verbose_name = 'Plant Care Log'
         verbose_name_plural = 'Plant Care Logs'
         indexes = [
-            models.Index(fields=['user_plant', 'performed_at']),
+            models.Index(fields=['user_plant', 'performed_at', 'id']),
             models.Index(fields=['action']),
         ]
     
     def __str__(self):
-        return f"{self.user_plant.user.username} - {self.get_action_display()} at {self.performed_at}"
\ No newline at end of file
+        return f"{self.user_plant.user.username} - {self.get_action_display()} at {self.performed_at}"
+
+
+class PlantDecayRun(models.Model):
+    """
+    One row per day processed by the decay_plants command
+    """
+    date = models.DateField(unique=True, help_text="Day whose health decay was applied")
+    plants_decayed = models.PositiveIntegerField(
+        default=0,
+        help_text="Plants that were not cared for and lost health"
+    )
+    plants_cared = models.PositiveIntegerField(
+        default=0,
+        help_text="Plants that were cared for on this day"
+    )
+    processed_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-date']
+        verbose_name = 'Plant Decay Run'
+        verbose_name_plural = 'Plant Decay Runs'
+    
+    def __str__(self):
+        return f"Plant decay for {self.date}"
+
+
+# Keep the in-memory stage tables in sync with PlantStage edits
+@receiver(post_save, sender=PlantStage)
+@receiver(post_delete, sender=PlantStage)
+def invalidate_plant_stage_table(sender, instance, **kwargs):
+    """Drop this process's cached stage table and tell the others to reload"""
+    from levels.versions import bump_content_versions
+    invalidate_stage_table(instance.plant_type_id)
+    bump_content_versions(STAGE_VERSION_KIND)
+
+
+@receiver(post_save, sender=UserPlant)
+def award_plant_achievements(sender, instance, **kwargs):
+    """Award growth, care and health achievements when a plant changes"""
+    from progress.achievements import on_user_plant_saved
+    on_user_plant_saved(instance)
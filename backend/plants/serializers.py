@@ -149,9 +149,8 @@ class PlantCareLogCreateSerializer(serializers.ModelSerializer):
             xp_earned=xp_earned
         )
         
-        # Update plant health
+        # Update plant health; the XP reaches the plant through the ledger
         user_plant.health_points = min(100, user_plant.health_points + health_change)
-        user_plant.total_xp += xp_earned
         user_plant.care_plant()
         
         return care_log
@@ -1,3 +1,186 @@
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from levels.versions import bump_content_versions
+from progress.models import XPTransaction
+from . import growth
+from .growth import STAGE_VERSION_KIND, get_stage_table
+from .models import PlantCareLog, PlantDecayRun, PlantStage, PlantType, UserPlant
+
+User = get_user_model()
+
+
+def at(day, hour=12):
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+class PlantTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.plant_type = PlantType.objects.create(name='Fern')
+        cls.seed = PlantStage.objects.create(plant_type=cls.plant_type, stage_name='seed', stage_order=1)
+
+    def make_plant(self, username, created_on, **fields):
+        user = User.objects.create_user(username=username, password='pass12345', role='student')
+        plant = UserPlant.objects.create(user=user, plant_type=self.plant_type, current_stage=self.seed, **fields)
+        UserPlant.objects.filter(pk=plant.pk).update(created_at=at(created_on, 0))
+        return plant
+
+
+class DecayPlantsTests(PlantTestCase):
+    """decay_plants applies each day once, judged by the care logged that day"""
+
+    day = date(2026, 3, 10)
+
+    def decay(self, until):
+        call_command('decay_plants', date=until.isoformat(), stdout=StringIO())
+
+    def test_rerunning_a_day_is_a_no_op(self):
+        plant = self.make_plant('neglected', self.day)
+        self.decay(self.day)
+        self.decay(self.day)
+
+        plant.refresh_from_db()
+        self.assertEqual(plant.health_points, 100 - UserPlant.DAILY_HEALTH_DECAY)
+        self.assertEqual(PlantDecayRun.objects.count(), 1)
+
+    def test_catch_up_decays_days_neglected_before_a_later_care_day(self):
+        self.decay(self.day)
+        neglected = self.make_plant('neglected', self.day)
+        tended = self.make_plant('tended', self.day, last_care_date=self.day + timedelta(days=2), daily_care_streak=1)
+        learner = self.make_plant('learner', self.day)
+
+        # Day 1 was missed by every plant; on day 2 one was watered and one
+        # learner earned XP
+        PlantCareLog.objects.create(user_plant=tended, action='water')
+        PlantCareLog.objects.filter(user_plant=tended).update(performed_at=at(self.day + timedelta(days=2)))
+        XPTransaction.objects.create(
+            user=learner.user, amount=10, source_type='question', source_id='1',
+            created_at=at(self.day + timedelta(days=2)),
+        )
+        self.decay(self.day + timedelta(days=2))
+
+        decay = UserPlant.DAILY_HEALTH_DECAY
+        for plant, health, streak in ((neglected, 100 - 2 * decay, 0), (tended, 100 - decay, 1), (learner, 100 - decay, 0)):
+            plant.refresh_from_db()
+            self.assertEqual((plant.health_points, plant.daily_care_streak), (health, streak), plant.user.username)
+        self.assertEqual(
+            list(PlantDecayRun.objects.order_by('date').values_list('plants_decayed', 'plants_cared')),
+            [(0, 0), (3, 0), (1, 2)],
+        )
+
+    def test_flags_at_thresholds(self):
+        decay = UserPlant.DAILY_HEALTH_DECAY
+        cases = {
+            UserPlant.WILTING_THRESHOLD + decay: (False, False),
+            UserPlant.WILTING_THRESHOLD + decay - 1: (True, False),
+            UserPlant.HEALTHY_THRESHOLD + decay: (False, True),
+            UserPlant.HEALTHY_THRESHOLD + decay - 1: (False, False),
+        }
+        plants = {
+            health: self.make_plant(f'plant_{health}', self.day, health_points=health)
+            for health in cases
+        }
+        self.decay(self.day)
+
+        for health, (wilting, healthy) in cases.items():
+            plant = plants[health]
+            plant.refresh_from_db()
+            self.assertEqual(plant.health_points, health - decay)
+            self.assertEqual((plant.is_wilting, plant.is_healthy), (wilting, healthy), health)
+
+
+class RecordCareTests(PlantTestCase):
+    """Learning on consecutive days heals the plant, as update_health did"""
+
+    def test_consecutive_day_heals_and_stops_wilting(self):
+        today = date(2026, 3, 10)
+        plant = self.make_plant(
+            'learner', today, health_points=62, is_wilting=True, is_healthy=False,
+            last_care_date=today - timedelta(days=1), daily_care_streak=3,
+        )
+        plant.record_care(today)
+        self.assertEqual((plant.health_points, plant.is_wilting, plant.is_healthy), (72, False, True))
+        self.assertEqual(plant.daily_care_streak, 4)
+
+        # A second call the same day changes nothing
+        plant.record_care(today)
+        self.assertEqual((plant.health_points, plant.daily_care_streak), (72, 4))
+
+    def test_care_after_a_gap_restarts_the_streak_without_healing(self):
+        today = date(2026, 3, 10)
+        plant = self.make_plant(
+            'returning', today, health_points=60, is_wilting=False, is_healthy=True,
+            last_care_date=today - timedelta(days=3), daily_care_streak=5,
+        )
+        plant.record_care(today)
+        self.assertEqual((plant.health_points, plant.is_healthy, plant.daily_care_streak), (60, False, 1))
+
+
+class StageTableTests(PlantTestCase):
+    """Stage lookups and advancement read the precomputed table"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.stages = [cls.seed] + [
+            PlantStage.objects.create(
+                plant_type=cls.plant_type, stage_name=name, stage_order=order,
+                xp_required=xp, levels_required=levels, is_active=active,
+            )
+            for name, order, xp, levels, active in [
+                ('sprout', 2, 50, 1, True),
+                ('sapling', 3, 120, 3, True),
+                ('tree', 4, 100, 4, True),
+                ('flowering', 5, 0, 0, False),
+                ('fruiting', 6, 300, 8, True),
+            ]
+        ]
+
+    def setUp(self):
+        # Tables cached by earlier tests describe rolled-back rows
+        growth.invalidate_stage_table()
+
+    def test_lookups(self):
+        table = get_stage_table(self.plant_type.pk)
+
+        self.assertEqual(table.orders, (1, 2, 3, 4, 6))
+        # A lower requirement after a higher one still needs the higher one
+        self.assertEqual(table.xp_thresholds, (0, 50, 120, 120, 300))
+        self.assertEqual(table.next_stage(4).stage_name, 'fruiting')
+        self.assertIsNone(table.next_stage(6))
+        self.assertEqual(table.index_of(5), 3)
+        self.assertEqual(table.reached_index(130, 2), 1)
+        self.assertEqual(table.reached_index(130, 4), 3)
+        self.assertIsNone(table.advance(4, 130, 4))
+
+    def test_large_jump_advances_several_stages(self):
+        plant = self.make_plant('jumper', date(2026, 3, 10))
+        plant.update_progress(xp_earned=150, levels_completed=4)
+
+        plant.refresh_from_db()
+        self.assertEqual(plant.current_stage.stage_name, 'tree')
+        self.assertEqual((plant.has_flowers, plant.has_fruits), (False, False))
+
+        plant.update_progress(xp_earned=500, levels_completed=10)
+        plant.refresh_from_db()
+        self.assertEqual(plant.current_stage.stage_name, 'fruiting')
+        self.assertEqual((plant.has_flowers, plant.has_fruits), (True, True))
+
+    def test_edit_in_another_process_is_picked_up(self):
+        self.assertEqual(get_stage_table(self.plant_type.pk).xp_thresholds[1], 50)
+        # Another process edits a stage: the version row changes, but this
+        # process gets no signal
+        PlantStage.objects.filter(pk=self.stages[1].pk).update(xp_required=80)
+        bump_content_versions(STAGE_VERSION_KIND)
 
-# Create your tests here.
+        self.assertEqual(get_stage_table(self.plant_type.pk).xp_thresholds[1], 50)
+        with mock.patch.object(growth, 'STAGE_TABLE_CHECK_SECONDS', 0):
+            self.assertEqual(get_stage_table(self.plant_type.pk).xp_thresholds[1], 80)
@@ -10,6 +10,11 @@ from .serializers import (
     UserPlantCreateSerializer, PlantCareLogSerializer, PlantCareLogCreateSerializer,
     PlantStatsSerializer
 )
+from progress.models import UserAchievement
+from progress.achievements import RULES_BY_CODE
+from progress.serializers import AchievementSerializer
+from progress.xp import award_xp
+from pagination import KeysetPagination
 
 
 class PlantTypeListView(generics.ListAPIView):
@@ -44,7 +49,7 @@ class PlantStageListView(generics.ListAPIView):
 def get_user_plant(request):
     """Get user's current plant"""
     try:
-        user_plant = UserPlant.objects.get(user=request.user)
+        user_plant = UserPlant.objects.select_related('plant_type', 'current_stage').get(user=request.user)
         serializer = UserPlantSerializer(user_plant)
         return Response(serializer.data)
     except UserPlant.DoesNotExist:
@@ -70,10 +75,8 @@ def create_user_plant(request):
     if serializer.is_valid():
         user_plant = serializer.save()
         
-        # Update user's total XP
-        user = request.user
-        user.total_xp += 10  # Initial XP for creating plant
-        user.save()
+        # Initial XP for creating plant
+        award_xp(request.user, 10, 'plant_created', user_plant.id)
         
         return Response(
             UserPlantSerializer(user_plant).data,
@@ -88,7 +91,7 @@ def create_user_plant(request):
 def care_plant(request):
     """Care for user's plant"""
     try:
-        user_plant = UserPlant.objects.get(user=request.user)
+        user_plant = UserPlant.objects.select_related('plant_type', 'current_stage').get(user=request.user)
     except UserPlant.DoesNotExist:
         return Response(
             {'error': 'User does not have a plant'},
@@ -100,10 +103,8 @@ def care_plant(request):
     if serializer.is_valid():
         care_log = serializer.save()
         
-        # Update user's total XP
-        user = request.user
-        user.total_xp += care_log.xp_earned
-        user.save()
+        # Credit XP through the ledger, once per care action
+        award_xp(request.user, care_log.xp_earned, 'plant_care', care_log.id)
         
         return Response(
             PlantCareLogSerializer(care_log).data,
@@ -117,6 +118,8 @@ class PlantCareLogListView(generics.ListAPIView):
     """List user's plant care logs"""
     serializer_class = PlantCareLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-performed_at', '-id')
     
     def get_queryset(self):
         try:
@@ -131,7 +134,7 @@ class PlantCareLogListView(generics.ListAPIView):
 def plant_stats(request):
     """Get user's plant statistics"""
     try:
-        user_plant = UserPlant.objects.get(user=request.user)
+        user_plant = UserPlant.objects.select_related('plant_type', 'current_stage').get(user=request.user)
     except UserPlant.DoesNotExist:
         return Response(
             {'error': 'User does not have a plant'},
@@ -168,22 +171,31 @@ def plant_stats(request):
 def update_plant_progress(request):
     """Update plant progress (called when level is completed)"""
     try:
-        user_plant = UserPlant.objects.get(user=request.user)
+        user_plant = UserPlant.objects.select_related('plant_type', 'current_stage').get(user=request.user)
     except UserPlant.DoesNotExist:
         return Response(
             {'error': 'User does not have a plant'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    levels_completed = request.data.get('levels_completed', 0)
-    xp_earned = request.data.get('xp_earned', 0)
-    time_spent = request.data.get('time_spent', 0)
-    
-    # Update plant progress
+    try:
+        levels_completed = int(request.data.get('levels_completed', 0))
+        xp_earned = int(request.data.get('xp_earned', 0))
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'levels_completed and xp_earned must be whole numbers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if levels_completed < 0 or xp_earned < 0:
+        return Response(
+            {'error': 'levels_completed and xp_earned must not be negative'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Update plant progress (large jumps can advance several stages at once)
     user_plant.update_progress(
         levels_completed=levels_completed,
-        xp_earned=xp_earned,
-        time_spent=time_spent
+        xp_earned=xp_earned
     )
     
     serializer = UserPlantSerializer(user_plant)
@@ -195,7 +207,7 @@ def update_plant_progress(request):
 def get_plant_recommendations(request):
     """Get plant care recommendations"""
     try:
-        user_plant = UserPlant.objects.get(user=request.user)
+        user_plant = UserPlant.objects.select_related('plant_type', 'current_stage').get(user=request.user)
     except UserPlant.DoesNotExist:
         return Response(
             {'error': 'User does not have a plant'},
@@ -257,67 +269,18 @@ def get_plant_recommendations(request):
 @permission_classes([permissions.IsAuthenticated])
 def get_plant_achievements(request):
     """Get plant-related achievements"""
-    try:
-        user_plant = UserPlant.objects.get(user=request.user)
-    except UserPlant.DoesNotExist:
-        return Response(
-            {'error': 'User does not have a plant'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    
-    achievements = []
-    
-    # Growth achievements
-    if user_plant.current_stage.stage_name == 'mature':
-        achievements.append({
-            'name': 'Plant Master',
-            'description': 'Reached the mature stage',
-            'icon': '🌳',
-            'earned': True
-        })
-    elif user_plant.current_stage.stage_name == 'fruiting':
-        achievements.append({
-            'name': 'Fruit Bearer',
-            'description': 'Your plant is bearing fruits!',
-            'icon': '🍎',
-            'earned': True
-        })
-    elif user_plant.current_stage.stage_name == 'flowering':
-        achievements.append({
-            'name': 'Flower Power',
-            'description': 'Your plant is flowering!',
-            'icon': '🌸',
-            'earned': True
-        })
-    
-    # Care achievements
-    if user_plant.max_care_streak >= 30:
-        achievements.append({
-            'name': 'Dedicated Gardener',
-            'description': '30-day care streak',
-            'icon': '🏆',
-            'earned': True
-        })
-    elif user_plant.max_care_streak >= 7:
-        achievements.append({
-            'name': 'Consistent Care',
-            'description': '7-day care streak',
-            'icon': '⭐',
-            'earned': True
-        })
-    
-    # Health achievements
-    if user_plant.health_points == 100:
-        achievements.append({
-            'name': 'Perfect Health',
-            'description': 'Plant at perfect health',
-            'icon': '💚',
-            'earned': True
-        })
+    # Awarded incrementally by progress.achievements, so this is a plain read
+    earned = UserAchievement.objects.filter(
+        user=request.user, category='plant', code__in=list(RULES_BY_CODE)
+    )
+    achievements = [
+        {**achievement, 'earned': True}
+        for achievement in AchievementSerializer(earned, many=True).data
+    ]
     
     return Response({
         'achievements': achievements,
-        'total_earned': len([a for a in achievements if a['earned']])
+        'total_earned': len(achievements)
     })
 
 
@@ -0,0 +1,174 @@
+"""
+Rule-driven achievements
+Rules are declared once below; they are evaluated incrementally when a
+LevelProgress or UserPlant changes or XP is credited, and earned
+achievements are stored in UserAchievement so achievement endpoints are a
+single indexed read. XP rules read the XP ledger total, so question, test
+and plant XP count as well as level XP.
+"""
+
+from typing import NamedTuple
+
+from django.db.models import Count, Q, Sum
+
+from plants.models import PlantStage, UserPlant
+from plants.growth import get_stage_table
+from users.models import User
+from .models import LevelProgress, UserAchievement, XPTransaction
+
+
+class AchievementRule(NamedTuple):
+    """An achievement earned once metric reaches threshold"""
+    code: str
+    name: str
+    description: str
+    icon: str
+    category: str
+    metric: str
+    threshold: int
+
+
+# Plant stages ranked in growth order, so stage rules are plain thresholds
+STAGE_RANK = {name: rank for rank, (name, _) in enumerate(PlantStage.STAGE_CHOICES)}
+
+RULES = (
+    # Level completion achievements
+    AchievementRule('first_level', 'First Steps', 'Complete your first level', '🎯',
+                    'progress', 'levels_completed', 1),
+    AchievementRule('level_10', 'Getting Started', 'Complete 10 levels', '🌟',
+                    'progress', 'levels_completed', 10),
+    AchievementRule('level_50', 'Halfway There', 'Complete 50 levels', '🏆',
+                    'progress', 'levels_completed', 50),
+
+    # XP achievements
+    AchievementRule('xp_100', 'XP Collector', 'Earn 100 XP', '⚡',
+                    'progress', 'total_xp', 100),
+    AchievementRule('xp_500', 'XP Master', 'Earn 500 XP', '🔥',
+                    'progress', 'total_xp', 500),
+
+    # Growth achievements
+    AchievementRule('flower_power', 'Flower Power', 'Your plant is flowering!', '🌸',
+                    'plant', 'plant_stage', STAGE_RANK['flowering']),
+    AchievementRule('fruit_bearer', 'Fruit Bearer', 'Your plant is bearing fruits!', '🍎',
+                    'plant', 'plant_stage', STAGE_RANK['fruiting']),
+    AchievementRule('plant_master', 'Plant Master', 'Reached the mature stage', '🌳',
+                    'plant', 'plant_stage', STAGE_RANK['mature']),
+
+    # Care achievements
+    AchievementRule('care_streak_7', 'Consistent Care', '7-day care streak', '⭐',
+                    'plant', 'care_streak', 7),
+    AchievementRule('care_streak_30', 'Dedicated Gardener', '30-day care streak', '🏆',
+                    'plant', 'care_streak', 30),
+
+    # Health achievements
+    AchievementRule('perfect_health', 'Perfect Health', 'Plant at perfect health', '💚',
+                    'plant', 'plant_health', 100),
+)
+
+RULES_BY_CODE = {rule.code: rule for rule in RULES}
+
+
+def get_rule(code):
+    """Get the rule for an achievement code (None if it was retired)"""
+    return RULES_BY_CODE.get(code)
+
+
+def progress_metrics(user_id):
+    """Level completions and the ledger XP total (User.total_xp) for a user"""
+    totals = User.objects.filter(pk=user_id).annotate(
+        levels_completed=Count('level_progress', filter=Q(level_progress__is_completed=True)),
+    ).values('levels_completed', 'total_xp').first() or {}
+    return {
+        'levels_completed': totals.get('levels_completed', 0),
+        'total_xp': totals.get('total_xp') or 0,
+    }
+
+
+def plant_metrics(plant_type_id, current_stage_id, max_care_streak, health_points):
+    """Plant metrics, resolving the stage from the cached stage table"""
+    table = get_stage_table(plant_type_id)
+    stage_name = next((row.stage_name for row in table.stages if row.id == current_stage_id), None)
+    return {
+        'plant_stage': STAGE_RANK.get(stage_name, -1),
+        'care_streak': max_care_streak,
+        'plant_health': health_points,
+    }
+
+
+def met_rules(metrics):
+    """Rules whose metric is present in metrics and reaches its threshold"""
+    return [
+        rule for rule in RULES
+        if rule.metric in metrics and metrics[rule.metric] >= rule.threshold
+    ]
+
+
+def award_achievements(user_id, metrics):
+    """Store any achievements newly earned for the given metrics"""
+    candidates = met_rules(metrics)
+    if not candidates:
+        return []
+
+    earned = set(
+        UserAchievement.objects.filter(
+            user_id=user_id, code__in=[rule.code for rule in candidates]
+        ).values_list('code', flat=True)
+    )
+    new_achievements = [
+        UserAchievement(user_id=user_id, code=rule.code, category=rule.category)
+        for rule in candidates if rule.code not in earned
+    ]
+    if new_achievements:
+        UserAchievement.objects.bulk_create(new_achievements, ignore_conflicts=True)
+    return new_achievements
+
+
+def on_level_progress_saved(level_progress):
+    """Re-check level and XP rules after a LevelProgress change"""
+    if not level_progress.is_completed and not level_progress.xp_earned:
+        # Nothing that feeds a rule has moved
+        return []
+    return award_achievements(level_progress.user_id, progress_metrics(level_progress.user_id))
+
+
+def on_xp_awarded(user_id, total_xp):
+    """Re-check XP rules after XP is credited to the ledger"""
+    return award_achievements(user_id, {'total_xp': total_xp})
+
+
+def on_user_plant_saved(user_plant):
+    """Re-check plant rules after a UserPlant change"""
+    metrics = plant_metrics(
+        user_plant.plant_type_id, user_plant.current_stage_id,
+        user_plant.max_care_streak, user_plant.health_points,
+    )
+    return award_achievements(user_plant.user_id, metrics)
+
+
+def backfill_achievements(batch_size=1000):
+    """Evaluate every rule for every user; returns the number of achievements awarded"""
+    metrics_by_user = {}
+
+    for row in LevelProgress.objects.values('user_id').annotate(
+        levels_completed=Count('id', filter=Q(is_completed=True)),
+    ).order_by():
+        metrics_by_user[row['user_id']] = {'levels_completed': row['levels_completed']}
+
+    for row in XPTransaction.objects.values('user_id').annotate(total_xp=Sum('amount')).order_by():
+        metrics_by_user.setdefault(row['user_id'], {})['total_xp'] = row['total_xp'] or 0
+
+    for user_id, *plant in UserPlant.objects.values_list(
+        'user_id', 'plant_type_id', 'current_stage_id', 'max_care_streak', 'health_points'
+    ):
+        metrics_by_user.setdefault(user_id, {}).update(plant_metrics(*plant))
+
+    earned = set(UserAchievement.objects.values_list('user_id', 'code'))
+
+    new_achievements = [
+        UserAchievement(user_id=user_id, code=rule.code, category=rule.category)
+        for user_id, metrics in metrics_by_user.items()
+        for rule in met_rules(metrics)
+        if (user_id, rule.code) not in earned
+    ]
+    UserAchievement.objects.bulk_create(new_achievements, batch_size=batch_size, ignore_conflicts=True)
+    return len(new_achievements)
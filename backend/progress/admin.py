@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import LevelProgress, QuestionProgress, DailyProgress
+from .models import LevelProgress, QuestionProgress, DailyProgress, UserAchievement, ProgressSyncEvent
 
 
 @admin.register(LevelProgress)
@@ -23,4 +23,20 @@ class DailyProgressAdmin(admin.ModelAdmin):
     list_display = ('user', 'date', 'levels_completed', 'questions_answered', 'xp_earned', 'streak_maintained')
     list_filter = ('date', 'streak_maintained')
     search_fields = ('user__username',)
-    ordering = ('-date',)
\ No newline at end of file
+    ordering = ('-date',)
+
+
+@admin.register(UserAchievement)
+class UserAchievementAdmin(admin.ModelAdmin):
+    list_display = ('user', 'code', 'category', 'earned_at')
+    list_filter = ('category', 'code', 'earned_at')
+    search_fields = ('user__username', 'code')
+    ordering = ('-earned_at',)
+
+
+@admin.register(ProgressSyncEvent)
+class ProgressSyncEventAdmin(admin.ModelAdmin):
+    list_display = ('user', 'idempotency_key', 'level', 'passed', 'xp_earned', 'occurred_at', 'received_at')
+    list_filter = ('passed', 'received_at')
+    search_fields = ('user__username', 'idempotency_key')
+    ordering = ('-received_at',)
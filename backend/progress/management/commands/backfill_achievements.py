@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from progress.achievements import backfill_achievements
+
+
+class Command(BaseCommand):
+    help = 'Evaluate every achievement rule for every user and store missing achievements'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        awarded = backfill_achievements(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Awarded {awarded} achievements'))
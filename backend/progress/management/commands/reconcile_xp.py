@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from progress.xp import backfill_ledger, reconcile_totals
+
+
+class Command(BaseCommand):
+    help = 'Recompute cached XP totals on users, group progress and plants from the XP ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backfill', action='store_true', help='First add ledger rows for level XP earned before the ledger existed')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk write')
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted totals without fixing them')
+
+    def handle(self, *args, **options):
+        if options['backfill'] and not options['dry_run']:
+            added = backfill_ledger(batch_size=options['batch_size'])
+            self.stdout.write(f'Added {added} ledger rows from level progress')
+
+        report = reconcile_totals(dry_run=options['dry_run'], batch_size=options['batch_size'])
+        for name, count in report.items():
+            self.stdout.write(f'{name}: {count} drifted')
+
+        prefix = 'DRY RUN: Would correct' if options['dry_run'] else 'Corrected'
+        self.stdout.write(self.style.SUCCESS(f'{prefix} {sum(report.values())} cached totals'))
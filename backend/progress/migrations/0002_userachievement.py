@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAchievement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(help_text='Achievement rule code', max_length=50)),
+                ('category', models.CharField(choices=[('progress', 'Progress'), ('plant', 'Plant')], max_length=20)),
+                ('earned_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='achievements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'User Achievements',
+                'ordering': ['earned_at'],
+                'indexes': [models.Index(fields=['user', 'category', 'earned_at'], name='progress_us_user_id_aff4f5_idx')],
+                'unique_together': {('user', 'code')},
+            },
+        ),
+    ]
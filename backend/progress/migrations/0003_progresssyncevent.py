@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0004_contentversion'),
+        ('progress', '0002_userachievement'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressSyncEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('passed', models.BooleanField(default=False)),
+                ('xp_earned', models.IntegerField(default=0)),
+                ('occurred_at', models.DateTimeField(help_text='When the event happened on the device')),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('level', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_events', to='levels.level')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_sync_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Progress Sync Events',
+                'ordering': ['occurred_at'],
+                'unique_together': {('user', 'idempotency_key')},
+            },
+        ),
+    ]
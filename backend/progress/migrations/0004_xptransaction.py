@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_group_grammar_focus_group_oxford_word_range_end_and_more'),
+        ('progress', '0003_progresssyncevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XPTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.IntegerField()),
+                ('source_type', models.CharField(choices=[('question', 'Correct answer'), ('level', 'Level completed'), ('test', 'Test completed'), ('plant_created', 'Plant created'), ('plant_care', 'Plant care')], max_length=20)),
+                ('source_id', models.CharField(help_text='Id of the question, level, attempt or log that earned the XP', max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('group', models.ForeignKey(blank=True, help_text='Group credited in GroupProgress, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='xp_transactions', to='groups.group')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='xp_transactions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'XP Transactions',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='progress_xp_user_id_1bf5ea_idx')],
+                'unique_together': {('user', 'source_type', 'source_id')},
+            },
+        ),
+    ]
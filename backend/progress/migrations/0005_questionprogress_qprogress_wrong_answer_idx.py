@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0006_json_indexes'),
+        ('progress', '0004_xptransaction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='questionprogress',
+            index=models.Index(condition=models.Q(('is_correct', False)), fields=['question', 'user_answer'], name='qprogress_wrong_answer_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levels', '0006_json_indexes'),
+        ('progress', '0005_questionprogress_qprogress_wrong_answer_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='questionprogress',
+            index=models.Index(fields=['answered_at', 'question'], name='qprogress_answered_idx'),
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
 from django.utils import timezone
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from users.models import User
 from levels.models import Level, Question
+from groups.models import Group
+from .signals import progress_batch_saved
 
 
 class LevelProgress(models.Model):
@@ -62,10 +66,32 @@ class QuestionProgress(models.Model):
     class Meta:
         unique_together = ('user', 'question')
         verbose_name_plural = "Question Progress"
+        indexes = [
+            # Questions answered since the last item analysis run
+            models.Index(fields=['answered_at', 'question'], name='qprogress_answered_idx'),
+            # Wrong answers by value, for distractor lookups and counts
+            models.Index(
+                fields=['question', 'user_answer'], condition=models.Q(is_correct=False),
+                name='qprogress_wrong_answer_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - Q{self.question.question_order}"
 
+    @classmethod
+    def wrong_answers(cls, question, answer):
+        """Incorrect answers to a question equal to ``answer``, e.g. one distractor"""
+        return cls.objects.filter(question=question, is_correct=False, user_answer=answer)
+
+    @classmethod
+    def wrong_answer_counts(cls, question):
+        """Number of incorrect answers per answer value, most common first"""
+        return (
+            cls.objects.filter(question=question, is_correct=False)
+            .values('user_answer').annotate(count=models.Count('id')).order_by('-count')
+        )
+
 
 class DailyProgress(models.Model):
     """Daily progress tracking"""
@@ -83,4 +109,98 @@ class DailyProgress(models.Model):
         verbose_name_plural = "Daily Progress"
 
     def __str__(self):
-        return f"{self.user.username} - {self.date}"
\ No newline at end of file
+        return f"{self.user.username} - {self.date}"
+
+
+class UserAchievement(models.Model):
+    """Achievement earned by a user, awarded by the rules in progress.achievements"""
+    CATEGORY_CHOICES = [
+        ('progress', 'Progress'),
+        ('plant', 'Plant'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='achievements')
+    code = models.CharField(max_length=50, help_text="Achievement rule code")
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    earned_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'code')
+        ordering = ['earned_at']
+        verbose_name_plural = "User Achievements"
+        indexes = [
+            models.Index(fields=['user', 'category', 'earned_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.code}"
+
+    @property
+    def rule(self):
+        from .achievements import get_rule
+        return get_rule(self.code)
+
+
+class XPTransaction(models.Model):
+    """Append-only XP ledger; each source can credit a user only once"""
+    SOURCE_CHOICES = [
+        ('question', 'Correct answer'),
+        ('level', 'Level completed'),
+        ('test', 'Test completed'),
+        ('plant_created', 'Plant created'),
+        ('plant_care', 'Plant care'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='xp_transactions')
+    amount = models.IntegerField()
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.CharField(max_length=64, help_text="Id of the question, level, attempt or log that earned the XP")
+    group = models.ForeignKey(
+        Group, on_delete=models.SET_NULL, null=True, blank=True, related_name='xp_transactions',
+        help_text="Group credited in GroupProgress, if any"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('user', 'source_type', 'source_id')
+        ordering = ['created_at']
+        verbose_name_plural = "XP Transactions"
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} +{self.amount} ({self.source_type} {self.source_id})"
+
+
+class ProgressSyncEvent(models.Model):
+    """Offline progress event already applied, keyed by its client idempotency key"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_sync_events')
+    idempotency_key = models.CharField(max_length=64)
+    level = models.ForeignKey(Level, on_delete=models.CASCADE, related_name='sync_events')
+    passed = models.BooleanField(default=False)
+    xp_earned = models.IntegerField(default=0)
+    occurred_at = models.DateTimeField(help_text="When the event happened on the device")
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'idempotency_key')
+        ordering = ['occurred_at']
+        verbose_name_plural = "Progress Sync Events"
+
+    def __str__(self):
+        return f"{self.user.username} - {self.idempotency_key}"
+
+
+@receiver(post_save, sender=LevelProgress)
+def award_progress_achievements(sender, instance, **kwargs):
+    """Award level and XP achievements when progress changes"""
+    from .achievements import on_level_progress_saved
+    on_level_progress_saved(instance)
+
+
+@receiver(progress_batch_saved)
+def award_batch_achievements(sender, user_id, **kwargs):
+    """Award level and XP achievements after a batched progress sync"""
+    from .achievements import award_achievements, progress_metrics
+    award_achievements(user_id, progress_metrics(user_id))
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import LevelProgress
+from .models import LevelProgress, UserAchievement
 
 
 class LevelProgressSerializer(serializers.ModelSerializer):
@@ -51,11 +51,13 @@ class RecentActivitySerializer(serializers.Serializer):
     score = serializers.FloatField()
 
 
-class AchievementSerializer(serializers.Serializer):
-    """Serializer for achievements"""
-    id = serializers.IntegerField()
-    name = serializers.CharField()
-    description = serializers.CharField()
-    icon = serializers.CharField()
-    unlocked = serializers.BooleanField()
-    unlocked_at = serializers.DateTimeField(allow_null=True)
\ No newline at end of file
+class AchievementSerializer(serializers.ModelSerializer):
+    """Serializer for earned achievements"""
+    id = serializers.CharField(source='code', read_only=True)
+    name = serializers.CharField(source='rule.name', read_only=True)
+    description = serializers.CharField(source='rule.description', read_only=True)
+    icon = serializers.CharField(source='rule.icon', read_only=True)
+    
+    class Meta:
+        model = UserAchievement
+        fields = ['id', 'name', 'description', 'icon', 'category', 'earned_at']
\ No newline at end of file
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after LevelProgress rows were written in bulk (no post_save fired),
+# with user_id and the set of local completion dates touched
+progress_batch_saved = Signal()
@@ -0,0 +1,227 @@
+"""
+Batched offline progress sync
+Devices that were offline upload their level completion events in one
+ordered batch. Each event carries a client-generated idempotency key that
+is recorded in ProgressSyncEvent, so a retried upload applies nothing
+twice. Whether an event passed and the XP it earns are worked out here from
+its score and the level, as for online completions; the client's own
+values are ignored. Events are merged into LevelProgress (best score and XP are kept,
+time and attempts accumulate) and written with bulk operations in one
+transaction.
+"""
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from levels.models import Level
+from .models import LevelProgress, ProgressSyncEvent
+from .signals import progress_batch_saved
+from .xp import XPAward, award_xp_batch
+
+MAX_SYNC_EVENTS = 500
+
+# Regular levels are passed at this percentage, test levels at their own
+DEFAULT_PASS_PERCENTAGE = 60
+
+PROGRESS_UPDATE_FIELDS = [
+    'is_completed', 'completion_percentage', 'questions_answered', 'correct_answers',
+    'wrong_answers', 'xp_earned', 'time_spent', 'attempts', 'completed_at',
+    'last_attempted', 'daily_level_completed',
+]
+
+
+class SyncConflict(Exception):
+    """Another upload recorded one of the same idempotency keys concurrently"""
+
+
+def _int(event, field, default=0):
+    value = event.get(field, default)
+    if value in (None, ''):
+        return default
+    value = int(value)
+    if value < 0:
+        raise ValueError(f'{field} must not be negative')
+    return value
+
+
+def clean_event(event, now):
+    """Validate one raw event into a dict of typed values, raising ValueError"""
+    if not isinstance(event, dict):
+        raise ValueError('Event must be an object')
+
+    key = str(event.get('idempotency_key') or '').strip()
+    if not key or len(key) > 64:
+        raise ValueError('idempotency_key is required (max 64 characters)')
+
+    total = _int(event, 'total', 6)
+    score = _int(event, 'score')
+    if score > total:
+        raise ValueError('score cannot exceed total')
+
+    occurred_at = event.get('occurred_at')
+    if occurred_at:
+        occurred_at = parse_datetime(str(occurred_at))
+        if occurred_at is None:
+            raise ValueError('occurred_at must be an ISO 8601 datetime')
+        if timezone.is_naive(occurred_at):
+            occurred_at = timezone.make_aware(occurred_at)
+    # Device clocks drift; never record a completion in the future
+    occurred_at = min(occurred_at or now, now)
+
+    return {
+        'idempotency_key': key,
+        'level_id': _int(event, 'level_id'),
+        'score': score,
+        'total': total,
+        'time_spent': _int(event, 'time_spent'),
+        'occurred_at': occurred_at,
+    }
+
+
+def score_event(event, level):
+    """Set passed and xp_earned on a cleaned event from its score and level"""
+    percentage = (event['score'] / event['total'] * 100) if event['total'] > 0 else 0
+    pass_percentage = level['test_pass_percentage'] if level['is_test_level'] else DEFAULT_PASS_PERCENTAGE
+    event['passed'] = percentage >= pass_percentage
+    event['xp_earned'] = level['xp_reward'] if event['passed'] else 0
+
+
+def merge_event(progress, event):
+    """Fold one event into a LevelProgress; replaying an old attempt never lowers it"""
+    percentage = (event['score'] / event['total'] * 100) if event['total'] > 0 else 0
+    if percentage >= progress.completion_percentage:
+        progress.completion_percentage = percentage
+        progress.questions_answered = event['total']
+        progress.correct_answers = event['score']
+        progress.wrong_answers = event['total'] - event['score']
+
+    progress.time_spent += event['time_spent']
+    progress.attempts += 1
+    progress.last_attempted = event['occurred_at']
+
+    if event['passed']:
+        progress.xp_earned = max(progress.xp_earned, event['xp_earned'])
+        if not progress.is_completed:
+            progress.is_completed = True
+            progress.daily_level_completed = True
+            progress.completed_at = event['occurred_at']
+
+
+def merge_into_progress(user, events, level_ids):
+    """Merge events into the user's locked LevelProgress rows, creating missing ones"""
+    existing = {
+        progress.level_id: progress
+        for progress in LevelProgress.objects.select_for_update().filter(user=user, level_id__in=level_ids)
+    }
+    created = {}
+    for event in events:
+        progress = existing.get(event['level_id']) or created.get(event['level_id'])
+        if progress is None:
+            progress = created[event['level_id']] = LevelProgress(user=user, level_id=event['level_id'])
+        merge_event(progress, event)
+
+    LevelProgress.objects.bulk_create(list(created.values()))
+    LevelProgress.objects.bulk_update(list(existing.values()), PROGRESS_UPDATE_FIELDS)
+
+
+def sync_progress_events(user, events):
+    """
+    Apply an ordered list of raw events for a user; returns one result per
+    event and the affected LevelProgress rows. Raises SyncConflict if a
+    concurrent upload claimed one of the keys first.
+    """
+    now = timezone.now()
+    results = []
+    cleaned = []
+    seen = set()
+    for index, raw in enumerate(events):
+        key = raw.get('idempotency_key') if isinstance(raw, dict) else None
+        try:
+            event = clean_event(raw, now)
+        except (TypeError, ValueError) as e:
+            results.append({'index': index, 'idempotency_key': key, 'status': 'rejected', 'error': str(e)})
+            continue
+        if event['idempotency_key'] in seen:
+            results.append({'index': index, 'idempotency_key': event['idempotency_key'], 'status': 'duplicate'})
+            continue
+        seen.add(event['idempotency_key'])
+        results.append({'index': index, 'idempotency_key': event['idempotency_key'], 'status': 'applied'})
+        cleaned.append((results[-1], event))
+
+    # One lookup against the key index for everything already synced
+    synced = set(
+        ProgressSyncEvent.objects.filter(
+            user=user, idempotency_key__in=[event['idempotency_key'] for _, event in cleaned]
+        ).values_list('idempotency_key', flat=True)
+    )
+    levels = {
+        level['id']: level
+        for level in Level.objects.filter(
+            id__in={event['level_id'] for _, event in cleaned}, is_active=True
+        ).values('id', 'group_id', 'xp_reward', 'is_test_level', 'test_pass_percentage')
+    }
+
+    to_apply = []
+    for result, event in cleaned:
+        if event['idempotency_key'] in synced:
+            result['status'] = 'duplicate'
+        elif event['level_id'] not in levels:
+            result['status'] = 'rejected'
+            result['error'] = 'Level not found'
+        else:
+            score_event(event, levels[event['level_id']])
+            to_apply.append(event)
+
+    if not to_apply:
+        return results, []
+
+    affected = {event['level_id'] for event in to_apply}
+    with transaction.atomic():
+        # Claim the keys first; a concurrent retry of the same upload
+        # fails here and the whole batch rolls back
+        try:
+            with transaction.atomic():
+                ProgressSyncEvent.objects.bulk_create([
+                    ProgressSyncEvent(
+                        user=user,
+                        idempotency_key=event['idempotency_key'],
+                        level_id=event['level_id'],
+                        occurred_at=event['occurred_at'],
+                        xp_earned=event['xp_earned'],
+                        passed=event['passed'],
+                    )
+                    for event in to_apply
+                ])
+        except IntegrityError:
+            raise SyncConflict('These events are already being synced; retry the upload')
+
+        try:
+            with transaction.atomic():
+                merge_into_progress(user, to_apply, affected)
+        except IntegrityError:
+            # An online completion created one of the rows after it was
+            # read; it is committed now, so lock it and merge again
+            merge_into_progress(user, to_apply, affected)
+
+        # Level XP goes through the ledger, so a level synced here and
+        # also completed online is only credited once
+        awards = [
+            XPAward(event['xp_earned'], 'level', event['level_id'], levels[event['level_id']]['group_id'])
+            for event in to_apply if event['passed']
+        ]
+        try:
+            with transaction.atomic():
+                award_xp_batch(user, awards)
+        except IntegrityError:
+            # A concurrent completion credited one of the levels first;
+            # the retry skips the sources already in the ledger
+            award_xp_batch(user, awards)
+
+    # Bulk writes skip post_save, so achievements, leaderboards and trends
+    # are refreshed once for the whole batch
+    days = {timezone.localdate(event['occurred_at']) for event in to_apply if event['passed']}
+    progress_batch_saved.send(sender=LevelProgress, user_id=user.id, days=days)
+
+    snapshot = LevelProgress.objects.filter(user=user, level_id__in=affected).select_related('level__group')
+    return results, list(snapshot)
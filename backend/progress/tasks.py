@@ -0,0 +1,52 @@
+from django.db import transaction
+
+from tasks.queue import task
+
+
+@task(max_attempts=8, retry_backoff=5)
+def record_daily_completion(completion_id):
+    """
+    Bring its user's DailyProgress for the day up to date with a level
+    completion. The row is recomputed from that day's LevelCompletion rows,
+    so a redelivered task leaves it unchanged: the day's first completion
+    counts in full, later ones only when passed.
+    """
+    from levels.models import LevelCompletion
+    from .models import DailyProgress
+
+    completion = LevelCompletion.objects.filter(pk=completion_id).first()
+    if completion is None:
+        return
+
+    day = completion.completed_at.date()
+    completions = LevelCompletion.objects.filter(
+        user_id=completion.user_id, completed_at__date=day
+    ).order_by('completed_at', 'id').values(
+        'passed', 'total_questions', 'correct_answers', 'xp_earned', 'time_taken_seconds'
+    )
+    totals = {
+        'levels_completed': 0, 'questions_answered': 0, 'correct_answers': 0,
+        'xp_earned': 0, 'time_spent': 0,
+    }
+    for index, row in enumerate(completions):
+        if index and not row['passed']:
+            continue
+        totals['levels_completed'] += 1 if row['passed'] else 0
+        totals['questions_answered'] += row['total_questions']
+        totals['correct_answers'] += row['correct_answers']
+        totals['xp_earned'] += row['xp_earned']
+        totals['time_spent'] += row['time_taken_seconds'] // 60
+
+    with transaction.atomic():
+        daily_progress, created = DailyProgress.objects.select_for_update().get_or_create(
+            user_id=completion.user_id,
+            date=day,
+            defaults={**totals, 'streak_maintained': True}
+        )
+
+        if created and daily_progress.date != day:
+            # date is auto_now_add; a retry that runs after midnight still
+            # belongs to the day the level was completed
+            DailyProgress.objects.filter(pk=daily_progress.pk).update(date=day)
+        elif not created:
+            DailyProgress.objects.filter(pk=daily_progress.pk).update(**totals)
@@ -1,3 +1,120 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
 from django.test import TestCase
+from django.utils import timezone
+
+from groups.models import Group
+from levels.models import Level, LevelCompletion
+from .models import DailyProgress, LevelProgress, ProgressSyncEvent, XPTransaction
+from .sync import SyncConflict, sync_progress_events
+from .tasks import record_daily_completion
+
+User = get_user_model()
+
+
+class RecordDailyCompletionTests(TestCase):
+    """DailyProgress is recomputed from the day's completions, so redelivery is harmless"""
+
+    def test_redelivered_task_does_not_double_count(self):
+        group = Group.objects.create(group_number=1, name='Group 1')
+        user = User.objects.create(username='daily_student')
+        completions = [
+            LevelCompletion.objects.create(
+                user=user, level=Level.objects.create(group=group, level_number=number, name=f'Level {number}'),
+                total_questions=6, correct_answers=correct, passed=passed, xp_earned=10 if passed else 0,
+                time_taken_seconds=120, started_at=timezone.now(),
+            )
+            for number, correct, passed in [(1, 5, True), (2, 2, False), (3, 6, True)]
+        ]
+
+        for completion in completions + completions:
+            record_daily_completion(completion.pk)
+
+        daily = DailyProgress.objects.get(user=user)
+        self.assertEqual(daily.date, completions[0].completed_at.date())
+        self.assertEqual(
+            (daily.levels_completed, daily.questions_answered, daily.correct_answers, daily.xp_earned, daily.time_spent),
+            (2, 12, 11, 20, 4),
+        )
+
+
+class SyncProgressTests(TestCase):
+    """Offline batches apply each event once and are scored on the server"""
+
+    def setUp(self):
+        group = Group.objects.create(group_number=1, name='Group 1')
+        self.level = Level.objects.create(group=group, level_number=1, name='Level 1', xp_reward=25)
+        self.user = User.objects.create(username='offline_student')
+        self.now = timezone.now()
+
+    def event(self, key, score, minutes_ago=0, **extra):
+        return {
+            'idempotency_key': key, 'level_id': self.level.pk, 'score': score, 'total': 6,
+            'time_spent': 60, 'occurred_at': (self.now - timedelta(minutes=minutes_ago)).isoformat(), **extra,
+        }
+
+    def ledger_total(self):
+        return XPTransaction.objects.filter(user=self.user).aggregate(total=Sum('amount'))['total'] or 0
+
+    def test_redelivered_batch_credits_xp_once(self):
+        batch = [self.event('a', 6), self.event('b', 5)]
+        sync_progress_events(self.user, batch)
+        results, _ = sync_progress_events(self.user, batch)
+
+        self.assertEqual([result['status'] for result in results], ['duplicate', 'duplicate'])
+        self.user.refresh_from_db()
+        self.assertEqual((self.ledger_total(), self.user.total_xp), (25, 25))
+        self.assertEqual(LevelProgress.objects.get(user=self.user).attempts, 2)
+
+    def test_client_xp_and_passed_are_ignored(self):
+        sync_progress_events(self.user, [self.event('a', 1, xp_earned=1000, passed=True)])
+
+        progress = LevelProgress.objects.get(user=self.user)
+        self.assertEqual((progress.is_completed, progress.xp_earned, self.ledger_total()), (False, 0, 0))
+
+    def test_older_event_arriving_later_does_not_lower_progress(self):
+        sync_progress_events(self.user, [self.event('late', 6, minutes_ago=5)])
+        sync_progress_events(self.user, [self.event('early', 2, minutes_ago=60)])
+
+        progress = LevelProgress.objects.get(user=self.user)
+        self.assertEqual((progress.completion_percentage, progress.correct_answers), (100, 6))
+        self.assertEqual((progress.is_completed, progress.xp_earned), (True, 25))
+        self.assertEqual((progress.attempts, progress.time_spent), (2, 120))
+
+    def test_reused_key_keeps_the_first_event(self):
+        sync_progress_events(self.user, [self.event('a', 2)])
+        results, _ = sync_progress_events(self.user, [self.event('a', 6)])
+
+        self.assertEqual(results[0]['status'], 'duplicate')
+        self.assertFalse(LevelProgress.objects.get(user=self.user).is_completed)
+        self.assertEqual(self.ledger_total(), 0)
+
+    def test_key_claimed_by_concurrent_upload_conflicts(self):
+        # The other upload claims the key after this one checked for it
+        ProgressSyncEvent.objects.create(
+            user=self.user, idempotency_key='a', level=self.level, occurred_at=self.now,
+        )
+        with mock.patch.object(ProgressSyncEvent.objects, 'filter', return_value=ProgressSyncEvent.objects.none()):
+            with self.assertRaises(SyncConflict):
+                sync_progress_events(self.user, [self.event('a', 6)])
+
+        self.assertFalse(LevelProgress.objects.filter(user=self.user).exists())
+        self.assertEqual(self.ledger_total(), 0)
+
+    def test_progress_row_created_concurrently_is_merged(self):
+        # An online completion creates the row after this sync read none
+        LevelProgress.objects.create(user=self.user, level=self.level, attempts=1, time_spent=30)
+        select_for_update = LevelProgress.objects.select_for_update
+        reads = iter([LevelProgress.objects.none])
+        with mock.patch.object(
+            LevelProgress.objects, 'select_for_update', side_effect=lambda: next(reads, select_for_update)()
+        ):
+            results, _ = sync_progress_events(self.user, [self.event('a', 6)])
 
-# Create your tests here.
+        self.assertEqual(results[0]['status'], 'applied')
+        progress = LevelProgress.objects.get(user=self.user)
+        self.assertEqual((progress.attempts, progress.time_spent, progress.is_completed), (2, 90, True))
+        self.assertEqual(self.ledger_total(), 25)
@@ -10,4 +10,5 @@ urlpatterns = [
     # Progress management
     path('save/', views.save_progress, name='save-progress'),
     path('load/', views.load_progress, name='load-progress'),
+    path('sync/', views.sync_progress, name='sync-progress'),
 ]
\ No newline at end of file
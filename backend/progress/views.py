@@ -4,7 +4,9 @@ from rest_framework import status, permissions
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models import Sum, Avg
-from .models import LevelProgress
+from .models import LevelProgress, UserAchievement
+from .achievements import RULES_BY_CODE, progress_metrics
+from .sync import MAX_SYNC_EVENTS, SyncConflict, sync_progress_events
 from levels.models import Level, Question
 from groups.models import Group, GroupProgress
 from .serializers import LevelProgressSerializer, ProgressOverviewSerializer, RecentActivitySerializer, AchievementSerializer
@@ -183,6 +185,36 @@ def save_progress(request):
     })
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def sync_progress(request):
+    """Apply a batch of offline completion events, each at most once"""
+    events = request.data.get('events')
+    if not isinstance(events, list) or not events:
+        return Response(
+            {'error': 'events must be a non-empty list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(events) > MAX_SYNC_EVENTS:
+        return Response(
+            {'error': f'At most {MAX_SYNC_EVENTS} events per sync'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        results, progress = sync_progress_events(request.user, events)
+    except SyncConflict as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+    
+    return Response({
+        'success': True,
+        'results': results,
+        'applied': sum(1 for result in results if result['status'] == 'applied'),
+        'progress': LevelProgressSerializer(progress, many=True).data,
+        'totals': progress_metrics(request.user.id),
+    })
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def load_progress(request):
@@ -229,59 +261,9 @@ def recent_activity(request):
 @permission_classes([permissions.IsAuthenticated])
 def achievements(request):
     """Get user's achievements"""
-    user = request.user
-    
-    # Calculate achievements based on progress
-    achievements = []
-    
-    # Level completion achievements
-    completed_levels = LevelProgress.objects.filter(user=user, is_completed=True).count()
-    if completed_levels >= 1:
-        achievements.append({
-            'id': 'first_level',
-            'name': 'First Steps',
-            'description': 'Complete your first level',
-            'icon': '🎯',
-            'earned_at': timezone.now()
-        })
-    
-    if completed_levels >= 10:
-        achievements.append({
-            'id': 'level_10',
-            'name': 'Getting Started',
-            'description': 'Complete 10 levels',
-            'icon': '🌟',
-            'earned_at': timezone.now()
-        })
-    
-    if completed_levels >= 50:
-        achievements.append({
-            'id': 'level_50',
-            'name': 'Halfway There',
-            'description': 'Complete 50 levels',
-            'icon': '🏆',
-            'earned_at': timezone.now()
-        })
-    
-    # XP achievements
-    total_xp = LevelProgress.objects.filter(user=user).aggregate(total=Sum('xp_earned'))['total'] or 0
-    if total_xp >= 100:
-        achievements.append({
-            'id': 'xp_100',
-            'name': 'XP Collector',
-            'description': 'Earn 100 XP',
-            'icon': '⚡',
-            'earned_at': timezone.now()
-        })
-    
-    if total_xp >= 500:
-        achievements.append({
-            'id': 'xp_500',
-            'name': 'XP Master',
-            'description': 'Earn 500 XP',
-            'icon': '🔥',
-            'earned_at': timezone.now()
-        })
-    
-    serializer = AchievementSerializer(achievements, many=True)
+    # Awarded incrementally by progress.achievements, so this is a plain read
+    earned = UserAchievement.objects.filter(
+        user=request.user, category='progress', code__in=list(RULES_BY_CODE)
+    )
+    serializer = AchievementSerializer(earned, many=True)
     return Response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+XP ledger
+Every XP award is an XPTransaction row keyed by its source (the question,
+level, test attempt or plant action that earned it), so a retried request
+cannot credit the same source twice. The cached totals on User,
+GroupProgress and UserPlant are bumped with F() updates that touch only the
+counter column; reconcile_xp recomputes them from the ledger.
+"""
+
+from typing import NamedTuple, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from groups.models import GroupProgress
+from plants.models import UserPlant
+from users.models import User
+from .models import LevelProgress, XPTransaction
+
+
+class XPAward(NamedTuple):
+    amount: int
+    source_type: str
+    source_id: object
+    group_id: Optional[int] = None
+
+
+def award_xp_batch(user, awards):
+    """
+    Record awards whose source has not credited this user yet and bump the
+    cached totals; returns the XP actually credited. Raises IntegrityError
+    if a concurrent request recorded one of the sources first.
+    """
+    pending = {}
+    for award in awards:
+        if award.amount > 0:
+            pending.setdefault((award.source_type, str(award.source_id)), award)
+    if not pending:
+        return 0
+
+    already = set(
+        XPTransaction.objects.filter(
+            user=user,
+            source_type__in={source_type for source_type, _ in pending},
+            source_id__in={source_id for _, source_id in pending},
+        ).values_list('source_type', 'source_id')
+    )
+    new_awards = [(key, award) for key, award in pending.items() if key not in already]
+    if not new_awards:
+        return 0
+
+    total = sum(award.amount for _, award in new_awards)
+    by_group = {}
+    for _, award in new_awards:
+        if award.group_id:
+            by_group[award.group_id] = by_group.get(award.group_id, 0) + award.amount
+
+    with transaction.atomic():
+        # The unique (user, source_type, source_id) index is the real guard
+        XPTransaction.objects.bulk_create([
+            XPTransaction(
+                user=user, amount=award.amount, source_type=source_type,
+                source_id=source_id, group_id=award.group_id,
+            )
+            for (source_type, source_id), award in new_awards
+        ])
+        User.objects.filter(pk=user.pk).update(total_xp=F('total_xp') + total)
+        for group_id, amount in by_group.items():
+            GroupProgress.objects.filter(user=user, group_id=group_id).update(
+                total_xp_earned=F('total_xp_earned') + amount
+            )
+        plant = UserPlant.objects.filter(user=user).first()
+        if plant:
+            plant.update_progress(xp_earned=total)
+
+    # Keep the request's user object in step without re-reading it
+    user.total_xp = (user.total_xp or 0) + total
+
+    from .achievements import on_xp_awarded
+    on_xp_awarded(user.pk, User.objects.filter(pk=user.pk).values_list('total_xp', flat=True).first() or 0)
+    return total
+
+
+def award_xp(user, amount, source_type, source_id, group_id=None):
+    """Credit XP for one source at most once; returns the XP credited"""
+    try:
+        return award_xp_batch(user, [XPAward(amount, source_type, source_id, group_id)])
+    except IntegrityError:
+        # A concurrent request credited this source first
+        return 0
+
+
+def backfill_ledger(batch_size=1000):
+    """Create ledger rows for level XP recorded before the ledger existed; returns rows added"""
+    progress = (
+        LevelProgress.objects.filter(xp_earned__gt=0)
+        .values('user_id', 'level_id', 'level__group_id', 'xp_earned', 'completed_at', 'started_at')
+        .order_by('pk')
+    )
+    before = XPTransaction.objects.count()
+    batch = []
+    for row in progress.iterator(chunk_size=batch_size):
+        batch.append(XPTransaction(
+            user_id=row['user_id'], amount=row['xp_earned'], source_type='level',
+            source_id=str(row['level_id']), group_id=row['level__group_id'],
+            created_at=row['completed_at'] or row['started_at'],
+        ))
+        if len(batch) >= batch_size:
+            XPTransaction.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        XPTransaction.objects.bulk_create(batch, ignore_conflicts=True)
+    return XPTransaction.objects.count() - before
+
+
+def _ledger_sum(**filters):
+    ledger = XPTransaction.objects.filter(**filters).order_by().values('user_id')
+    return Coalesce(Subquery(ledger.annotate(total=Sum('amount')).values('total')[:1]), Value(0))
+
+
+def reconcile_totals(dry_run=False, batch_size=1000):
+    """Recompute cached XP totals from the ledger; returns rows corrected per model"""
+    targets = [
+        (User, 'total_xp', User.objects.annotate(ledger=_ledger_sum(user=OuterRef('pk')))),
+        (GroupProgress, 'total_xp_earned', GroupProgress.objects.annotate(
+            ledger=_ledger_sum(user=OuterRef('user'), group=OuterRef('group'))
+        )),
+        # Plants collect the XP earned since they were planted
+        (UserPlant, 'total_xp', UserPlant.objects.annotate(
+            ledger=_ledger_sum(user=OuterRef('user'), created_at__gte=OuterRef('created_at'))
+        )),
+    ]
+
+    report = {}
+    for model, field, queryset in targets:
+        drifted = [
+            model(pk=pk, **{field: ledger})
+            for pk, ledger in queryset.exclude(**{field: F('ledger')}).values_list('pk', 'ledger').iterator()
+        ]
+        if not dry_run:
+            model.objects.bulk_update(drifted, [field], batch_size=batch_size)
+        report[model._meta.verbose_name_plural] = len(drifted)
+    return report
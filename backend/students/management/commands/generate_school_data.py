@@ -0,0 +1,61 @@
+"""
+Django management command to generate a synthetic large school
+Usage: python manage.py generate_school_data --campuses 5 --grades 10 --students 20000 --days 120
+
+Creates campuses, grades, teachers and students with User accounts plus
+their simulated LevelProgress, QuestionProgress, DailyProgress, LoginLog and
+XP ledger history, using bulk inserts with no signals. Every generated
+account's password is synthetic-pass-123. Meant for scale testing databases
+only.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from students.synthetic import SchoolGenerator, ensure_curriculum
+
+
+class Command(BaseCommand):
+    help = 'Generate campuses, teachers, students and months of learning activity for scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--campuses', type=int, default=3, help='Number of campuses')
+        parser.add_argument('--grades', type=int, default=10, help='Grades per campus (one English teacher each)')
+        parser.add_argument('--students', type=int, default=10000, help='Total number of students')
+        parser.add_argument('--days', type=int, default=90, help='Days of activity history to simulate')
+        parser.add_argument('--levels', type=int, default=60, help='Levels to create if there is no curriculum yet')
+        parser.add_argument('--prefix', type=str, default='S', help='Campus code prefix (S gives S01, S02, ...)')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible dataset')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        for name in ('campuses', 'grades', 'students', 'days', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1")
+
+        started = time.monotonic()
+        created = ensure_curriculum(levels=options['levels'])
+        if created:
+            self.stdout.write(f'No curriculum found, created {created} synthetic levels')
+
+        generator = SchoolGenerator(
+            campuses=options['campuses'],
+            grades=options['grades'],
+            students=options['students'],
+            days=options['days'],
+            prefix=options['prefix'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+        )
+        try:
+            counts = generator.generate()
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name, count in counts.items():
+            self.stdout.write(f'  {name}: {count}')
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {total} rows in {time.monotonic() - started:.1f}s'
+        ))
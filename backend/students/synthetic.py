@@ -0,0 +1,357 @@
+"""
+Synthetic school data for scale testing
+Builds campuses, grades, teachers and students with their User rows, then
+simulates each student's history: a skewed number of levels completed in
+sessions on mostly school days, six answered questions per level attempt,
+one DailyProgress row and a login per session, and the matching XP ledger
+rows. Accounts are written with bulk_create and the activity rows with
+executemany INSERTs of plain values, so no model save() or post_save signal
+runs and the simulated timestamps are kept as generated.
+"""
+
+import math
+import random
+from datetime import datetime, time as dt_time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from campus.models import Campus
+from classes.models import Grade
+from groups.models import Group
+from levels.models import Level, Question
+from progress.models import DailyProgress, LevelProgress, QuestionProgress, XPTransaction
+from teachers.models import Teacher
+from users.models import LoginLog, User
+from .models import Student
+
+SYNTHETIC_PASSWORD = 'synthetic-pass-123'
+QUESTIONS_PER_LEVEL = 6
+PASS_RATIO = 0.6
+USER_AGENTS = [
+    'Mozilla/5.0 (Linux; Android 12) Chrome/118.0 Mobile',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/118.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) Safari/604.1',
+]
+
+def _adapter(field):
+    """Python to database value conversion for the column types that need one"""
+    internal_type = field.get_internal_type()
+    if internal_type == 'DateTimeField':
+        return connection.ops.adapt_datetimefield_value
+    if internal_type == 'DateField':
+        return connection.ops.adapt_datefield_value
+    if internal_type == 'JSONField':
+        return lambda value: field.get_db_prep_save(value, connection)
+    return None
+
+
+def insert_rows(model, columns, rows):
+    """
+    INSERT rows of values for the given attnames with one executemany.
+    Building model instances costs far more than the insert itself at this
+    volume; columns left out get the field default.
+    """
+    meta = model._meta
+    fields = [meta.get_field(column) for column in columns]
+    omitted = [field for field in meta.concrete_fields if not field.primary_key and field.attname not in columns]
+    defaults = tuple(field.get_db_prep_save(field.get_default(), connection) for field in omitted)
+    adapters = [(index, adapter) for index, adapter in enumerate(map(_adapter, fields)) if adapter]
+
+    params = []
+    for row in rows:
+        row = list(row)
+        for index, adapter in adapters:
+            if row[index] is not None:
+                row[index] = adapter(row[index])
+        params.append(tuple(row) + defaults)
+
+    quote = connection.ops.quote_name
+    names = [field.column for field in fields + omitted]
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(meta.db_table), ', '.join(map(quote, names)), ', '.join(['%s'] * len(names))
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def ensure_curriculum(levels=60, levels_per_group=20):
+    """Create a plain curriculum when the database has no levels yet"""
+    if Level.objects.exists():
+        return 0
+    groups = math.ceil(levels / levels_per_group)
+    Group.objects.bulk_create([
+        Group(group_number=number, name=f'Synthetic Group {number}') for number in range(groups)
+    ])
+    group_ids = dict(Group.objects.values_list('group_number', 'id'))
+    Level.objects.bulk_create([
+        Level(
+            group_id=group_ids[(number - 1) // levels_per_group], level_number=number,
+            name=f'Synthetic Level {number}', is_test_level=number % 10 == 0,
+        )
+        for number in range(1, levels + 1)
+    ])
+    Question.objects.bulk_create([
+        Question(
+            level=level, question_order=order, question_type='mcq',
+            question_text=f'Synthetic question {order}', options=['A', 'B', 'C', 'D'],
+            correct_answer='A',
+        )
+        for level in Level.objects.all() for order in range(1, QUESTIONS_PER_LEVEL + 1)
+    ])
+    return levels
+
+
+def load_curriculum():
+    """Active levels in order with their questions' (id, xp_value)"""
+    questions = {}
+    for question_id, level_id, xp_value in (
+        Question.objects.filter(is_active=True).order_by('question_order').values_list('id', 'level_id', 'xp_value')
+    ):
+        questions.setdefault(level_id, []).append((question_id, xp_value))
+    return [
+        {'id': level_id, 'group_id': group_id, 'xp_reward': xp_reward, 'questions': questions.get(level_id, [])}
+        for level_id, group_id, xp_reward in (
+            Level.objects.filter(is_active=True).order_by('level_number').values_list('id', 'group_id', 'xp_reward')
+        )
+    ]
+
+
+class SchoolGenerator:
+    """Generates one synthetic school; returns row counts per model from generate()"""
+
+    def __init__(self, campuses=3, grades=10, students=10000, days=90, prefix='S',
+                 seed=None, batch_size=5000, inactive_share=0.15, stdout=None):
+        self.campuses = campuses
+        self.grades = grades
+        self.students = students
+        self.days = days
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.inactive_share = inactive_share
+        self.rng = random.Random(seed)
+        self.stdout = stdout
+        self.password = make_password(SYNTHETIC_PASSWORD)
+        self.today = timezone.localdate()
+        self.counts = {}
+        self.pending = {}
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    def add(self, model, **values):
+        columns, rows = self.pending.setdefault(model, (tuple(values), []))
+        rows.append(tuple(values[column] for column in columns))
+        if len(rows) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model=None):
+        for current in [model] if model else list(self.pending):
+            columns, rows = self.pending.pop(current, ((), []))
+            if rows:
+                insert_rows(current, columns, rows)
+                name = current._meta.verbose_name_plural
+                self.counts[name] = self.counts.get(name, 0) + len(rows)
+
+    def generate(self):
+        self.curriculum = load_curriculum()
+        if not self.curriculum:
+            raise ValueError('No active levels to simulate progress on')
+        # Weekdays are four times as likely to be study days as weekends
+        self.study_days = [
+            day for offset in range(self.days, 0, -1)
+            for day in [self.today - timedelta(days=offset - 1)]
+            for _ in range(4 if day.weekday() < 5 else 1)
+        ]
+
+        classes = self.create_school()
+        per_class = math.ceil(self.students / len(classes))
+        serial = 0
+        while serial < self.students:
+            chunk = min(self.batch_size, self.students - serial)
+            with transaction.atomic():
+                users = self.create_students(classes, per_class, serial, chunk)
+                for user in users:
+                    self.simulate(user)
+                self.flush()
+                self.update_users(users)
+            serial += chunk
+            self.log(f'{serial}/{self.students} students generated')
+        return self.counts
+
+    def create_school(self):
+        """Campuses, grades and one English teacher per grade; returns (campus, grade, teacher) per class"""
+        codes = [f'{self.prefix}{number:02d}' for number in range(1, self.campuses + 1)]
+        if Campus.objects.filter(campus_code__in=codes).exists():
+            raise ValueError(f'Campus codes {codes[0]}..{codes[-1]} already exist; choose another prefix')
+
+        campuses = Campus.objects.bulk_create([
+            Campus(campus_name=f'Synthetic Campus {code}', campus_code=code, city='Karachi')
+            for code in codes
+        ])
+        self.counts['campuses'] = len(campuses)
+
+        teachers, grades, teacher_users = [], [], []
+        for campus in campuses:
+            for number in range(1, self.grades + 1):
+                email = f'{campus.campus_code.lower()}.grade{number}@synthetic.school'
+                teachers.append(Teacher(
+                    name=f'Teacher {campus.campus_code} G{number}', campus=campus, email=email,
+                    password=self.password, teacher_id=f'{campus.campus_code}-M-T-{number:03d}',
+                ))
+                teacher_users.append(User(
+                    username=f'teacher_{email.split("@")[0]}', email=email, role='teacher',
+                    first_name='Teacher', last_name=f'{campus.campus_code} G{number}',
+                    is_verified=True, password=self.password,
+                ))
+        Teacher.objects.bulk_create(teachers)
+        User.objects.bulk_create(teacher_users)
+
+        teacher_iter = iter(teachers)
+        for campus in campuses:
+            for number in range(1, self.grades + 1):
+                grades.append(Grade(
+                    name=f'Grade {number}', campus=campus, english_teacher=next(teacher_iter),
+                    code=f'{campus.campus_code}-G{number:02d}',
+                ))
+        Grade.objects.bulk_create(grades)
+        self.counts['teachers'] = len(teachers)
+        self.counts['grades'] = len(grades)
+        return [(grade.campus, grade, grade.english_teacher) for grade in grades]
+
+    def create_students(self, classes, per_class, start, count):
+        students, users = [], []
+        for serial in range(start, start + count):
+            campus, grade, teacher = classes[serial // per_class]
+            student_id = f'{campus.campus_code}-M-G{grade.name.split()[-1].zfill(2)}-{serial % per_class + 1:04d}'
+            name = f'Student {serial + 1}'
+            students.append(Student(
+                name=name, grade=grade.name, campus=campus, class_teacher=teacher,
+                password=self.password, student_id=student_id,
+            ))
+            users.append(User(
+                username=f'student_{student_id}', first_name='Student', last_name=str(serial + 1),
+                role='student', is_verified=True, student_id=student_id, password=self.password,
+                created_at=timezone.now() - timedelta(days=self.days),
+            ))
+        Student.objects.bulk_create(students, batch_size=self.batch_size)
+        self.counts['students'] = self.counts.get('students', 0) + len(students)
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
+
+    def update_users(self, users):
+        """Cached XP totals from the ledger and last login from the login log"""
+        ledger = XPTransaction.objects.filter(user=OuterRef('pk')).order_by().values('user')
+        logins = LoginLog.objects.filter(user=OuterRef('pk'), success=True).order_by().values('user')
+        User.objects.filter(pk__in=[user.pk for user in users]).update(
+            total_xp=Coalesce(Subquery(ledger.annotate(total=Sum('amount')).values('total')), Value(0)),
+            last_login=Subquery(logins.annotate(latest=Max('attempted_at')).values('latest')),
+        )
+
+    def moment(self, day, minutes_in):
+        start = datetime.combine(day, dt_time(hour=self.rng.randint(8, 19)))
+        return timezone.make_aware(start) + timedelta(minutes=minutes_in)
+
+    def simulate(self, user):
+        """Sessions, level attempts, answers, daily rows, logins and XP for one student"""
+        rng = self.rng
+        if rng.random() < self.inactive_share:
+            target = 0
+        else:
+            # Heavy-tailed: most students finish a handful of levels, a few race ahead
+            target = min(len(self.curriculum), int(rng.paretovariate(1.3) * 4))
+        skill = rng.betavariate(5, 2)
+
+        sessions = max(1, math.ceil(target / 2)) if target else rng.randint(0, 2)
+        days = set()
+        while len(days) < min(sessions, self.days):
+            days.add(rng.choice(self.study_days))
+
+        level_index = 0
+        for day in sorted(days):
+            minutes = 0
+            daily = {'levels': 0, 'answered': 0, 'correct': 0, 'xp': 0, 'seconds': 0}
+            session_start = self.moment(day, 0)
+            ip_address = f'10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}'
+            user_agent = rng.choice(USER_AGENTS)
+            if rng.random() < 0.05:
+                self.add(
+                    LoginLog, user_id=user.pk, login_method='student_name', success=False,
+                    failure_reason='Invalid password', attempted_at=session_start - timedelta(minutes=1),
+                    ip_address=ip_address, user_agent=user_agent,
+                )
+            self.add(
+                LoginLog, user_id=user.pk, login_method='student_name', success=True,
+                failure_reason=None, attempted_at=session_start,
+                ip_address=ip_address, user_agent=user_agent,
+            )
+
+            for _ in range(rng.randint(1, 3)):
+                if level_index >= target:
+                    break
+                level = self.curriculum[level_index]
+                spent = rng.randint(90, 600)
+                started = session_start + timedelta(minutes=minutes)
+                minutes += spent // 60 + 1
+
+                attempts, correct = 0, 0
+                while attempts < 3:
+                    attempts += 1
+                    correct = sum(rng.random() < skill for _ in level['questions'])
+                    if correct >= len(level['questions']) * PASS_RATIO:
+                        break
+                answered = len(level['questions'])
+                passed = answered and correct >= answered * PASS_RATIO
+                finished = started + timedelta(seconds=spent)
+                xp = level['xp_reward'] if passed else 0
+                earned = xp
+
+                self.add(
+                    LevelProgress, user_id=user.pk, level_id=level['id'], is_completed=bool(passed),
+                    completion_percentage=correct / answered * 100 if answered else 0,
+                    questions_answered=answered, correct_answers=correct, wrong_answers=answered - correct,
+                    xp_earned=xp, time_spent=spent, attempts=attempts, started_at=started,
+                    completed_at=finished if passed else None, last_attempted=finished,
+                    daily_level_completed=bool(passed),
+                )
+                right = set(rng.sample(range(answered), correct))
+                for position, (question_id, xp_value) in enumerate(level['questions']):
+                    is_correct = position in right
+                    self.add(
+                        QuestionProgress, user_id=user.pk, question_id=question_id, is_answered=True, is_correct=is_correct,
+                        user_answer='A' if is_correct else rng.choice(['B', 'C', 'D']),
+                        time_spent=spent // answered, attempts=attempts,
+                        xp_earned=xp_value if is_correct else 0,
+                        first_attempted=started, answered_at=finished,
+                    )
+                    if is_correct:
+                        self.add(
+                            XPTransaction, user_id=user.pk, amount=xp_value, source_type='question', source_id=str(question_id),
+                            group_id=level['group_id'], created_at=finished,
+                        )
+                        earned += xp_value
+                if passed:
+                    self.add(
+                        XPTransaction, user_id=user.pk, amount=xp, source_type='level', source_id=str(level['id']),
+                        group_id=level['group_id'], created_at=finished,
+                    )
+                    level_index += 1
+                else:
+                    # Stuck on this level; the student stops progressing
+                    target = level_index
+
+                daily['levels'] += 1 if passed else 0
+                daily['answered'] += answered
+                daily['correct'] += correct
+                daily['xp'] += earned
+                daily['seconds'] += spent
+
+            self.add(
+                DailyProgress, user_id=user.pk, date=day, levels_completed=daily['levels'],
+                questions_answered=daily['answered'], correct_answers=daily['correct'],
+                xp_earned=daily['xp'], time_spent=daily['seconds'] // 60,
+                streak_maintained=daily['levels'] > 0,
+            )
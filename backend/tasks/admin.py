@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'priority', 'run_at', 'attempts', 'max_attempts', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'unique_key']
+    readonly_fields = ['last_error', 'locked_by', 'locked_at', 'created_at', 'finished_at']
+    actions = ['retry_tasks']
+
+    @admin.action(description='Retry selected tasks now')
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status='running').update(
+            status='queued', run_at=timezone.now(), attempts=0, last_error='', finished_at=None,
+        )
+        self.message_user(request, f'{updated} tasks queued for retry')
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background tasks on a thread pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=getattr(settings, 'TASKS_CONCURRENCY', 4),
+            help='Tasks run at the same time (threads)'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to wait before polling again when no task is due'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once no task is due, e.g. when run from cron'
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+
+        worker = Worker(options['concurrency'], options['poll_interval'], stdout=self.stdout)
+        processed, failed = worker.run(burst=options['burst'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Worker stopped after {processed} tasks ({failed} failed or retrying)'
+        ))
@@ -0,0 +1,50 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """A deferred call to a registered @task function, claimed by run_tasks workers"""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=200, help_text="Registered task name")
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    priority = models.SmallIntegerField(default=0, help_text="Higher runs first")
+    run_at = models.DateTimeField(default=timezone.now, help_text="Not claimed before this time")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    unique_key = models.CharField(
+        max_length=200, blank=True, null=True,
+        help_text="At most one queued or running task per key"
+    )
+    last_error = models.TextField(blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Task"
+        verbose_name_plural = "Tasks"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at', 'priority'], name='task_due_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['unique_key'],
+                condition=Q(status__in=['queued', 'running']),
+                name='task_unique_pending_key',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.status})"
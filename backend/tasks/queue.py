@@ -0,0 +1,196 @@
+"""
+Database-backed task queue
+Functions decorated with @task are registered by name; calling .enqueue()
+stores a Task row (in the caller's transaction, so a rolled-back request
+leaves no task behind) and returns at once. run_tasks workers claim due
+rows with a compare-and-set UPDATE, which is safe across processes on both
+SQLite and Postgres, run them on a thread pool and retry failures with
+exponential backoff. Delivery is at-least-once, so tasks must be safe to
+run twice. Periodic tasks (every=seconds) reschedule themselves after each
+run. No broker is needed; the queue lives in the application database,
+but a run_tasks worker must be running (or TASKS_RUN_EAGERLY set) for
+queued tasks to run at all.
+"""
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 60 * 60
+
+# Registered TaskFunction per task name
+_registry = {}
+
+
+class TaskFunction:
+    """A registered task: call it to run inline, .enqueue() to run on a worker"""
+
+    def __init__(self, func, name, max_attempts, retry_backoff, priority, every):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.priority = priority
+        self.every = every
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<task {self.name}>'
+
+    def enqueue(self, *args, **kwargs):
+        """Queue a call with JSON-serialisable arguments to run as soon as possible"""
+        return self.schedule(args=args, kwargs=kwargs)
+
+    def schedule(self, args=(), kwargs=None, run_at=None, countdown=None, unique_key=None, priority=None):
+        """
+        Queue a call to run at ``run_at`` or ``countdown`` seconds from now.
+        With a ``unique_key`` nothing is queued while a task with the same key
+        is still queued or running; returns the new Task, or None.
+        """
+        kwargs = kwargs or {}
+        if getattr(settings, 'TASKS_RUN_EAGERLY', False):
+            transaction.on_commit(lambda: self.func(*args, **kwargs))
+            return None
+
+        if run_at is None:
+            run_at = timezone.now() + timedelta(seconds=countdown or 0)
+        task = Task(
+            name=self.name, args=list(args), kwargs=kwargs, run_at=run_at,
+            priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts, unique_key=unique_key,
+        )
+        if unique_key is None:
+            task.save()
+            return task
+        try:
+            with transaction.atomic():
+                task.save()
+        except IntegrityError:
+            return None
+        return task
+
+
+def task(name=None, max_attempts=5, retry_backoff=10, priority=0, every=None):
+    """
+    Register a function as a task. ``retry_backoff`` is the first retry
+    delay in seconds, doubled on each further attempt; ``every`` makes the
+    task periodic with that many seconds between runs.
+    """
+    def register(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        registered = TaskFunction(func, task_name, max_attempts, retry_backoff, priority, every)
+        _registry[task_name] = registered
+        return registered
+    return register
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def periodic_tasks():
+    return [registered for registered in _registry.values() if registered.every]
+
+
+def periodic_key(registered):
+    return f'periodic:{registered.name}'
+
+
+def ensure_periodic():
+    """Queue every periodic task that has no pending run yet"""
+    for registered in periodic_tasks():
+        registered.schedule(unique_key=periodic_key(registered))
+
+
+def claim_tasks(worker_id, limit):
+    """Mark up to ``limit`` due tasks as running for this worker and return them"""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    candidates = list(
+        Task.objects.filter(status='queued', run_at__lte=now)
+        .order_by('-priority', 'run_at', 'id')
+        .values_list('id', flat=True)[:limit * 2]
+    )
+    claimed = []
+    for pk in candidates:
+        # Only one worker's UPDATE can still see the row as queued
+        won = Task.objects.filter(pk=pk, status='queued').update(
+            status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1,
+        )
+        if won:
+            claimed.append(pk)
+            if len(claimed) == limit:
+                break
+    return list(Task.objects.filter(pk__in=claimed).order_by('-priority', 'run_at', 'id'))
+
+
+def retry_delay(registered, attempts):
+    """Seconds before the next attempt: exponential backoff with jitter"""
+    base = registered.retry_backoff if registered else 10
+    delay = min(base * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def run_task(task):
+    """Run a claimed task and record its outcome; returns True on success"""
+    registered = get_task(task.name)
+    try:
+        if registered is None:
+            raise LookupError(f'No task registered as {task.name}')
+        registered.func(*task.args, **task.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Task %s #%s failed (attempt %s/%s)', task.name, task.pk, task.attempts, task.max_attempts)
+        if task.attempts < task.max_attempts:
+            Task.objects.filter(pk=task.pk).update(
+                status='queued', locked_by='', locked_at=None, last_error=error,
+                run_at=timezone.now() + timedelta(seconds=retry_delay(registered, task.attempts)),
+            )
+            return False
+        Task.objects.filter(pk=task.pk).update(
+            status='failed', locked_by='', last_error=error, finished_at=timezone.now(),
+        )
+        succeeded = False
+    else:
+        Task.objects.filter(pk=task.pk).update(
+            status='succeeded', locked_by='', last_error='', finished_at=timezone.now(),
+        )
+        succeeded = True
+
+    if registered is not None and registered.every:
+        registered.schedule(countdown=registered.every, unique_key=periodic_key(registered))
+    return succeeded
+
+
+def requeue_stale(lock_timeout):
+    """Release tasks whose worker died mid-run; returns how many were released"""
+    cutoff = timezone.now() - timedelta(seconds=lock_timeout)
+    stale = Task.objects.filter(status='running', locked_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', locked_by='', last_error='Worker lost while running', finished_at=timezone.now(),
+    )
+    released = stale.update(status='queued', locked_by='', locked_at=None, last_error='Worker lost while running')
+    return failed + released
+
+
+def prune_tasks(days):
+    """Delete tasks that succeeded more than ``days`` ago; returns rows deleted"""
+    deleted, _ = Task.objects.filter(
+        status='succeeded', finished_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Task
+from .queue import claim_tasks, ensure_periodic, requeue_stale, retry_delay, run_task, task
+
+calls = []
+
+
+@task(name='tests.record', priority=1)
+def record(value):
+    calls.append(value)
+
+
+@task(name='tests.fail', max_attempts=2, retry_backoff=10)
+def fail():
+    raise RuntimeError('boom')
+
+
+@task(name='tests.periodic', every=300)
+def periodic():
+    calls.append('periodic')
+
+
+@override_settings(TASKS_RUN_EAGERLY=False)
+class TaskQueueTests(TestCase):
+    """Claiming, retries, unique keys and periodic tasks of the database queue"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_claim_takes_due_tasks_once_by_priority(self):
+        low = record.schedule(args=['low'], priority=0)
+        high = record.enqueue('high')
+        later = record.schedule(args=['later'], countdown=60)
+
+        claimed = claim_tasks('worker-1', limit=5)
+        self.assertEqual([claimed_task.pk for claimed_task in claimed], [high.pk, low.pk])
+        self.assertTrue(all(
+            claimed_task.status == 'running' and claimed_task.locked_by == 'worker-1' and claimed_task.attempts == 1
+            for claimed_task in claimed
+        ))
+        # Running and future tasks are not handed to another worker
+        self.assertEqual(claim_tasks('worker-2', limit=5), [])
+        self.assertEqual(Task.objects.get(pk=later.pk).status, 'queued')
+
+        for claimed_task in claimed:
+            self.assertTrue(run_task(claimed_task))
+        self.assertEqual(calls, ['high', 'low'])
+        self.assertEqual(Task.objects.filter(status='succeeded').count(), 2)
+
+    def test_failures_retry_with_backoff_then_fail(self):
+        queued = fail.enqueue()
+        with mock.patch('tasks.queue.random.uniform', return_value=1.0):
+            before = timezone.now()
+            self.assertFalse(run_task(claim_tasks('worker', 1)[0]))
+            retried = Task.objects.get(pk=queued.pk)
+            self.assertEqual((retried.status, retried.attempts), ('queued', 1))
+            self.assertIn('RuntimeError: boom', retried.last_error)
+            self.assertGreaterEqual(retried.run_at, before + timedelta(seconds=10))
+            self.assertEqual(retry_delay(fail, 3), 40)
+
+        Task.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        self.assertFalse(run_task(claim_tasks('worker', 1)[0]))
+        failed = Task.objects.get(pk=queued.pk)
+        self.assertEqual((failed.status, failed.attempts), ('failed', 2))
+        self.assertIsNotNone(failed.finished_at)
+
+    def test_unique_key_allows_one_pending_task(self):
+        first = record.schedule(args=['a'], unique_key='only-one')
+        self.assertIsNotNone(first)
+        self.assertIsNone(record.schedule(args=['b'], unique_key='only-one'))
+
+        # Still held while running, released once finished
+        claimed = claim_tasks('worker', 1)[0]
+        self.assertIsNone(record.schedule(args=['c'], unique_key='only-one'))
+        run_task(claimed)
+        self.assertIsNotNone(record.schedule(args=['d'], unique_key='only-one'))
+        self.assertEqual(Task.objects.filter(unique_key='only-one').count(), 2)
+
+    def test_stale_tasks_are_requeued(self):
+        record.enqueue('stale')
+        claimed = claim_tasks('dead-worker', 1)[0]
+        Task.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - timedelta(minutes=30))
+        self.assertEqual(requeue_stale(lock_timeout=600), 1)
+        self.assertEqual(Task.objects.get(pk=claimed.pk).status, 'queued')
+
+    def test_periodic_task_reschedules_itself(self):
+        ensure_periodic()
+        ensure_periodic()
+        pending = Task.objects.filter(name='tests.periodic', status='queued')
+        self.assertEqual(pending.count(), 1)
+
+        before = timezone.now()
+        claimed = [claimed_task for claimed_task in claim_tasks('worker', 10) if claimed_task.name == 'tests.periodic']
+        self.assertTrue(run_task(claimed[0]))
+        self.assertEqual(calls, ['periodic'])
+        next_run = Task.objects.get(name='tests.periodic', status='queued')
+        self.assertEqual(next_run.unique_key, 'periodic:tests.periodic')
+        self.assertGreaterEqual(next_run.run_at, before + timedelta(seconds=300))
@@ -0,0 +1,98 @@
+"""
+Task worker
+Polls for due tasks and runs them on a thread pool, claiming only as many
+as there are free threads so other workers can take the rest. Tasks left
+running by a dead worker are requeued after TASKS_LOCK_TIMEOUT seconds.
+"""
+
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .queue import claim_tasks, ensure_periodic, prune_tasks, requeue_stale, run_task
+
+MAINTENANCE_SECONDS = 60
+
+
+class Worker:
+    """Runs queued tasks until stopped, or until none are due in burst mode"""
+
+    def __init__(self, concurrency=4, poll_interval=1.0, stdout=None):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout = stdout
+        self.stopping = False
+        self.processed = 0
+        self.failed = 0
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def execute(self, task):
+        try:
+            return run_task(task)
+        finally:
+            # Each pool thread has its own connection
+            connections.close_all()
+
+    def collect(self, future):
+        self.processed += 1
+        error = future.exception()
+        if error is not None:
+            self.log(f'Task crashed the worker thread: {error!r}')
+        if error is not None or not future.result():
+            self.failed += 1
+
+    def maintain(self):
+        released = requeue_stale(getattr(settings, 'TASKS_LOCK_TIMEOUT', 600))
+        if released:
+            self.log(f'Requeued {released} stale tasks')
+        prune_tasks(getattr(settings, 'TASKS_RETENTION_DAYS', 7))
+        ensure_periodic()
+
+    def run(self, burst=False):
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self.stop)
+
+        self.log(f'Worker {self.worker_id} started with {self.concurrency} threads')
+        running = set()
+        last_maintenance = 0.0
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix='task') as pool:
+            while not self.stopping:
+                if time.monotonic() - last_maintenance >= MAINTENANCE_SECONDS:
+                    self.maintain()
+                    last_maintenance = time.monotonic()
+
+                done = {future for future in running if future.done()}
+                for future in done:
+                    self.collect(future)
+                running -= done
+
+                close_old_connections()
+                claimed = claim_tasks(self.worker_id, self.concurrency - len(running))
+                for task in claimed:
+                    running.add(pool.submit(self.execute, task))
+
+                if burst and not claimed and not running:
+                    break
+                if not claimed:
+                    if running:
+                        wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    else:
+                        time.sleep(self.poll_interval)
+
+            # Let in-flight tasks finish before exiting
+            wait(running)
+            for future in running:
+                self.collect(future)
+        return self.processed, self.failed
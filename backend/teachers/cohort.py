@@ -0,0 +1,120 @@
+"""
+Cohort analytics for a teacher's class
+Period figures come from one conditional-aggregation query, and the top
+performer and needs-attention lists are ranked in SQL over the whole class,
+so the number of queries stays the same however many students there are.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from progress.models import LevelProgress
+from students.models import Student
+from users.models import User
+
+# Fewer completions than this in the last week flags a student
+ATTENTION_THRESHOLD = 2
+LIST_SIZE = 5
+
+
+def class_users(campus):
+    """User accounts of the active students on a campus"""
+    student_ids = Student.objects.filter(campus=campus, is_active=True).values('student_id')
+    return User.objects.filter(student_id__in=student_ids)
+
+
+def period_starts(now=None):
+    """
+    Start of each reporting period, keyed by response name
+
+    'today' runs from midnight in the active time zone, so it matches the
+    calendar day the school sees. The old completed_at__date=today check took
+    the date from UTC now but converted completed_at to local time, which put
+    completions near midnight into the wrong day whenever the two differ.
+    The week and month periods are rolling windows.
+    """
+    now = now or timezone.now()
+    return {
+        'today': timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0),
+        'this_week': now - timedelta(days=7),
+        'this_month': now - timedelta(days=30),
+    }
+
+
+def period_summary(users, starts):
+    """Completions, XP, average score and active students per period in one query"""
+    aggregates = {}
+    for name, start in starts.items():
+        recent = Q(completed_at__gte=start)
+        aggregates[f'{name}__levels_completed'] = Count('id', filter=recent)
+        aggregates[f'{name}__total_xp'] = Coalesce(Sum('xp_earned', filter=recent), Value(0))
+        aggregates[f'{name}__average_score'] = Avg('completion_percentage', filter=recent)
+        aggregates[f'{name}__active_students'] = Count('user', filter=recent, distinct=True)
+
+    row = LevelProgress.objects.filter(
+        user__in=users, is_completed=True, completed_at__gte=min(starts.values())
+    ).aggregate(**aggregates)
+
+    summary = {name: {} for name in starts}
+    for key, value in row.items():
+        name, field = key.split('__')
+        summary[name][field] = round(value or 0, 2) if field == 'average_score' else value
+    return summary
+
+
+def _student_row(user, **fields):
+    return {
+        'student_id': user.student_id,
+        'name': user.get_full_name() or user.username,
+        **fields,
+    }
+
+
+def top_performers(users, limit=LIST_SIZE):
+    """Students with the most XP across the whole class"""
+    ranked = (
+        users.annotate(
+            level_xp=Coalesce(Sum('level_progress__xp_earned'), Value(0)),
+            completed_levels=Count('level_progress', filter=Q(level_progress__is_completed=True)),
+        )
+        .filter(level_xp__gt=0)
+        .order_by('-level_xp', 'pk')
+        .only('student_id', 'username', 'first_name', 'last_name')[:limit]
+    )
+    return [
+        _student_row(user, total_xp=user.level_xp, completed_levels=user.completed_levels)
+        for user in ranked
+    ]
+
+
+def needs_attention(users, since, limit=LIST_SIZE):
+    """Least active students of the last week, lowest XP first"""
+    ranked = (
+        users.annotate(
+            recent_activity=Count('level_progress', filter=Q(
+                level_progress__is_completed=True, level_progress__completed_at__gte=since,
+            )),
+            level_xp=Coalesce(Sum('level_progress__xp_earned'), Value(0)),
+        )
+        .filter(recent_activity__lt=ATTENTION_THRESHOLD)
+        .order_by('recent_activity', 'level_xp', 'pk')
+        .only('student_id', 'username', 'first_name', 'last_name')[:limit]
+    )
+    return [
+        _student_row(user, recent_activity=user.recent_activity, total_xp=user.level_xp)
+        for user in ranked
+    ]
+
+
+def class_cohort_analytics(campus, now=None):
+    """The class_analytics payload for a campus in a fixed number of queries"""
+    users = class_users(campus)
+    starts = period_starts(now)
+    return {
+        'time_periods': period_summary(users, starts),
+        'top_performers': top_performers(users),
+        'needs_attention': needs_attention(users, starts['this_week']),
+    }
@@ -1,3 +1,104 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from django.db.models import Avg, Sum
 from django.test import TestCase
+from django.utils import timezone
+
+from groups.models import Group
+from levels.models import Level
+from progress.models import LevelProgress
+from users.models import User
+from .cohort import needs_attention, period_starts, period_summary, top_performers
+
+
+class CohortAnalyticsTests(TestCase):
+    """Whole-class aggregates agree with the figures worked out per student"""
+
+    now = datetime(2026, 3, 10, 15, 0, tzinfo=ZoneInfo('UTC'))
+
+    @classmethod
+    def setUpTestData(cls):
+        group = Group.objects.create(group_number=1, name='Group 1')
+        levels = [Level.objects.create(group=group, level_number=n, name=f'Level {n}') for n in range(1, 5)]
+        # (level, xp, score, completed, hours before now)
+        activity = {
+            'busy': [(0, 30, 100, True, 1), (1, 20, 80, True, 30), (2, 25, 90, True, 100)],
+            'steady': [(0, 40, 70, True, 24 * 10), (1, 35, 60, True, 24 * 20)],
+            'starter': [(0, 10, 50, True, 2), (1, 5, 20, False, 3)],
+            'lapsed': [(0, 60, 90, True, 24 * 40)],
+            'new': [],
+        }
+        cls.users = {}
+        for username, rows in activity.items():
+            user = User.objects.create(username=username, role='student', student_id=username.upper())
+            cls.users[username] = user
+            for index, xp, score, completed, hours in rows:
+                LevelProgress.objects.create(
+                    user=user, level=levels[index], xp_earned=xp, completion_percentage=score,
+                    is_completed=completed, completed_at=cls.now - timedelta(hours=hours) if completed else None,
+                )
+        cls.class_users = User.objects.filter(pk__in=[user.pk for user in cls.users.values()])
+
+    def per_student(self, user, since=None):
+        """The per-student queries class_analytics used to run"""
+        progress = LevelProgress.objects.filter(user=user)
+        completed = progress.filter(is_completed=True)
+        if since is not None:
+            completed = completed.filter(completed_at__gte=since)
+        return {
+            'total_xp': progress.aggregate(total=Sum('xp_earned'))['total'] or 0,
+            'completed': completed.count(),
+        }
+
+    def test_period_summary(self):
+        starts = period_starts(self.now)
+        summary = period_summary(self.class_users, starts)
+
+        self.assertEqual(summary['today'], {
+            'levels_completed': 2, 'total_xp': 40, 'average_score': 75.0, 'active_students': 2,
+        })
+        self.assertEqual(summary['this_week'], {
+            'levels_completed': 4, 'total_xp': 85, 'average_score': 80.0, 'active_students': 2,
+        })
+        for name, start in starts.items():
+            recent = LevelProgress.objects.filter(user__in=self.class_users, is_completed=True, completed_at__gte=start)
+            self.assertEqual(summary[name], {
+                'levels_completed': recent.count(),
+                'total_xp': recent.aggregate(total=Sum('xp_earned'))['total'] or 0,
+                'average_score': round(recent.aggregate(avg=Avg('completion_percentage'))['avg'] or 0, 2),
+                'active_students': recent.values('user').distinct().count(),
+            }, name)
+
+    def test_today_starts_at_local_midnight(self):
+        # 02:00 on the 10th in Karachi is 21:00 on the 9th in UTC
+        late = self.users['new']
+        LevelProgress.objects.create(
+            user=late, level=Level.objects.first(), xp_earned=5, completion_percentage=100,
+            is_completed=True, completed_at=datetime(2026, 3, 9, 21, 0, tzinfo=ZoneInfo('UTC')),
+        )
+        with timezone.override('Asia/Karachi'):
+            starts = period_starts(self.now)
+            self.assertEqual(starts['today'], datetime(2026, 3, 10, tzinfo=ZoneInfo('Asia/Karachi')))
+            self.assertEqual(period_summary(self.class_users, starts)['today']['active_students'], 3)
+        self.assertEqual(period_summary(self.class_users, period_starts(self.now))['today']['active_students'], 2)
+
+    def test_top_performers(self):
+        ranked = top_performers(self.class_users)
+
+        # busy and steady tie on XP, so the earlier account comes first
+        self.assertEqual([row['student_id'] for row in ranked], ['BUSY', 'STEADY', 'LAPSED', 'STARTER'])
+        for row in ranked:
+            expected = self.per_student(self.users[row['student_id'].lower()])
+            self.assertEqual((row['total_xp'], row['completed_levels']), (expected['total_xp'], expected['completed']))
+        self.assertEqual(len(top_performers(self.class_users, limit=2)), 2)
+
+    def test_needs_attention(self):
+        since = period_starts(self.now)['this_week']
+        ranked = needs_attention(self.class_users, since)
 
-# Create your tests here.
+        # busy finished three levels this week; the rest are lowest activity, then lowest XP
+        self.assertEqual([row['student_id'] for row in ranked], ['NEW', 'LAPSED', 'STEADY', 'STARTER'])
+        for row in ranked:
+            expected = self.per_student(self.users[row['student_id'].lower()], since)
+            self.assertEqual((row['recent_activity'], row['total_xp']), (expected['completed'], expected['total_xp']))
@@ -10,6 +10,7 @@ from progress.models import LevelProgress
 from levels.models import Level
 from classes.models import Grade
 from campus.models import Campus
+from .cohort import class_cohort_analytics
 
 
 @api_view(['GET'])
@@ -277,111 +278,8 @@ def class_analytics(request):
         # Get teacher profile
         teacher = Teacher.objects.get(email=user.email)
         
-        # Get all students in teacher's campus (simplified approach)
-        students = Student.objects.filter(
-            campus=teacher.campus,
-            is_active=True
-        )
-        
-        # Get all student user accounts
-        from users.models import User
-        student_users = User.objects.filter(
-            student_id__in=[s.student_id for s in students]
-        )
-        
-        # Calculate analytics by time periods
-        now = timezone.now()
-        today = now.date()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        
-        # Today's activity
-        today_activity = LevelProgress.objects.filter(
-            user__in=student_users,
-            completed_at__date=today,
-            is_completed=True
-        )
-        
-        # This week's activity
-        week_activity = LevelProgress.objects.filter(
-            user__in=student_users,
-            completed_at__gte=week_ago,
-            is_completed=True
-        )
-        
-        # This month's activity
-        month_activity = LevelProgress.objects.filter(
-            user__in=student_users,
-            completed_at__gte=month_ago,
-            is_completed=True
-        )
-        
-        # Calculate analytics
-        analytics_data = {
-            'time_periods': {
-                'today': {
-                    'levels_completed': today_activity.count(),
-                    'total_xp': today_activity.aggregate(total=Sum('xp_earned'))['total'] or 0,
-                    'average_score': round(today_activity.aggregate(avg=Avg('completion_percentage'))['avg'] or 0, 2),
-                    'active_students': today_activity.values('user').distinct().count()
-                },
-                'this_week': {
-                    'levels_completed': week_activity.count(),
-                    'total_xp': week_activity.aggregate(total=Sum('xp_earned'))['total'] or 0,
-                    'average_score': round(week_activity.aggregate(avg=Avg('completion_percentage'))['avg'] or 0, 2),
-                    'active_students': week_activity.values('user').distinct().count()
-                },
-                'this_month': {
-                    'levels_completed': month_activity.count(),
-                    'total_xp': month_activity.aggregate(total=Sum('xp_earned'))['total'] or 0,
-                    'average_score': round(month_activity.aggregate(avg=Avg('completion_percentage'))['avg'] or 0, 2),
-                    'active_students': month_activity.values('user').distinct().count()
-                }
-            },
-            'top_performers': [],
-            'needs_attention': []
-        }
-        
-        # Get top performers (students with highest XP)
-        top_students = []
-        for student_user in student_users[:20]:  # Limit for performance
-            student_progress = LevelProgress.objects.filter(user=student_user)
-            total_xp = student_progress.aggregate(total=Sum('xp_earned'))['total'] or 0
-            completed_levels = student_progress.filter(is_completed=True).count()
-            
-            if total_xp > 0:
-                top_students.append({
-                    'student_id': student_user.student_id,
-                    'name': student_user.get_full_name() or student_user.username,
-                    'total_xp': total_xp,
-                    'completed_levels': completed_levels
-                })
-        
-        # Sort by XP and get top 5
-        top_students.sort(key=lambda x: x['total_xp'], reverse=True)
-        analytics_data['top_performers'] = top_students[:5]
-        
-        # Get students who need attention (low activity)
-        low_activity_students = []
-        for student_user in student_users[:20]:  # Limit for performance
-            recent_activity = LevelProgress.objects.filter(
-                user=student_user,
-                completed_at__gte=week_ago,
-                is_completed=True
-            ).count()
-            
-            if recent_activity < 2:  # Less than 2 levels completed this week
-                student_progress = LevelProgress.objects.filter(user=student_user)
-                total_xp = student_progress.aggregate(total=Sum('xp_earned'))['total'] or 0
-                
-                low_activity_students.append({
-                    'student_id': student_user.student_id,
-                    'name': student_user.get_full_name() or student_user.username,
-                    'recent_activity': recent_activity,
-                    'total_xp': total_xp
-                })
-        
-        analytics_data['needs_attention'] = low_activity_students[:5]
+        # Whole-class figures and rankings in a fixed number of queries
+        analytics_data = class_cohort_analytics(teacher.campus)
         
         return Response(analytics_data)
         
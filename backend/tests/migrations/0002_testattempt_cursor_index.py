@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['user', 'started_at', 'id'], name='tests_testa_user_id_2abc1e_idx'),
+        ),
+    ]
@@ -315,6 +315,7 @@ class TestAttempt(models.Model):
         indexes = [
             models.Index(fields=['user', 'test']),
             models.Index(fields=['started_at']),
+            models.Index(fields=['user', 'started_at', 'id']),
             models.Index(fields=['status']),
             models.Index(fields=['passed']),
         ]
@@ -5,6 +5,8 @@ from rest_framework.viewsets import ModelViewSet
 from django.db.models import Q, Avg, Count, Sum, Max
 from django.utils import timezone
 from .models import TestExercise, TestQuestion, TestAttempt
+from progress.xp import award_xp
+from pagination import KeysetPagination
 from .serializers import (
     TestExerciseSerializer, TestQuestionSerializer, TestAttemptSerializer,
     TestAttemptCreateSerializer, TestStatsSerializer
@@ -139,10 +141,8 @@ def submit_test(request, test_id):
         # Complete the attempt
         attempt.complete_test()
         
-        # Update user's total XP
-        user = request.user
-        user.total_xp += attempt.xp_earned
-        user.save()
+        # Credit XP through the ledger, once per attempt
+        award_xp(request.user, attempt.xp_earned, 'test', attempt.id)
         
         return Response(
             TestAttemptSerializer(attempt).data,
@@ -156,6 +156,8 @@ class TestAttemptListView(generics.ListAPIView):
     """List user's test attempts"""
     serializer_class = TestAttemptSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-started_at', '-id')
     
     def get_queryset(self):
         return TestAttempt.objects.filter(user=self.request.user).order_by('-started_at')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_remove_user_campus_remove_user_father_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='total_xp',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_total_xp'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='loginlog',
+            name='users_login_user_id_9cc4c5_idx',
+        ),
+        migrations.AddIndex(
+            model_name='loginlog',
+            index=models.Index(fields=['user', 'attempted_at', 'id'], name='users_login_user_id_2c1f34_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginlog',
+            index=models.Index(fields=['attempted_at', 'id'], name='users_login_attempt_7a1b29_idx'),
+        ),
+    ]
@@ -101,6 +101,10 @@ class User(AbstractUser):
     # Student-specific fields
     student_id = models.CharField(max_length=20, blank=True, null=True, unique=True)
     
+    # Cached sum of the XP ledger (progress.XPTransaction); only ever
+    # changed with F() updates or by the reconcile_xp command
+    total_xp = models.PositiveIntegerField(default=0)
+    
     # System fields
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -208,7 +212,8 @@ class LoginLog(models.Model):
         verbose_name = 'Login Log'
         verbose_name_plural = 'Login Logs'
         indexes = [
-            models.Index(fields=['user', 'attempted_at']),
+            models.Index(fields=['user', 'attempted_at', 'id']),
+            models.Index(fields=['attempted_at', 'id']),
             models.Index(fields=['login_method']),
             models.Index(fields=['success']),
         ]
@@ -4,9 +4,8 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
 from .models import PasswordResetToken, PasswordChangeLog
+from .tasks import send_password_reset_email
 
 User = get_user_model()
 
@@ -46,34 +45,13 @@ def request_password_reset(request):
     # Send reset email (in production, use proper email service)
     reset_url = f"http://127.0.0.1:3000/reset-password?token={reset_token.token}"
     
-    try:
-        send_mail(
-            subject='Password Reset Request',
-            message=f'''
-            You requested a password reset for your account.
-            
-            Click the link below to reset your password:
-            {reset_url}
-            
-            This link will expire in 1 hour.
-            
-            If you didn't request this, please ignore this email.
-            ''',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-        
-        return Response(
-            {'message': 'Password reset link sent to your email'},
-            status=status.HTTP_200_OK
-        )
-        
-    except Exception as e:
-        return Response(
-            {'error': 'Failed to send reset email'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    # Sent by a task worker so a slow mail server does not hold the request
+    send_password_reset_email.enqueue(user.email, reset_url)
+    
+    return Response(
+        {'message': 'Password reset link sent to your email'},
+        status=status.HTTP_200_OK
+    )
 
 
 @api_view(['POST'])
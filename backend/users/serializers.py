@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from fast_serializers import FastRows
 from .models import User, LoginLog
 
 
@@ -23,6 +24,10 @@ class UserSerializer(serializers.ModelSerializer):
         return obj.get_full_name()
 
 
+# Fast path for user lists; output matches UserSerializer
+user_rows = FastRows(UserSerializer)
+
+
 class StudentLoginSerializer(serializers.Serializer):
     """Serializer for student login (Student ID only)"""
     student_id = serializers.CharField(max_length=20)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.mail import send_mail
+
+from tasks.queue import task
+
+
+@task(max_attempts=6, retry_backoff=30)
+def send_password_reset_email(email, reset_url):
+    """Email a password reset link; retried with backoff if the mail server fails"""
+    send_mail(
+        subject='Password Reset Request',
+        message=f'''
+            You requested a password reset for your account.
+            
+            Click the link below to reset your password:
+            {reset_url}
+            
+            This link will expire in 1 hour.
+            
+            If you didn't request this, please ignore this email.
+            ''',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[email],
+        fail_silently=False,
+    )
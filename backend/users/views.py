@@ -12,18 +12,21 @@ from .models import User, LoginLog
 from .serializers import (
     UserSerializer, StudentLoginSerializer, TeacherAdminLoginSerializer,
     UserRegistrationSerializer, PasswordChangeSerializer, UserUpdateSerializer, 
-    LoginLogSerializer
+    LoginLogSerializer, user_rows
 )
+from fast_serializers import FastListMixin
 from .authentication import MultiMethodAuthBackend
+from pagination import KeysetPagination
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(FastListMixin, viewsets.ModelViewSet):
     """ViewSet for managing users"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    fast_rows = user_rows
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -38,22 +41,19 @@ class UserViewSet(viewsets.ModelViewSet):
     def students(self, request):
         """Get all students"""
         students = User.objects.filter(role='student')
-        serializer = self.get_serializer(students, many=True)
-        return Response(serializer.data)
+        return Response(user_rows.serialize(user_rows.values(students)))
     
     @action(detail=False, methods=['get'])
     def teachers(self, request):
         """Get all teachers"""
         teachers = User.objects.filter(role='teacher')
-        serializer = self.get_serializer(teachers, many=True)
-        return Response(serializer.data)
+        return Response(user_rows.serialize(user_rows.values(teachers)))
     
     @action(detail=False, methods=['get'])
     def admins(self, request):
         """Get all admins"""
         admins = User.objects.filter(role='admin')
-        serializer = self.get_serializer(admins, many=True)
-        return Response(serializer.data)
+        return Response(user_rows.serialize(user_rows.values(admins)))
     
     @action(detail=False, methods=['get'])
     def donors(self, request):
@@ -227,6 +227,8 @@ class LoginLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = LoginLog.objects.all()
     serializer_class = LoginLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-attempted_at', '-id')
     
     def get_queryset(self):
         """Filter logs based on user permissions"""
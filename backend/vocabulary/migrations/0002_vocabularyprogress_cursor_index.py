@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 03:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vocabulary', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vocabularyprogress',
+            index=models.Index(fields=['user', 'next_review_date', 'id'], name='vocabulary__user_id_1e45c8_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from users.models import User
 
 
@@ -246,6 +248,7 @@ class VocabularyProgress(models.Model):
         indexes = [
             models.Index(fields=['user', 'vocabulary']),
             models.Index(fields=['next_review_date']),
+            models.Index(fields=['user', 'next_review_date', 'id']),
             models.Index(fields=['mastery_level']),
             models.Index(fields=['is_learned']),
         ]
@@ -253,3 +256,10 @@ class VocabularyProgress(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.vocabulary.word} (Level {self.mastery_level})"
 
+
+@receiver(post_save, sender=Vocabulary)
+@receiver(post_delete, sender=Vocabulary)
+def bump_vocabulary_version(sender, instance, **kwargs):
+    """Invalidate cached vocabulary responses"""
+    from levels.versions import bump_content_versions
+    bump_content_versions('vocabulary')
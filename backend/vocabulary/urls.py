@@ -11,6 +11,8 @@ urlpatterns = [
     path('', include(router.urls)),
     
     # Custom endpoints
+    path('words/', views.VocabularyListView.as_view(), name='vocabulary-words'),
+    path('my-progress/', views.VocabularyProgressListView.as_view(), name='vocabulary-my-progress'),
     path('review/<int:vocabulary_id>/', views.review_vocabulary, name='review_vocabulary'),
     path('review-words/', views.get_review_words, name='get_review_words'),
     path('stats/', views.vocabulary_stats, name='vocabulary_stats'),
@@ -6,10 +6,13 @@ from django.db.models import Q, Avg, Count, Sum
 from django.utils import timezone
 from .models import Vocabulary, VocabularyProgress
 from .serializers import VocabularySerializer, VocabularyProgressSerializer
+from levels.versions import ContentVersionMixin
+from pagination import KeysetPagination
 
 
-class VocabularyListView(generics.ListAPIView):
+class VocabularyListView(ContentVersionMixin, generics.ListAPIView):
     """List vocabulary words with filtering"""
+    content_kinds = ('vocabulary',)
     serializer_class = VocabularySerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -63,6 +66,8 @@ class VocabularyProgressListView(generics.ListAPIView):
     """List user's vocabulary progress"""
     serializer_class = VocabularyProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-next_review_date', '-id')
     
     def get_queryset(self):
         return VocabularyProgress.objects.filter(user=self.request.user).order_by('-next_review_date')